@@ -0,0 +1,5 @@
+"""Fin-Assist pela linha de comando: `python -m fin_assist --help`.
+
+Nada aqui importa customtkinter ou o backend Tk do matplotlib, então os
+comandos rodam em servidores sem tela (cron, scripts de manutenção).
+"""
@@ -0,0 +1,5 @@
+import sys
+
+from fin_assist.cli import main
+
+sys.exit(main())
@@ -0,0 +1,245 @@
+"""Comandos de lote do Fin-Assist, sem abrir a interface gráfica.
+
+    python -m fin_assist import USUARIO extrato.csv
+    python -m fin_assist export USUARIO transacoes.csv [--goals]
+    python -m fin_assist backup USUARIO backup.ndjson.gz [--restore [--replace]]
+    python -m fin_assist report USUARIO relatorio.pdf [--start DD-MM-YYYY] [--end DD-MM-YYYY]
+    python -m fin_assist stats [USUARIO] [--month YYYY-MM]
+    python -m fin_assist reindex [USUARIO] [--vacuum]
+    python -m fin_assist benchmark [--rows N]
+
+Cada comando importa só o que usa (reportlab apenas em `report`), então a
+partida fica no custo do sqlite3 e dos controllers. `--db` troca o banco.
+Códigos de saída: 0 sucesso, 1 falha, 2 usuário não encontrado.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from src.controllers.transaction_controller import BULK_CHUNK_SIZE
+
+class CommandError(Exception):
+    """Erro já formatado para o usuário; `code` é o código de saída"""
+
+    def __init__(self, message, code=1):
+        super().__init__(message)
+        self.code = code
+
+def _get_user(username):
+    from src.models.user import User
+
+    user = User.get_by_username(username)
+    if user is None:
+        raise CommandError(f"Usuário não encontrado: {username}", code=2)
+    return user
+
+def _service(user):
+    from src.controllers.goal_controller import GoalController
+    from src.controllers.transaction_controller import TransactionController
+    from src.services.import_export import ImportExportService
+
+    return ImportExportService(TransactionController(user), GoalController(user))
+
+def _parse_month(value):
+    try:
+        parsed = datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"mês inválido: {value!r} (use YYYY-MM)")
+    return parsed.year, parsed.month
+
+def _parse_date(value):
+    from src.services.transaction_import import parse_import_date
+
+    try:
+        return parse_import_date(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def cmd_import(args):
+    from src.services.transaction_import import format_report
+
+    result = _service(_get_user(args.username)).import_transactions_csv(
+        args.csv_file, batch_size=args.batch_size,
+        skip_duplicates=not args.keep_duplicates, max_errors=args.max_errors
+    )
+    print(format_report(result))
+    return 0 if result.imported or not result.errors else 1
+
+def cmd_export(args):
+    service = _service(_get_user(args.username))
+    result = service.export_goals_csv(args.output) if args.goals else service.export_transactions_csv(args.output)
+    what = "metas" if args.goals else "transações"
+    print(f"{result.records} {what} exportadas para {result.path} em {result.elapsed:.2f}s.")
+    return 0
+
+def cmd_backup(args):
+    service = _service(_get_user(args.username))
+    if args.restore:
+        result = service.restore(args.file, replace=args.replace)
+        print(f"Restauradas {result.transactions} transações e {result.goals} metas em {result.elapsed:.2f}s.")
+    else:
+        result = service.backup(args.file)
+        print(f"Backup de {result.transactions} transações e {result.goals} metas "
+              f"salvo em {args.file} em {result.elapsed:.2f}s.")
+    return 0
+
+def cmd_report(args):
+    from src.controllers.goal_controller import GoalController
+    from src.controllers.transaction_controller import TransactionController
+    from src.utils.pdf_generator import PDFGenerator
+
+    user = _get_user(args.username)
+    started = time.perf_counter()
+    controller = TransactionController(user)
+    totals = controller.get_period_totals(args.start, args.end)
+    transactions = controller.iter_transactions(start_date=args.start, end_date=args.end)
+    goals = GoalController(user).get_goals()
+    PDFGenerator(user).generate_financial_report(transactions, goals, args.output, totals=totals)
+    print(f"Relatório de {totals['count']} transações salvo em {args.output} "
+          f"em {time.perf_counter() - started:.2f}s.")
+    return 0
+
+def cmd_stats(args):
+    if args.username is None:
+        return _database_stats()
+
+    from src.services.dashboard_service import DashboardService
+
+    year, month = args.month or (None, None)
+    snapshot = DashboardService(_get_user(args.username)).get_snapshot(year, month)
+    totals, month_totals = snapshot.totals, snapshot.month_totals
+    lines = [
+        f"Saldo: R$ {snapshot.balance:.2f}",
+        f"Total: receitas R$ {totals['income']:.2f} | despesas R$ {totals['expense']:.2f} | "
+        f"investimentos R$ {totals['investment']:.2f}",
+        f"{snapshot.year_month}: receitas R$ {month_totals['income']:.2f} | despesas R$ {month_totals['expense']:.2f} | "
+        f"investimentos R$ {month_totals['investment']:.2f}",
+    ]
+    if snapshot.top_expenses:
+        lines.append("Maiores gastos do mês:")
+        lines.extend(f"  {label}: R$ {total:.2f}" for label, total in snapshot.top_expenses)
+    lines.append(f"Metas: {len(snapshot.goals)}")
+    print("\n".join(lines))
+    return 0
+
+def _database_stats():
+    import src.database.database as db_module
+    from src.database.migrations import get_schema_version
+
+    with db_module.db_connection() as conn:
+        version = get_schema_version(conn.raw)
+        users, = conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        transactions, = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()
+        goals, = conn.execute("SELECT COUNT(*) FROM financial_goals").fetchone()
+    size = os.path.getsize(db_module.DB_PATH) / (1024 * 1024)
+    print(f"Banco: {db_module.DB_PATH} ({size:.1f} MB, esquema v{version})\n"
+          f"Usuários: {users} | Transações: {transactions} | Metas: {goals}")
+    return 0
+
+def cmd_reindex(args):
+    from src.controllers.transaction_controller import TransactionController
+    from src.database.database import db_connection, rebuild_monthly_totals
+    from src.models.user import User
+
+    if args.username is not None:
+        users = [_get_user(args.username)]
+    else:
+        with db_connection() as conn:
+            names = [row[0] for row in conn.execute("SELECT username FROM users ORDER BY id")]
+        users = [User.get_by_username(name) for name in names]
+
+    started = time.perf_counter()
+    repaired = 0
+    for user in users:
+        rebuild_monthly_totals(user.id)
+        if not TransactionController(user).verify_balance_cache(repair=True)['ok']:
+            repaired += 1
+            print(f"Totais de {user.username} estavam divergentes e foram corrigidos.")
+
+    with db_connection() as conn:
+        conn.execute("ANALYZE")
+    if args.vacuum:
+        with db_connection() as conn:
+            conn.execute("VACUUM")
+
+    print(f"Agregados recalculados para {len(users)} usuário(s) em {time.perf_counter() - started:.2f}s "
+          f"({repaired} corrigido(s)).")
+    return 0
+
+def cmd_benchmark(args):
+    from src.utils.benchmark import run_benchmark, format_benchmark
+
+    print(format_benchmark(run_benchmark(rows=args.rows)))
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='fin_assist', description="Operações em lote do Fin-Assist (sem interface gráfica)")
+    parser.add_argument('--db', help="caminho do banco SQLite (padrão: database/fin_assist.db)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('import', help="importa transações de um CSV")
+    command.add_argument('username')
+    command.add_argument('csv_file')
+    command.add_argument('--batch-size', type=int, default=BULK_CHUNK_SIZE)
+    command.add_argument('--keep-duplicates', action='store_true', help="não ignora linhas que já existem no banco")
+    command.add_argument('--max-errors', type=int, default=None, help="desfaz a importação se houver mais erros que isso")
+    command.set_defaults(handler=cmd_import)
+
+    command = commands.add_parser('export', help="exporta transações (ou metas) para CSV")
+    command.add_argument('username')
+    command.add_argument('output')
+    command.add_argument('--goals', action='store_true', help="exporta as metas em vez das transações")
+    command.set_defaults(handler=cmd_export)
+
+    command = commands.add_parser('backup', help="grava (ou restaura) o backup completo em NDJSON")
+    command.add_argument('username')
+    command.add_argument('file', help="'.gz' ou '.xz' compactam o backup")
+    command.add_argument('--restore', action='store_true', help="restaura o arquivo em vez de gravá-lo")
+    command.add_argument('--replace', action='store_true', help="com --restore, apaga os dados atuais antes")
+    command.set_defaults(handler=cmd_backup)
+
+    command = commands.add_parser('report', help="gera o relatório financeiro em PDF")
+    command.add_argument('username')
+    command.add_argument('output')
+    command.add_argument('--start', type=_parse_date, help="data inicial (DD-MM-YYYY)")
+    command.add_argument('--end', type=_parse_date, help="data final, inclusiva (DD-MM-YYYY)")
+    command.set_defaults(handler=cmd_report)
+
+    command = commands.add_parser('stats', help="mostra os totais de um usuário ou do banco")
+    command.add_argument('username', nargs='?')
+    command.add_argument('--month', type=_parse_month, help="mês do resumo (YYYY-MM, padrão: atual)")
+    command.set_defaults(handler=cmd_stats)
+
+    command = commands.add_parser('reindex', help="recalcula agregados e estatísticas do banco")
+    command.add_argument('username', nargs='?', help="só este usuário (padrão: todos)")
+    command.add_argument('--vacuum', action='store_true', help="compacta o arquivo do banco no final")
+    command.set_defaults(handler=cmd_reindex)
+
+    command = commands.add_parser('benchmark', help="mede import/export/backup/relatório em um banco temporário")
+    command.add_argument('--rows', type=int, default=10000)
+    command.set_defaults(handler=cmd_benchmark)
+
+    return parser
+
+def main(argv=None):
+    import src.database.database as db_module
+    from src.services.transaction_import import ImportAborted
+
+    args = build_parser().parse_args(argv)
+    if args.db:
+        db_module.DB_PATH = args.db
+
+    try:
+        if args.handler is not cmd_benchmark:
+            db_module.init_db()
+        return args.handler(args)
+    except CommandError as e:
+        print(e, file=sys.stderr)
+        return e.code
+    except (ImportAborted, ValueError, OSError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db_module.close_all_connections()
@@ -1,6 +1,8 @@
 import customtkinter as ctk
 from src.views.login_view import LoginView
-from src.database.database import init_db
+from src.database.database import init_db, close_all_connections
+from src.config.settings import STARTUP_SETTINGS
+from src.utils.startup import prewarm
 import os
 from dotenv import load_dotenv
 
@@ -24,7 +26,11 @@ def main():
     login_view = LoginView(root)
     login_view.pack(fill="both", expand=True)
     
+    # Gráficos e PDF são importados sob demanda; adianta enquanto o login está ocioso
+    root.after(STARTUP_SETTINGS['prewarm_delay_ms'], prewarm)
+    
     root.mainloop()
+    close_all_connections()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
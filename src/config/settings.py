@@ -10,6 +10,34 @@ ASSETS_DIR = BASE_DIR / "assets"
 # Configurações do banco de dados
 DATABASE_PATH = DATABASE_DIR / "fin_assist.db"
 
+# Pool de conexões e PRAGMAs aplicados uma única vez por conexão
+DATABASE_SETTINGS = {
+    'pool_size': 5,               # conexões abertas simultaneamente
+    'busy_timeout_ms': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size_kb': 16384,       # cache de páginas por conexão (16 MB)
+    'mmap_size_bytes': 64 * 1024 * 1024,
+    'temp_store': 'MEMORY'
+}
+
+# Tarefas em segundo plano das telas (I/O fora da thread do Tk)
+TASK_SETTINGS = {
+    'max_workers': 4,             # abaixo de pool_size: sobra conexão para a thread do Tk
+    'poll_interval_ms': 50        # intervalo de entrega dos resultados via after()
+}
+
+# Partida: dependências pesadas são pré-carregadas em segundo plano
+# depois da primeira tela (ver src/utils/startup.py)
+STARTUP_SETTINGS = {
+    'prewarm_delay_ms': 500,      # espera a primeira tela ser desenhada
+    'prewarm_modules': [
+        'matplotlib.figure',
+        'matplotlib.backends.backend_tkagg',
+        'reportlab.platypus',
+    ]
+}
+
 # Configurações da aplicação
 APP_NAME = "Fin-Assist"
 APP_VERSION = "1.0.0"
@@ -45,7 +73,7 @@ DEFAULT_CATEGORIES = {
 # Configurações de relatórios
 REPORT_SETTINGS = {
     'default_filename': 'relatorio_financeiro',
-    'max_transactions_per_report': 1000,
+    'max_transactions_per_report': 10000,
     'date_format_display': '%d-%m-%Y',
     'date_format_storage': '%Y-%m-%d'
 }
@@ -57,6 +85,9 @@ IMPORT_EXPORT_SETTINGS = {
     'encoding': 'utf-8'
 }
 
+# Frases e respostas do chatbot quando o Gemini não está disponível
+CHATBOT_INTENTS_FILE = SRC_DIR / "config" / "chatbot_intents.json"
+
 # Configurações de logging
 LOGGING_CONFIG = {
     'level': 'INFO',
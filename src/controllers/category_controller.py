@@ -1,89 +1,118 @@
+import threading
+
 from src.database.database import get_db_connection
 
+# Cache em memória de get_categories: {(user_id, tipo): [categorias]}
+_category_cache = {}
+_category_cache_lock = threading.Lock()
+
+def invalidate_category_cache(user_id=None):
+    """Descarta o cache de categorias (de um usuário ou de todos)"""
+    with _category_cache_lock:
+        if user_id is None:
+            _category_cache.clear()
+        else:
+            for key in [k for k in _category_cache if k[0] == user_id]:
+                del _category_cache[key]
+
 class CategoryController:
     def __init__(self, user):
         self.user = user
-    
+
     def get_categories(self, transaction_type):
         """Retorna categorias para um tipo de transação"""
+        key = (self.user.id, transaction_type)
+        with _category_cache_lock:
+            cached = _category_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
         conn = get_db_connection()
         cursor = conn.cursor()
-        
+
         cursor.execute('''
-            SELECT DISTINCT category FROM transactions 
-            WHERE user_id = ? AND type = ?
-            ORDER BY category
+            SELECT name FROM categories
+            WHERE user_id = ? AND type = ? AND parent_id IS NULL
+            ORDER BY name
         ''', (self.user.id, transaction_type))
-        
+
         categories = [row[0] for row in cursor.fetchall()]
         conn.close()
-        
+
         # Adiciona categorias padrão se não existirem
         default_categories = self._get_default_categories(transaction_type)
         for cat in default_categories:
             if cat not in categories:
                 categories.append(cat)
-        
-        return categories
-    
-    def add_custom_category(self, transaction_type, category_name):
-        """Adiciona uma nova categoria personalizada"""
+
+        with _category_cache_lock:
+            _category_cache[key] = categories
+        return list(categories)
+
+    def add_custom_category(self, transaction_type, category_name, parent_name=None):
+        """Adiciona uma nova categoria personalizada (opcionalmente filha de outra)"""
         if not category_name or not category_name.strip():
             return False
-            
+
         category_name = category_name.strip()
-        
-        # Verifica se já existe
+
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id FROM transactions 
-            WHERE user_id = ? AND type = ? AND category = ?
-            LIMIT 1
-        ''', (self.user.id, transaction_type, category_name))
-        
-        if cursor.fetchone():
+
+        try:
+            parent_id = None
+            if parent_name:
+                cursor.execute('''
+                    SELECT id FROM categories
+                    WHERE user_id = ? AND type = ? AND name = ? AND parent_id IS NULL
+                ''', (self.user.id, transaction_type, parent_name))
+                parent = cursor.fetchone()
+                if not parent:
+                    return False
+                parent_id = parent[0]
+
+            # O índice único ignora categorias repetidas
+            cursor.execute('''
+                INSERT OR IGNORE INTO categories (user_id, type, name, parent_id)
+                VALUES (?, ?, ?, ?)
+            ''', (self.user.id, transaction_type, category_name, parent_id))
+
+            if cursor.rowcount == 0:
+                return False  # Já existe
+
+            conn.commit()
+            invalidate_category_cache(self.user.id)
+            return True
+        finally:
             conn.close()
-            return False  # Já existe
-        
-        # Adiciona uma transação temporária para "registrar" a categoria
-        cursor.execute('''
-            INSERT INTO transactions (user_id, type, category, subcategory, amount, description, date)
-            VALUES (?, ?, ?, '', 0.01, 'Categoria personalizada', datetime('now'))
-        ''', (self.user.id, transaction_type, category_name))
-        
-        conn.commit()
-        conn.close()
-        return True
-    
+
     def delete_custom_category(self, transaction_type, category_name):
         """Remove uma categoria personalizada (apenas se não tiver transações)"""
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        # Verifica se tem transações reais
-        cursor.execute('''
-            SELECT COUNT(*) FROM transactions 
-            WHERE user_id = ? AND type = ? AND category = ? AND amount > 0.01
-        ''', (self.user.id, transaction_type, category_name))
-        
-        count = cursor.fetchone()[0]
-        
-        if count > 0:
+
+        try:
+            # Verifica se tem transações
+            cursor.execute('''
+                SELECT 1 FROM transactions
+                WHERE user_id = ? AND type = ? AND category = ?
+                LIMIT 1
+            ''', (self.user.id, transaction_type, category_name))
+
+            if cursor.fetchone():
+                return False  # Tem transações, não pode deletar
+
+            cursor.execute('''
+                DELETE FROM categories
+                WHERE user_id = ? AND type = ? AND name = ? AND parent_id IS NULL
+            ''', (self.user.id, transaction_type, category_name))
+
+            conn.commit()
+            invalidate_category_cache(self.user.id)
+            return cursor.rowcount > 0
+        finally:
             conn.close()
-            return False  # Tem transações reais, não pode deletar
-        
-        # Remove transações da categoria (incluindo a temporária)
-        cursor.execute('''
-            DELETE FROM transactions 
-            WHERE user_id = ? AND type = ? AND category = ?
-        ''', (self.user.id, transaction_type, category_name))
-        
-        conn.commit()
-        conn.close()
-        return True
-    
+
     def _get_default_categories(self, transaction_type):
         """Retorna categorias padrão por tipo"""
         if transaction_type == 'income':
@@ -94,20 +123,21 @@ class CategoryController:
             return ['Ações', 'Fundos', 'Tesouro Direto', 'CDB', 'Outros']
         else:
             return []
-    
+
     def get_category_stats(self, transaction_type):
         """Retorna estatísticas das categorias"""
         conn = get_db_connection()
         cursor = conn.cursor()
-        
+
+        # Lê dos agregados mensais em vez de varrer as transações
         cursor.execute('''
-            SELECT category, COUNT(*) as count, SUM(amount) as total
-            FROM transactions 
-            WHERE user_id = ? AND type = ? AND amount > 0.01
+            SELECT category, SUM(count) as count, SUM(total) as total
+            FROM monthly_totals
+            WHERE user_id = ? AND type = ?
             GROUP BY category
             ORDER BY total DESC
         ''', (self.user.id, transaction_type))
-        
+
         stats = []
         for row in cursor.fetchall():
             stats.append({
@@ -115,6 +145,6 @@ class CategoryController:
                 'count': row[1],
                 'total': row[2]
             })
-        
+
         conn.close()
         return stats
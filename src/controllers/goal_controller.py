@@ -1,4 +1,5 @@
 from src.database.database import get_db_connection
+from src.models.goal import GOAL_FIELDS, goal_row_factory
 from datetime import datetime
 
 class GoalController:
@@ -30,8 +31,9 @@ class GoalController:
         """Retorna as metas do usuário com filtro opcional de status"""
         conn = get_db_connection()
         cursor = conn.cursor()
+        cursor.row_factory = goal_row_factory
         
-        query = "SELECT * FROM financial_goals WHERE user_id = ?"
+        query = f"SELECT {', '.join(GOAL_FIELDS)} FROM financial_goals WHERE user_id = ?"
         params = [self.user.id]
         
         if status:
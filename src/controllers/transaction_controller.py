@@ -1,5 +1,74 @@
 from src.database.database import get_db_connection
-from datetime import datetime
+from src.controllers.category_controller import invalidate_category_cache
+from src.models.transaction import TRANSACTION_FIELDS, transaction_row_factory
+from datetime import datetime, timedelta
+from itertools import islice
+from collections import namedtuple
+import base64
+import json
+
+# Ordem dos campos aceita por add_transactions_bulk quando a linha é uma tupla
+BULK_FIELDS = ('type', 'category', 'amount', 'description', 'date', 'subcategory')
+BULK_CHUNK_SIZE = 1000
+DEFAULT_PAGE_SIZE = 50
+STREAM_CHUNK_SIZE = 500
+
+TRANSACTION_COLUMNS = ", ".join(TRANSACTION_FIELDS)
+
+# Página de transações: `next_cursor` é None quando não há mais linhas
+TransactionPage = namedtuple('TransactionPage', ['rows', 'next_cursor'])
+
+def encode_page_cursor(date, trans_id):
+    """Gera o cursor opaco que aponta para a última linha de uma página"""
+    raw = json.dumps([date, trans_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+def decode_page_cursor(cursor):
+    """Decodifica um cursor gerado por encode_page_cursor"""
+    try:
+        date, trans_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return date, int(trans_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Cursor de página inválido: {cursor!r}") from e
+
+def _next_day(date_str):
+    """Retorna o dia seguinte a uma data 'YYYY-MM-DD' (outros formatos ficam iguais)"""
+    try:
+        return (datetime.strptime(date_str, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return date_str
+
+def _parse_month(value):
+    """Aceita 'YYYY-MM', (ano, mês), date ou datetime e retorna (ano, mês)"""
+    if isinstance(value, str):
+        year, month = value[:7].split('-')
+        return int(year), int(month)
+    if isinstance(value, tuple):
+        return int(value[0]), int(value[1])
+    return value.year, value.month
+
+def month_bounds(year, month):
+    """Retorna o intervalo semiaberto [primeiro dia do mês, primeiro dia do mês seguinte)"""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year}-{month:02d}-01", f"{next_year}-{next_month:02d}-01"
+
+def _whole_months(start_date, end_date):
+    """Retorna (mês inicial, mês final) se o período cobre meses inteiros, senão None"""
+    try:
+        start_month = end_month = None
+        if start_date:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            if start.day != 1:
+                return None
+            start_month = start_date[:7]
+        if end_date:
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            if (end + timedelta(days=1)).day != 1:
+                return None
+            end_month = end_date[:7]
+        return start_month, end_month
+    except ValueError:
+        return None
 
 class TransactionController:
     def __init__(self, user):
@@ -19,6 +88,7 @@ class TransactionController:
                 (self.user.id, type, category, subcategory, amount, description, date)
             )
             conn.commit()
+            invalidate_category_cache(self.user.id)
             return True
         except Exception as e:
             print(f"Erro ao adicionar transação: {e}")
@@ -26,27 +96,93 @@ class TransactionController:
         finally:
             conn.close()
     
-    def get_transactions(self, start_date=None, end_date=None, type=None):
-        """Retorna as transações do usuário com filtros opcionais"""
+    def add_transactions_bulk(self, rows, chunk_size=BULK_CHUNK_SIZE, progress_callback=None):
+        """Insere várias transações em uma única transação do banco.
+
+        `rows` pode ser qualquer iterável (inclusive um gerador) de dicts com as
+        chaves de BULK_FIELDS ou de tuplas nessa mesma ordem. As linhas são
+        gravadas com executemany em lotes de `chunk_size`; `progress_callback`
+        recebe o total inserido após cada lote. Retorna a quantidade inserida.
+        Em caso de erro nada é gravado e a exceção é propagada.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size deve ser maior que zero")
+
         conn = get_db_connection()
         cursor = conn.cursor()
-        
-        query = "SELECT id, user_id, type, category, subcategory, amount, description, date FROM transactions WHERE user_id = ?"
+        records = (self._bulk_record(row) for row in rows)
+        inserted = 0
+
+        try:
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                cursor.executemany(
+                    """
+                    INSERT INTO transactions (user_id, type, category, subcategory, amount, description, date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    chunk
+                )
+                inserted += len(chunk)
+                if progress_callback:
+                    progress_callback(inserted)
+            conn.commit()
+            invalidate_category_cache(self.user.id)
+            return inserted
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _bulk_record(self, row):
+        """Converte uma linha (dict ou tupla) nos parâmetros do INSERT"""
+        if isinstance(row, dict):
+            values = dict(row)
+        else:
+            values = dict(zip(BULK_FIELDS, row))
+        date = values.get('date') or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return (
+            self.user.id,
+            values['type'],
+            values['category'],
+            values.get('subcategory'),
+            float(values['amount']),
+            values.get('description'),
+            date
+        )
+    
+    def _filter_clause(self, start_date=None, end_date=None, type=None):
+        """Monta o WHERE comum às consultas de transações"""
+        clause = "user_id = ?"
         params = [self.user.id]
         
         if start_date:
-            query += " AND date >= ?"
+            clause += " AND date >= ?"
             params.append(start_date)
         
         if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
+            # Data final inclusiva: compara com o dia seguinte (intervalo semiaberto)
+            # para incluir transações com horário no último dia
+            clause += " AND date < ?"
+            params.append(_next_day(end_date))
         
         if type:
-            query += " AND type = ?"
+            clause += " AND type = ?"
             params.append(type)
         
-        query += " ORDER BY date DESC"
+        return clause, params
+    
+    def get_transactions(self, start_date=None, end_date=None, type=None):
+        """Retorna as transações do usuário com filtros opcionais"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.row_factory = transaction_row_factory
+        
+        clause, params = self._filter_clause(start_date, end_date, type)
+        query = f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {clause} ORDER BY date DESC"
         
         cursor.execute(query, params)
         transactions = cursor.fetchall()
@@ -54,55 +190,339 @@ class TransactionController:
         
         return transactions
     
+    def iter_transactions(self, start_date=None, end_date=None, type=None, chunk_size=STREAM_CHUNK_SIZE):
+        """Gera as transações (mesma ordem de get_transactions) em blocos de fetchmany.
+
+        Apenas `chunk_size` linhas ficam em memória por vez. A conexão fica
+        emprestada até o gerador terminar ou ser fechado.
+        """
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.row_factory = transaction_row_factory
+            clause, params = self._filter_clause(start_date, end_date, type)
+            cursor.execute(
+                f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {clause} ORDER BY date DESC",
+                params
+            )
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+    
+    def get_transactions_page(self, cursor=None, page_size=DEFAULT_PAGE_SIZE, start_date=None, end_date=None, type=None):
+        """Retorna uma página de transações usando paginação por chave (date, id).
+
+        A ordem é `date DESC, id DESC`, atendida pelo índice
+        idx_transactions_user_date. Passe o `next_cursor` da página anterior
+        para obter a seguinte; o custo não depende da posição na lista.
+        """
+        if page_size < 1:
+            raise ValueError("page_size deve ser maior que zero")
+        
+        clause, params = self._filter_clause(start_date, end_date, type)
+        limit = page_size + 1
+        order = "ORDER BY date DESC, id DESC LIMIT ?"
+        
+        conn = get_db_connection()
+        db_cursor = conn.cursor()
+        db_cursor.row_factory = transaction_row_factory
+        
+        if cursor is None:
+            db_cursor.execute(f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {clause} {order}", params + [limit])
+            rows = db_cursor.fetchall()
+        else:
+            last_date, last_id = decode_page_cursor(cursor)
+            rows = []
+            if last_date is not None:
+                # Comparação de row values vira uma busca por faixa no índice
+                db_cursor.execute(
+                    f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {clause} AND (date, id) < (?, ?) {order}",
+                    params + [last_date, last_id, limit]
+                )
+                rows = db_cursor.fetchall()
+            if len(rows) < limit:
+                # Datas nulas ficam no fim da ordenação decrescente
+                null_clause = f"{clause} AND date IS NULL"
+                null_params = list(params)
+                if last_date is None:
+                    null_clause += " AND id < ?"
+                    null_params.append(last_id)
+                db_cursor.execute(
+                    f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE {null_clause} {order}",
+                    null_params + [limit - len(rows)]
+                )
+                rows.extend(db_cursor.fetchall())
+        conn.close()
+        
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_page_cursor(rows[-1].date, rows[-1].id)
+        
+        return TransactionPage(rows, next_cursor)
+    
+    def get_cached_totals(self):
+        """Retorna os totais do usuário mantidos em user_totals (leitura O(1)).
+
+        Chaves: income, expense, investment, count e version (incrementada a
+        cada escrita em transactions).
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute(
+            "SELECT income, expense, investment, count, version FROM user_totals WHERE user_id = ?",
+            (self.user.id,)
+        )
+        row = cursor.fetchone() or (0.0, 0.0, 0.0, 0, 0)
+        conn.close()
+        
+        return dict(zip(('income', 'expense', 'investment', 'count', 'version'), row))
+    
+    def get_period_totals(self, start_date=None, end_date=None):
+        """Retorna {'income', 'expense', 'investment', 'count'} do período em uma consulta.
+
+        Mesmos filtros de iter_transactions; usado para o resumo de relatórios
+        que listam as transações em fluxo.
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        clause, params = self._filter_clause(start_date, end_date)
+        cursor.execute(
+            f"""
+            SELECT
+                TOTAL(CASE WHEN type = 'income' THEN amount END),
+                TOTAL(CASE WHEN type = 'expense' THEN amount END),
+                TOTAL(CASE WHEN type = 'investment' THEN amount END),
+                COUNT(*)
+            FROM transactions
+            WHERE {clause}
+            """,
+            params
+        )
+        totals = dict(zip(('income', 'expense', 'investment', 'count'), cursor.fetchone()))
+        conn.close()
+        
+        return totals
+    
     def get_balance(self):
         """Calcula o saldo atual do usuário"""
+        totals = self.get_cached_totals()
+        return totals['income'] - totals['expense']
+    
+    def verify_balance_cache(self, repair=True, tolerance=0.005):
+        """Confere user_totals contra uma varredura completa das transações.
+
+        Retorna {'ok', 'cached', 'actual'}; com `repair=True` uma divergência
+        é corrigida gravando os valores recalculados.
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """
+                SELECT 
+                    COALESCE(SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END), 0),
+                    COALESCE(SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END), 0),
+                    COALESCE(SUM(CASE WHEN type = 'investment' THEN amount ELSE 0 END), 0),
+                    COUNT(*)
+                FROM transactions
+                WHERE user_id = ?
+                """,
+                (self.user.id,)
+            )
+            actual = dict(zip(('income', 'expense', 'investment', 'count'), cursor.fetchone()))
+            cached = self.get_cached_totals()
+            
+            ok = cached['count'] == actual['count'] and all(
+                abs(cached[key] - actual[key]) <= tolerance for key in ('income', 'expense', 'investment')
+            )
+            
+            if not ok and repair:
+                cursor.execute(
+                    """
+                    INSERT INTO user_totals (user_id, income, expense, investment, count, version)
+                    VALUES (?, ?, ?, ?, ?, 1)
+                    ON CONFLICT (user_id) DO UPDATE SET
+                        income = excluded.income,
+                        expense = excluded.expense,
+                        investment = excluded.investment,
+                        count = excluded.count,
+                        version = version + 1
+                    """,
+                    (self.user.id, actual['income'], actual['expense'], actual['investment'], actual['count'])
+                )
+                conn.commit()
+            
+            return {'ok': ok, 'cached': cached, 'actual': actual}
+        finally:
+            conn.close()
+    
+    def get_monthly_totals(self, start_month=None, end_month=None):
+        """Retorna (year_month, type, category, total, count) da tabela monthly_totals.
+
+        Os meses são strings 'YYYY-MM' e os limites são inclusivos. O custo é
+        proporcional ao número de meses/categorias, não ao de transações.
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        query = "SELECT year_month, type, category, total, count FROM monthly_totals WHERE user_id = ?"
+        params = [self.user.id]
+        
+        if start_month or end_month:
+            query += " AND year_month != ''"
+        
+        if start_month:
+            query += " AND year_month >= ?"
+            params.append(start_month)
+        
+        if end_month:
+            query += " AND year_month <= ?"
+            params.append(end_month)
+        
+        query += " ORDER BY year_month, type, category"
+        
+        cursor.execute(query, params)
+        totals = cursor.fetchall()
+        conn.close()
+        
+        return totals
+    
+    def get_totals_by_type(self, start_month=None, end_month=None):
+        """Retorna {tipo: total} somando os agregados mensais do período"""
+        totals = {'income': 0.0, 'expense': 0.0, 'investment': 0.0}
+        for _, type, _, total, _ in self.get_monthly_totals(start_month, end_month):
+            totals[type] = totals.get(type, 0.0) + total
+        return totals
+    
+    def get_monthly_summary(self, year, month):
+        """Retorna um resumo das transações do mês"""
         conn = get_db_connection()
         cursor = conn.cursor()
         
         cursor.execute(
             """
             SELECT 
-                SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) -
-                SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END)
-            FROM transactions
-            WHERE user_id = ?
+                type,
+                SUM(total) as total,
+                SUM(count) as count
+            FROM monthly_totals
+            WHERE user_id = ? AND year_month = ?
+            GROUP BY type
             """,
-            (self.user.id,)
+            (self.user.id, f"{year}-{month:02d}")
         )
         
-        balance = cursor.fetchone()[0] or 0
+        summary = cursor.fetchall()
         conn.close()
         
-        return balance
+        return summary
     
-    def get_monthly_summary(self, year, month):
-        """Retorna um resumo das transações do mês"""
+    def get_month_type_totals(self, year, month):
+        """Retorna {tipo: total} do mês a partir da tabela monthly_totals"""
+        year_month = f"{year}-{month:02d}"
+        return self.get_totals_by_type(year_month, year_month)
+    
+    def get_expense_ranking(self, year, month, limit=None):
+        """Retorna [(rótulo, total)] das despesas do mês por categoria/subcategoria.
+
+        O rótulo é 'categoria / subcategoria' (ou só a categoria) e a lista
+        vem do maior para o menor total. O agrupamento é feito no SQL sobre o
+        intervalo do mês no índice (user_id, date); subcategoria NULL e ''
+        (gravadas pelo import e pelo formulário) caem no mesmo grupo.
+        """
+        start, end = month_bounds(year, month)
+        
         conn = get_db_connection()
         cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                CASE WHEN COALESCE(subcategory, '') = '' THEN category
+                     ELSE category || ' / ' || subcategory END AS label,
+                SUM(amount) AS total
+            FROM transactions
+            WHERE user_id = ? AND type = 'expense' AND date >= ? AND date < ?
+            GROUP BY category, COALESCE(subcategory, '')
+            ORDER BY total DESC
+            LIMIT ?
+            """,
+            (self.user.id, start, end, -1 if limit is None else limit)
+        )
+        ranking = [tuple(row) for row in cursor.fetchall()]
+        conn.close()
         
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-31"
+        return ranking
+    
+    def get_monthly_series(self, start, end):
+        """Retorna a série mensal de totais entre dois meses (inclusive) em uma consulta.
+
+        `start` e `end` aceitam 'YYYY-MM', (ano, mês), date ou datetime. O filtro
+        usa o intervalo semiaberto [primeiro dia de start, primeiro dia após end),
+        que aproveita o índice (user_id, date) e inclui horários do último dia.
+        Meses sem transações aparecem com valores zerados.
+        """
+        start_year, start_month = _parse_month(start)
+        end_year, end_month = _parse_month(end)
+        if (start_year, start_month) > (end_year, end_month):
+            raise ValueError("O mês inicial deve ser anterior ou igual ao final")
         
+        range_start, _ = month_bounds(start_year, start_month)
+        _, range_end = month_bounds(end_year, end_month)
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
         cursor.execute(
             """
             SELECT 
+                substr(date, 1, 7) as year_month,
                 type,
                 SUM(amount) as total,
                 COUNT(*) as count
             FROM transactions
-            WHERE user_id = ? AND date BETWEEN ? AND ?
-            GROUP BY type
+            WHERE user_id = ? AND date >= ? AND date < ?
+            GROUP BY year_month, type
             """,
-            (self.user.id, start_date, end_date)
+            (self.user.id, range_start, range_end)
         )
-        
-        summary = cursor.fetchall()
+        rows = cursor.fetchall()
         conn.close()
         
-        return summary
+        # Monta todos os meses do intervalo, inclusive os vazios
+        series = {}
+        year, month = start_year, start_month
+        while (year, month) <= (end_year, end_month):
+            key = f"{year}-{month:02d}"
+            series[key] = {'month': key, 'income': 0.0, 'expense': 0.0, 'investment': 0.0, 'count': 0}
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        
+        for year_month, type, total, count in rows:
+            entry = series.get(year_month)
+            if entry is None:
+                continue
+            entry[type] = entry.get(type, 0.0) + total
+            entry['count'] += count
+        
+        return list(series.values())
     
     def get_category_summary(self, start_date=None, end_date=None):
         """Retorna um resumo das transações por categoria"""
+        months = _whole_months(start_date, end_date)
+        if months is not None:
+            # Período de meses inteiros: lê direto dos agregados mensais
+            summary = {}
+            for _, type, category, total, count in self.get_monthly_totals(*months):
+                current = summary.get((category, type), (0.0, 0))
+                summary[(category, type)] = (current[0] + total, current[1] + count)
+            return [(category, type, total, count) for (category, type), (total, count) in sorted(summary.items())]
+        
         conn = get_db_connection()
         cursor = conn.cursor()
         
@@ -122,8 +542,8 @@ class TransactionController:
             params.append(start_date)
         
         if end_date:
-            query += " AND date <= ?"
-            params.append(end_date)
+            query += " AND date < ?"
+            params.append(_next_day(end_date))
         
         query += " GROUP BY category, type"
         
@@ -159,6 +579,7 @@ class TransactionController:
                 (type, category, subcategory, amount, description, date, trans_id, self.user.id)
             )
             conn.commit()
+            invalidate_category_cache(self.user.id)
             return True
         except Exception as e:
             print(f"Erro ao atualizar transação: {e}")
@@ -169,7 +590,8 @@ class TransactionController:
     def get_transaction_by_id(self, trans_id):
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT id, user_id, type, category, subcategory, amount, description, date FROM transactions WHERE id = ? AND user_id = ?", (trans_id, self.user.id))
+        cursor.row_factory = transaction_row_factory
+        cursor.execute(f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE id = ? AND user_id = ?", (trans_id, self.user.id))
         trans = cursor.fetchone()
         conn.close()
         return trans 
\ No newline at end of file
@@ -1,82 +1,240 @@
 import sqlite3
 import os
+import queue
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 
+from src.config.settings import DATABASE_SETTINGS
+from src.database.migrations import migrate
+
 DB_PATH = Path(__file__).parent.parent.parent / "database" / "fin_assist.db"
 
 def init_db():
-    """Inicializa o banco de dados e cria as tabelas necessárias"""
+    """Inicializa o banco de dados aplicando as migrações pendentes"""
     # Cria o diretório do banco de dados se não existir
-    os.makedirs(DB_PATH.parent, exist_ok=True)
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    # Garante chaves estrangeiras ativas
-    cursor.execute("PRAGMA foreign_keys = ON;")
-    
-    # Tabela de usuários
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-    
-    # Tabela de transações
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS transactions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        type TEXT NOT NULL,  -- 'income', 'expense', 'investment'
-        category TEXT NOT NULL,
-        subcategory TEXT,
-        amount REAL NOT NULL,
-        description TEXT,
-        date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (id)
-    )
-    ''')
-
-    # Migração leve: adiciona coluna subcategory se a tabela existir sem ela
-    try:
-        cursor.execute("PRAGMA table_info(transactions);")
-        cols = [row[1] for row in cursor.fetchall()]
-        if 'subcategory' not in cols:
-            cursor.execute("ALTER TABLE transactions ADD COLUMN subcategory TEXT;")
-    except Exception:
-        # Evita quebrar inicialização caso PRAGMA falhe em algum ambiente
-        pass
-
-    # Índices para performance nas consultas mais comuns
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions(user_id, date);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_transactions_user_type ON transactions(user_id, type);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_goals_user_status ON financial_goals(user_id, status);")
-    
-    # Tabela de metas financeiras
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS financial_goals (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        title TEXT NOT NULL,
-        target_amount REAL NOT NULL,
-        current_amount REAL DEFAULT 0,
-        deadline DATE,
-        status TEXT DEFAULT 'active',
-        FOREIGN KEY (user_id) REFERENCES users (id)
-    )
-    ''')
+    os.makedirs(Path(DB_PATH).parent, exist_ok=True)
     
-    conn.commit()
-    conn.close()
+    with db_connection() as conn:
+        return migrate(conn.raw)
 
-def get_db_connection():
-    """Retorna uma conexão com o banco de dados com chaves estrangeiras ativas"""
-    conn = sqlite3.connect(DB_PATH)
-    try:
+class PooledConnection:
+    """Conexão emprestada do pool; close() devolve a conexão em vez de fechá-la"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    @property
+    def raw(self):
+        """Retorna a conexão sqlite3 subjacente"""
+        return self._conn
+
+    def close(self):
+        """Devolve a conexão ao pool (pode ser chamado mais de uma vez)"""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            # Blocos aninhados deixam a transação para o empréstimo mais externo
+            if self._pool.depth(self._conn) == 1:
+                if exc_type is None:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self.close()
+        return False
+
+
+class ConnectionPool:
+    """Pool de conexões SQLite com reuso por thread.
+
+    Cada thread reutiliza a mesma conexão enquanto a tiver emprestada (chamadas
+    aninhadas recebem a mesma conexão). Ao ser devolvida, a conexão volta para a
+    fila de ociosas e pode ser usada por qualquer thread. `size` limita quantas
+    conexões ficam emprestadas ao mesmo tempo. A conexão pode ser devolvida
+    por outra thread (ex.: gerador finalizado fora da thread que o criou):
+    o empréstimo é descontado da thread dona.
+    """
+
+    def __init__(self, db_path, size=None, settings=None):
+        self.db_path = str(db_path)
+        self.settings = dict(DATABASE_SETTINGS, **(settings or {}))
+        self.size = size or self.settings['pool_size']
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._borrowed = {}  # ident da thread -> [conexão, profundidade]
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        """Abre uma conexão nova e aplica os PRAGMAs uma única vez"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.settings['busy_timeout_ms'] / 1000,
+            check_same_thread=False
+        )
+        cfg = self.settings
         conn.execute("PRAGMA foreign_keys = ON;")
-    except Exception:
-        pass
-    return conn
\ No newline at end of file
+        conn.execute(f"PRAGMA busy_timeout = {int(cfg['busy_timeout_ms'])};")
+        try:
+            conn.execute(f"PRAGMA journal_mode = {cfg['journal_mode']};")
+        except sqlite3.DatabaseError:
+            # Alguns sistemas de arquivos não suportam WAL; segue com o padrão
+            pass
+        conn.execute(f"PRAGMA synchronous = {cfg['synchronous']};")
+        conn.execute(f"PRAGMA cache_size = -{int(cfg['cache_size_kb'])};")
+        conn.execute(f"PRAGMA mmap_size = {int(cfg['mmap_size_bytes'])};")
+        conn.execute(f"PRAGMA temp_store = {cfg['temp_store']};")
+        return conn
+
+    def acquire(self):
+        """Empresta uma conexão para a thread atual"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Pool de conexões fechado")
+        thread_id = threading.get_ident()
+        with self._lock:
+            entry = self._borrowed.get(thread_id)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._borrowed[thread_id] = [conn, 1]
+        return conn
+
+    def _owner(self, conn):
+        """Thread que tem `conn` emprestada (a atual primeiro), ou None"""
+        thread_id = threading.get_ident()
+        entry = self._borrowed.get(thread_id)
+        if entry is not None and entry[0] is conn:
+            return thread_id
+        return next((owner for owner, (c, _) in self._borrowed.items() if c is conn), None)
+
+    def depth(self, conn):
+        """Quantos empréstimos aninhados de `conn` estão abertos (0 se devolvida)"""
+        with self._lock:
+            owner = self._owner(conn)
+            return self._borrowed[owner][1] if owner is not None else 0
+
+    def release(self, conn):
+        """Devolve a conexão; transações não confirmadas são descartadas"""
+        with self._lock:
+            owner = self._owner(conn)
+            if owner is None:
+                return
+            entry = self._borrowed[owner]
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._borrowed[owner]
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            pass
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Context manager: commit ao sair sem erro, rollback em caso de exceção"""
+        with PooledConnection(self, self.acquire()) as conn:
+            yield conn
+
+    def close_all(self):
+        """Fecha todas as conexões ociosas e impede novos empréstimos"""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Retorna o pool do banco atual, recriando-o se DB_PATH mudar"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.db_path != str(DB_PATH):
+            if _pool is not None:
+                _pool.close_all()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+
+def close_all_connections():
+    """Fecha o pool atual (usado nos testes e ao encerrar a aplicação)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+            _pool = None
+
+
+@contextmanager
+def db_connection():
+    """Context manager para uma conexão do pool com commit/rollback automático"""
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def rebuild_monthly_totals(user_id=None):
+    """Recalcula monthly_totals a partir de transactions (todos ou um usuário)"""
+    where = "WHERE user_id = ?" if user_id is not None else ""
+    params = (user_id,) if user_id is not None else ()
+    with db_connection() as conn:
+        conn.execute(f"DELETE FROM monthly_totals {where}", params)
+        conn.execute(f'''
+            INSERT INTO monthly_totals (user_id, year_month, type, category, total, count)
+            SELECT user_id, COALESCE(substr(date, 1, 7), ''), type, category, SUM(amount), COUNT(*)
+            FROM transactions {where}
+            GROUP BY 1, 2, 3, 4
+        ''', params)
+
+
+def get_data_version(user_id):
+    """Retorna (versão das transações, versão das metas) do usuário.
+
+    Os dois números são incrementados por triggers a cada escrita, então
+    servem de chave para caches de dados derivados.
+    """
+    with db_connection() as conn:
+        row = conn.execute(
+            "SELECT version, goals_version FROM user_totals WHERE user_id = ?",
+            (user_id,)
+        ).fetchone()
+    return tuple(row) if row else (0, 0)
+
+
+def get_db_connection():
+    """Retorna uma conexão do pool; conn.close() devolve a conexão ao pool"""
+    pool = get_pool()
+    return PooledConnection(pool, pool.acquire())
@@ -0,0 +1,324 @@
+"""Migrações versionadas do esquema, controladas por PRAGMA user_version.
+
+Cada migração tem um número sequencial e é aplicada uma única vez, dentro de
+uma transação própria. Em um banco já atualizado a inicialização se resume a
+ler o user_version. Para alterar o esquema, adicione uma nova função ao final
+de MIGRATIONS; nunca edite uma migração já publicada.
+"""
+from collections import namedtuple
+
+Migration = namedtuple('Migration', ['version', 'description', 'apply'])
+
+
+def _column_names(conn, table):
+    """Retorna os nomes das colunas de uma tabela"""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table});").fetchall()]
+
+
+def _001_initial_schema(conn):
+    """Tabelas base; compatível com bancos criados pelo init_db antigo"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,  -- 'income', 'expense', 'investment'
+        category TEXT NOT NULL,
+        subcategory TEXT,
+        amount REAL NOT NULL,
+        description TEXT,
+        date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+    # Bancos antigos foram criados sem a coluna subcategory
+    if 'subcategory' not in _column_names(conn, 'transactions'):
+        conn.execute("ALTER TABLE transactions ADD COLUMN subcategory TEXT;")
+
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS financial_goals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        target_amount REAL NOT NULL,
+        current_amount REAL DEFAULT 0,
+        deadline DATE,
+        status TEXT DEFAULT 'active',
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )
+    ''')
+
+
+def _002_base_indexes(conn):
+    """Índices das consultas mais comuns (criados só depois das tabelas)"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions(user_id, date);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_user_type ON transactions(user_id, type);")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_goals_user_status ON financial_goals(user_id, status);")
+
+
+def _003_monthly_totals(conn):
+    """Agregados mensais por tipo/categoria mantidos por triggers"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS monthly_totals (
+        user_id INTEGER NOT NULL,
+        year_month TEXT NOT NULL,  -- 'YYYY-MM' ('' para transações sem data)
+        type TEXT NOT NULL,
+        category TEXT NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, year_month, type, category)
+    ) WITHOUT ROWID
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_totals (user_id, year_month, type, category, total, count)
+        VALUES (NEW.user_id, COALESCE(substr(NEW.date, 1, 7), ''), NEW.type, NEW.category, NEW.amount, 1)
+        ON CONFLICT (user_id, year_month, type, category)
+        DO UPDATE SET total = total + excluded.total, count = count + 1;
+    END
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        UPDATE monthly_totals
+        SET total = total - OLD.amount, count = count - 1
+        WHERE user_id = OLD.user_id AND year_month = COALESCE(substr(OLD.date, 1, 7), '')
+          AND type = OLD.type AND category = OLD.category;
+        DELETE FROM monthly_totals
+        WHERE user_id = OLD.user_id AND year_month = COALESCE(substr(OLD.date, 1, 7), '')
+          AND type = OLD.type AND category = OLD.category AND count <= 0;
+    END
+    ''')
+
+    conn.execute('''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_totals_update
+    AFTER UPDATE OF user_id, type, category, amount, date ON transactions
+    BEGIN
+        UPDATE monthly_totals
+        SET total = total - OLD.amount, count = count - 1
+        WHERE user_id = OLD.user_id AND year_month = COALESCE(substr(OLD.date, 1, 7), '')
+          AND type = OLD.type AND category = OLD.category;
+        DELETE FROM monthly_totals
+        WHERE user_id = OLD.user_id AND year_month = COALESCE(substr(OLD.date, 1, 7), '')
+          AND type = OLD.type AND category = OLD.category AND count <= 0;
+        INSERT INTO monthly_totals (user_id, year_month, type, category, total, count)
+        VALUES (NEW.user_id, COALESCE(substr(NEW.date, 1, 7), ''), NEW.type, NEW.category, NEW.amount, 1)
+        ON CONFLICT (user_id, year_month, type, category)
+        DO UPDATE SET total = total + excluded.total, count = count + 1;
+    END
+    ''')
+
+    # Preenche a partir das transações já existentes
+    conn.execute("DELETE FROM monthly_totals;")
+    conn.execute('''
+    INSERT INTO monthly_totals (user_id, year_month, type, category, total, count)
+    SELECT user_id, COALESCE(substr(date, 1, 7), ''), type, category, SUM(amount), COUNT(*)
+    FROM transactions
+    GROUP BY 1, 2, 3, 4
+    ''')
+
+
+def _004_user_totals(conn):
+    """Saldo e totais por usuário, ajustados em O(1) a cada escrita"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS user_totals (
+        user_id INTEGER PRIMARY KEY,
+        income REAL NOT NULL DEFAULT 0,
+        expense REAL NOT NULL DEFAULT 0,
+        investment REAL NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        version INTEGER NOT NULL DEFAULT 0  -- incrementado a cada escrita
+    )
+    ''')
+
+    add_new = '''
+        INSERT INTO user_totals (user_id, income, expense, investment, count, version)
+        VALUES (
+            NEW.user_id,
+            CASE WHEN NEW.type = 'income' THEN NEW.amount ELSE 0 END,
+            CASE WHEN NEW.type = 'expense' THEN NEW.amount ELSE 0 END,
+            CASE WHEN NEW.type = 'investment' THEN NEW.amount ELSE 0 END,
+            1, 1
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            income = income + excluded.income,
+            expense = expense + excluded.expense,
+            investment = investment + excluded.investment,
+            count = count + 1,
+            version = version + 1;
+    '''
+    remove_old = '''
+        UPDATE user_totals SET
+            income = income - CASE WHEN OLD.type = 'income' THEN OLD.amount ELSE 0 END,
+            expense = expense - CASE WHEN OLD.type = 'expense' THEN OLD.amount ELSE 0 END,
+            investment = investment - CASE WHEN OLD.type = 'investment' THEN OLD.amount ELSE 0 END,
+            count = count - 1,
+            version = version + 1
+        WHERE user_id = OLD.user_id;
+    '''
+
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_balance_insert
+    AFTER INSERT ON transactions
+    BEGIN {add_new} END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_balance_delete
+    AFTER DELETE ON transactions
+    BEGIN {remove_old} END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_balance_update
+    AFTER UPDATE ON transactions
+    BEGIN {remove_old} {add_new} END
+    """)
+
+    # Preenche a partir das transações já existentes
+    conn.execute("DELETE FROM user_totals;")
+    conn.execute('''
+    INSERT INTO user_totals (user_id, income, expense, investment, count, version)
+    SELECT
+        user_id,
+        SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END),
+        SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END),
+        SUM(CASE WHEN type = 'investment' THEN amount ELSE 0 END),
+        COUNT(*),
+        0
+    FROM transactions
+    GROUP BY user_id
+    ''')
+
+
+def _005_categories(conn):
+    """Tabela de categorias; remove as transações-sentinela de 0.01"""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        type TEXT NOT NULL,  -- 'income', 'expense', 'investment'
+        name TEXT NOT NULL,
+        parent_id INTEGER,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (parent_id) REFERENCES categories (id) ON DELETE CASCADE
+    )
+    ''')
+    conn.execute('''
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_categories_user_type_name
+    ON categories(user_id, type, IFNULL(parent_id, 0), name)
+    ''')
+
+    # Categorias usadas em transações passam a existir na tabela automaticamente
+    register = '''
+        INSERT OR IGNORE INTO categories (user_id, type, name)
+        VALUES (NEW.user_id, NEW.type, NEW.category);
+    '''
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_category_insert
+    AFTER INSERT ON transactions
+    BEGIN {register} END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_category_update
+    AFTER UPDATE OF user_id, type, category ON transactions
+    BEGIN {register} END
+    """)
+
+    conn.execute('''
+    INSERT OR IGNORE INTO categories (user_id, type, name)
+    SELECT DISTINCT user_id, type, category FROM transactions
+    ''')
+
+    # Transações criadas só para "registrar" uma categoria personalizada
+    conn.execute('''
+    DELETE FROM transactions
+    WHERE amount = 0.01 AND description = 'Categoria personalizada'
+      AND COALESCE(subcategory, '') = ''
+    ''')
+
+
+def _006_goals_version(conn):
+    """Versão das metas em user_totals, incrementada por triggers a cada escrita"""
+    if 'goals_version' not in _column_names(conn, 'user_totals'):
+        conn.execute("ALTER TABLE user_totals ADD COLUMN goals_version INTEGER NOT NULL DEFAULT 0;")
+
+    bump = '''
+        INSERT INTO user_totals (user_id, goals_version) VALUES ({row}.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET goals_version = goals_version + 1;
+    '''
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_goals_version_insert
+    AFTER INSERT ON financial_goals
+    BEGIN {bump.format(row='NEW')} END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_goals_version_update
+    AFTER UPDATE ON financial_goals
+    BEGIN {bump.format(row='NEW')} END
+    """)
+    conn.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS trg_goals_version_delete
+    AFTER DELETE ON financial_goals
+    BEGIN {bump.format(row='OLD')} END
+    """)
+
+
+MIGRATIONS = [
+    Migration(1, "esquema inicial", _001_initial_schema),
+    Migration(2, "índices básicos", _002_base_indexes),
+    Migration(3, "agregados mensais (monthly_totals)", _003_monthly_totals),
+    Migration(4, "cache de saldo por usuário (user_totals)", _004_user_totals),
+    Migration(5, "tabela de categorias", _005_categories),
+    Migration(6, "versão das metas (user_totals.goals_version)", _006_goals_version),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn):
+    """Retorna a versão do esquema gravada no banco"""
+    return conn.execute("PRAGMA user_version;").fetchone()[0]
+
+
+def migrate(conn, target_version=None):
+    """Aplica as migrações pendentes e retorna a versão final do esquema.
+
+    Cada migração roda em sua própria transação junto com a atualização do
+    user_version; se uma falhar, ela é desfeita e a exceção é propagada.
+    """
+    target = LATEST_VERSION if target_version is None else target_version
+    current = get_schema_version(conn)
+    if current >= target:
+        return current
+
+    for migration in MIGRATIONS:
+        if migration.version <= current or migration.version > target:
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN")
+        try:
+            migration.apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)};")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        current = migration.version
+
+    return current
@@ -0,0 +1,40 @@
+from collections import namedtuple
+
+from src.models.transaction import parse_db_date, format_display_date
+
+GOAL_FIELDS = ('id', 'user_id', 'title', 'target_amount', 'current_amount', 'deadline', 'status')
+
+
+class Goal(namedtuple('Goal', GOAL_FIELDS)):
+    """Linha da tabela financial_goals (tupla com campos nomeados)"""
+    __slots__ = ()
+
+    @property
+    def target(self):
+        """Valor alvo como float"""
+        return float(self.target_amount or 0)
+
+    @property
+    def current(self):
+        """Valor atual como float"""
+        return float(self.current_amount or 0)
+
+    @property
+    def progress(self):
+        """Percentual atingido da meta"""
+        return (self.current / self.target) * 100 if self.target > 0 else 0
+
+    @property
+    def deadline_date(self):
+        """Prazo como datetime (ou None)"""
+        return parse_db_date(self.deadline)
+
+    @property
+    def deadline_display(self):
+        """Prazo no formato DD-MM-YYYY"""
+        return format_display_date(self.deadline) if self.deadline else ''
+
+
+def goal_row_factory(cursor, row):
+    """row_factory do sqlite3 que devolve Goal"""
+    return Goal(*row)
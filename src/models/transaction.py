@@ -0,0 +1,60 @@
+from collections import namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+TRANSACTION_FIELDS = ('id', 'user_id', 'type', 'category', 'subcategory', 'amount', 'description', 'date')
+
+
+@lru_cache(maxsize=4096)
+def parse_db_date(value):
+    """Converte uma data do banco ('YYYY-MM-DD' ou 'YYYY-MM-DD HH:MM:SS') em datetime.
+
+    O resultado é memorizado por string, então cada data distinta é
+    decodificada uma única vez. Retorna None se o valor for vazio ou inválido.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def format_display_date(value):
+    """Formata uma data do banco como DD-MM-YYYY para exibição"""
+    parsed = parse_db_date(value)
+    if parsed:
+        return parsed.strftime('%d-%m-%Y')
+    return (value or '')[:10]
+
+
+class Transaction(namedtuple('Transaction', TRANSACTION_FIELDS)):
+    """Linha da tabela transactions.
+
+    É uma tupla (mesmo consumo de memória e acesso por índice de antes), com
+    campos nomeados e conversões calculadas só quando usadas.
+    """
+    __slots__ = ()
+
+    @property
+    def value(self):
+        """Valor como float (0.0 se não for numérico)"""
+        try:
+            return float(self.amount)
+        except (TypeError, ValueError):
+            return 0.0
+
+    @property
+    def parsed_date(self):
+        """Data como datetime (ou None)"""
+        return parse_db_date(self.date)
+
+    @property
+    def date_display(self):
+        """Data no formato DD-MM-YYYY"""
+        return format_display_date(self.date)
+
+
+def transaction_row_factory(cursor, row):
+    """row_factory do sqlite3 que devolve Transaction"""
+    return Transaction(*row)
@@ -0,0 +1,80 @@
+from src.database.database import get_db_connection
+from src.controllers.goal_controller import GoalController
+from src.controllers.transaction_controller import TransactionController
+from collections import namedtuple
+from datetime import datetime
+
+TOP_EXPENSES_LIMIT = 8
+
+# Dados prontos para o dashboard:
+# - totals / month_totals: {'income', 'expense', 'investment'} (geral e do mês)
+# - top_expenses: [(rótulo 'categoria / subcategoria', total)] do mês, maior primeiro
+# - goals: lista de Goal
+DashboardSnapshot = namedtuple(
+    'DashboardSnapshot',
+    ['year_month', 'totals', 'balance', 'month_totals', 'top_expenses', 'goals']
+)
+
+class DashboardService:
+    """Monta o dashboard com consultas agregadas, sem carregar as transações.
+
+    Os totais vêm de user_totals e monthly_totals (mantidos por triggers) e o
+    ranking de gastos é agrupado no SQL usando o intervalo do mês no índice
+    (user_id, date); o custo não cresce com o histórico do usuário.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self.transactions = TransactionController(user)
+        self.goals = GoalController(user)
+
+    def get_snapshot(self, year=None, month=None, top_limit=TOP_EXPENSES_LIMIT):
+        """Retorna um DashboardSnapshot do mês informado (padrão: mês atual)"""
+        if year is None or month is None:
+            now = datetime.now()
+            year, month = now.year, now.month
+        year_month = f"{year}-{month:02d}"
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            # Totais gerais e do mês em uma única consulta
+            cursor.execute(
+                """
+                SELECT 'all', income, expense, investment
+                FROM user_totals WHERE user_id = ?
+                UNION ALL
+                SELECT
+                    'month',
+                    TOTAL(CASE WHEN type = 'income' THEN total END),
+                    TOTAL(CASE WHEN type = 'expense' THEN total END),
+                    TOTAL(CASE WHEN type = 'investment' THEN total END)
+                FROM monthly_totals WHERE user_id = ? AND year_month = ?
+                """,
+                (self.user.id, self.user.id, year_month)
+            )
+            figures = {
+                'all': dict.fromkeys(('income', 'expense', 'investment'), 0.0),
+                'month': dict.fromkeys(('income', 'expense', 'investment'), 0.0),
+            }
+            for scope, income, expense, investment in cursor.fetchall():
+                figures[scope] = {'income': income, 'expense': expense, 'investment': investment}
+
+            # Ranking de gastos do mês por categoria/subcategoria (mesma conexão da thread)
+            top_expenses = self.transactions.get_expense_ranking(year, month, top_limit)
+
+            # Metas na ordem de GoalController (prazo mais próximo primeiro)
+            goals = self.goals.get_goals()
+        finally:
+            conn.close()
+
+        totals = figures['all']
+        return DashboardSnapshot(
+            year_month=year_month,
+            totals=totals,
+            balance=totals['income'] - totals['expense'],
+            month_totals=figures['month'],
+            top_expenses=top_expenses,
+            goals=goals,
+        )
@@ -0,0 +1,85 @@
+"""Importação e exportação de dados sem interface gráfica.
+
+Recebe caminhos (ou arquivos já abertos) e devolve objetos de resultado
+com contagens, tempo gasto e erros; nunca abre diálogos. A interface Tk
+(src/utils/data_import_export.py) e a linha de comando são camadas finas
+sobre este serviço.
+"""
+import csv
+import os
+import time
+from collections import namedtuple
+
+from src.config.settings import IMPORT_EXPORT_SETTINGS
+from src.services import backup
+from src.services.transaction_import import TransactionImporter
+
+# Resultado de uma exportação: `path` é None quando o destino era um arquivo aberto
+ExportResult = namedtuple('ExportResult', ['path', 'records', 'elapsed'])
+
+TRANSACTION_CSV_HEADER = ['ID', 'Tipo', 'Categoria', 'Subcategoria', 'Valor', 'Descrição', 'Data']
+GOAL_CSV_HEADER = ['ID', 'Título', 'Valor Alvo', 'Valor Atual', 'Prazo', 'Status']
+
+class ImportExportService:
+    """Operações de import/export dos dados de um usuário"""
+
+    def __init__(self, transaction_controller, goal_controller):
+        self.transaction_controller = transaction_controller
+        self.goal_controller = goal_controller
+
+    def _write_csv(self, destination, header, rows):
+        """Grava o CSV em um caminho ou arquivo texto aberto; retorna ExportResult"""
+        started = time.perf_counter()
+        if isinstance(destination, (str, os.PathLike)):
+            with open(destination, 'w', newline='', encoding=IMPORT_EXPORT_SETTINGS['encoding']) as f:
+                records = self._write_csv_rows(f, header, rows)
+            path = os.fspath(destination)
+        else:
+            records = self._write_csv_rows(destination, header, rows)
+            path = None
+        return ExportResult(path, records, time.perf_counter() - started)
+
+    @staticmethod
+    def _write_csv_rows(f, header, rows):
+        writer = csv.writer(f)
+        writer.writerow(header)
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+        return count
+
+    def export_transactions_csv(self, destination):
+        """Exporta as transações (em fluxo) para CSV com datas DD-MM-YYYY"""
+        rows = (
+            (t.id, t.type, t.category, t.subcategory, t.amount, t.description, t.date_display)
+            for t in self.transaction_controller.iter_transactions()
+        )
+        return self._write_csv(destination, TRANSACTION_CSV_HEADER, rows)
+
+    def export_goals_csv(self, destination):
+        """Exporta as metas para CSV com prazos DD-MM-YYYY"""
+        rows = (
+            (g.id, g.title, g.target_amount, g.current_amount, g.deadline_display, g.status)
+            for g in self.goal_controller.get_goals()
+        )
+        return self._write_csv(destination, GOAL_CSV_HEADER, rows)
+
+    def import_transactions_csv(self, source, progress_callback=None, **options):
+        """Importa transações de CSV; retorna ImportResult.
+
+        `options` são repassadas ao TransactionImporter (batch_size,
+        skip_duplicates, max_errors).
+        """
+        importer = TransactionImporter(self.transaction_controller, **options)
+        return importer.import_csv(source, progress_callback=progress_callback)
+
+    def backup(self, destination, progress_callback=None):
+        """Grava o backup completo (NDJSON, compactado pela extensão); retorna BackupResult"""
+        return backup.write_backup(self.transaction_controller, self.goal_controller,
+                                   destination, progress_callback)
+
+    def restore(self, source, replace=False, progress_callback=None):
+        """Restaura um backup; retorna BackupResult"""
+        return backup.restore_backup(self.transaction_controller, source, replace=replace,
+                                     progress_callback=progress_callback)
@@ -0,0 +1,272 @@
+"""Importação de transações em fluxo, sem depender da interface.
+
+Pipeline: leitura do CSV → validação/normalização → deduplicação →
+gravação em lotes (executemany) dentro de uma única transação do banco.
+As linhas inválidas entram no relatório de erros sem interromper a
+importação; uma falha do banco (ou excesso de erros) desfaz tudo.
+
+Pela linha de comando use `python -m fin_assist import USUARIO arquivo.csv`;
+`python -m src.services.transaction_import` é um atalho para o mesmo comando.
+"""
+import csv
+import io
+import math
+import os
+import sys
+import time
+from collections import Counter, namedtuple
+from datetime import datetime
+from functools import lru_cache
+
+from src.config.settings import IMPORT_EXPORT_SETTINGS, MAX_TRANSACTION_DESCRIPTION_LENGTH
+from src.controllers.transaction_controller import BULK_CHUNK_SIZE
+from src.database.database import get_db_connection
+from src.utils.intent_matcher import fold_text
+
+# Erro de uma linha do arquivo (linha 1 é o cabeçalho)
+RowError = namedtuple('RowError', ['line', 'message'])
+
+# Resultado da importação; `elapsed` em segundos
+ImportResult = namedtuple('ImportResult', ['imported', 'duplicates', 'errors', 'rows_read', 'elapsed'])
+
+# Cabeçalhos aceitos (sem acento, minúsculos) -> campo da transação.
+# Os do export do próprio app ('Tipo', 'Valor', 'Data'...) e os em inglês.
+COLUMN_ALIASES = {
+    'tipo': 'type', 'type': 'type',
+    'categoria': 'category', 'category': 'category',
+    'subcategoria': 'subcategory', 'subcategory': 'subcategory',
+    'valor': 'amount', 'amount': 'amount', 'value': 'amount',
+    'descricao': 'description', 'description': 'description',
+    'data': 'date', 'date': 'date',
+}
+
+TYPE_ALIASES = {
+    'income': 'income', 'receita': 'income',
+    'expense': 'expense', 'despesa': 'expense',
+    'investment': 'investment', 'investimento': 'investment',
+}
+
+DATE_FORMATS = ('%d-%m-%Y', '%Y-%m-%d', '%d/%m/%Y')
+
+class ImportAborted(Exception):
+    """Importação interrompida por excesso de erros (nada é gravado)"""
+
+@lru_cache(maxsize=4096)
+def parse_import_date(value):
+    """Converte DD-MM-YYYY, YYYY-MM-DD ou DD/MM/YYYY em 'YYYY-MM-DD'.
+
+    Memorizada: extratos repetem poucas datas distintas.
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError(f"Data inválida: {value!r} (use DD-MM-YYYY)")
+
+def parse_amount(value):
+    """Converte '1234.56', '1.234,56' ou 'R$ 50,00' em float positivo"""
+    text = (value or '').replace('R$', '').replace(' ', '').strip()
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        amount = float(text)
+    except ValueError:
+        raise ValueError(f"Valor inválido: {value!r}")
+    if not math.isfinite(amount) or amount <= 0:
+        raise ValueError(f"O valor deve ser maior que zero: {value!r}")
+    return amount
+
+def normalize_row(row):
+    """Valida uma linha já mapeada para os campos da transação e a normaliza"""
+    type = TYPE_ALIASES.get(fold_text((row.get('type') or '').strip()))
+    if type is None:
+        raise ValueError(f"Tipo inválido: {row.get('type')!r}")
+
+    category = (row.get('category') or '').strip()
+    if not category:
+        raise ValueError("Categoria vazia")
+
+    description = (row.get('description') or '').strip() or None
+    if description and len(description) > MAX_TRANSACTION_DESCRIPTION_LENGTH:
+        raise ValueError(f"Descrição com mais de {MAX_TRANSACTION_DESCRIPTION_LENGTH} caracteres")
+
+    return {
+        'type': type,
+        'category': category,
+        'subcategory': (row.get('subcategory') or '').strip() or None,
+        'amount': parse_amount(row.get('amount')),
+        'description': description,
+        'date': parse_import_date((row.get('date') or '').strip()),
+    }
+
+def _dedupe_key(type, category, subcategory, amount, description, date):
+    return (type, category, subcategory or '', round(amount, 2), description or '', date)
+
+class _CountingReader(io.RawIOBase):
+    """Arquivo binário que conta os bytes lidos (para o progresso)"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.raw.read(len(buffer))
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+class TransactionImporter:
+    """Importa transações de CSV para o usuário do TransactionController.
+
+    Com `skip_duplicates` (padrão) uma linha igual a uma transação já gravada
+    (mesmo tipo, categoria, subcategoria, valor, descrição e data) é
+    ignorada. A comparação é por contagem: se o banco tem 2 lançamentos
+    idênticos e o arquivo 3, só o terceiro entra. Reimportar um export é
+    seguro, e lançamentos repetidos legítimos de um arquivo novo são mantidos.
+    """
+
+    def __init__(self, transaction_controller, batch_size=BULK_CHUNK_SIZE,
+                 skip_duplicates=True, max_errors=None):
+        self.transaction_controller = transaction_controller
+        self.batch_size = batch_size
+        self.skip_duplicates = skip_duplicates
+        self.max_errors = max_errors
+
+    def import_csv(self, source, progress_callback=None, encoding=None):
+        """Importa um CSV (caminho ou arquivo binário aberto) e retorna ImportResult.
+
+        `progress_callback(fração, importadas)` é chamado após cada lote
+        gravado, com a fração do arquivo já lida (0.0 a 1.0).
+        """
+        encoding = encoding or IMPORT_EXPORT_SETTINGS['encoding']
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as raw:
+                return self._import_stream(raw, os.path.getsize(source), progress_callback, encoding)
+        return self._import_stream(source, None, progress_callback, encoding)
+
+    def _import_stream(self, raw, size, progress_callback, encoding):
+        counter = _CountingReader(raw)
+        # utf-8-sig: aceita planilhas que gravam BOM no início
+        if encoding.replace('-', '').lower() == 'utf8':
+            encoding = 'utf-8-sig'
+        text = io.TextIOWrapper(io.BufferedReader(counter), encoding=encoding, newline='')
+        reader = csv.reader(text)
+
+        header = next(reader, None)
+        if header is None:
+            return ImportResult(0, 0, [], 0, 0.0)
+        fields = [COLUMN_ALIASES.get(fold_text(name.strip())) for name in header]
+        missing = {'type', 'category', 'amount', 'date'} - set(fields)
+        if missing:
+            raise ValueError("Colunas obrigatórias ausentes: " + ", ".join(sorted(missing)))
+
+        def rows():
+            for line, values in enumerate(reader, start=2):
+                if not any(values):
+                    continue  # Linha em branco
+                yield line, {field: value for field, value in zip(fields, values) if field}
+
+        def progress(imported):
+            if progress_callback:
+                fraction = min(1.0, counter.bytes_read / size) if size else 0.0
+                progress_callback(fraction, imported)
+
+        return self.import_rows(rows(), progress)
+
+    def import_rows(self, rows, progress_callback=None):
+        """Importa um iterável de (número da linha, dict de campos) e retorna ImportResult.
+
+        `progress_callback(importadas)` é chamado após cada lote gravado.
+        """
+        started = time.perf_counter()
+        errors = []
+        stats = {'read': 0, 'duplicates': 0}
+        existing = _ExistingTransactions(self.transaction_controller.user.id) if self.skip_duplicates else None
+
+        def valid_rows():
+            for line, row in rows:
+                stats['read'] += 1
+                try:
+                    record = normalize_row(row)
+                except ValueError as e:
+                    errors.append(RowError(line, str(e)))
+                    if self.max_errors is not None and len(errors) > self.max_errors:
+                        raise ImportAborted(f"Mais de {self.max_errors} linhas com erro; nada foi importado")
+                    continue
+                if existing is not None and existing.consume(record):
+                    stats['duplicates'] += 1
+                    continue
+                yield record
+
+        # Todos os lotes na mesma transação: um erro no banco desfaz a importação inteira
+        imported = self.transaction_controller.add_transactions_bulk(
+            valid_rows(), chunk_size=self.batch_size, progress_callback=progress_callback
+        )
+        return ImportResult(imported, stats['duplicates'], errors, stats['read'], time.perf_counter() - started)
+
+class _ExistingTransactions:
+    """Contagem das transações já gravadas, carregada por dia sob demanda.
+
+    Cada dia é lido (pelo índice user_id, date) na primeira vez que aparece
+    no arquivo, antes de qualquer linha desse dia ser gravada, então as
+    linhas recém-importadas não contam como duplicadas.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.counts = Counter()
+        self.loaded_days = set()
+
+    def _load_day(self, day):
+        self.loaded_days.add(day)
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute(
+                """
+                SELECT type, category, subcategory, amount, description, date
+                FROM transactions
+                WHERE user_id = ? AND date >= ? AND date < ?
+                """,
+                (self.user_id, day, day + '~')  # '~' ordena depois de ' HH:MM:SS'
+            )
+            for row in cursor:
+                self.counts[_dedupe_key(*row)] += 1
+        finally:
+            conn.close()
+
+    def consume(self, record):
+        """Retorna True (e desconta) se a linha já existe no banco"""
+        day = record['date'][:10]
+        if day not in self.loaded_days:
+            self._load_day(day)
+        key = _dedupe_key(record['type'], record['category'], record['subcategory'],
+                          record['amount'], record['description'], record['date'])
+        if self.counts[key] > 0:
+            self.counts[key] -= 1
+            return True
+        return False
+
+def format_report(result, max_errors=5):
+    """Resumo legível do ImportResult (usado pela interface e pela CLI)"""
+    lines = [f"Importadas {result.imported} de {result.rows_read} linhas em {result.elapsed:.2f}s."]
+    if result.duplicates:
+        lines.append(f"{result.duplicates} linhas já existiam e foram ignoradas.")
+    if result.errors:
+        lines.append(f"\nErros encontrados ({len(result.errors)}):")
+        lines.extend(f"Linha {e.line}: {e.message}" for e in result.errors[:max_errors])
+        if len(result.errors) > max_errors:
+            lines.append(f"... e mais {len(result.errors) - max_errors} erros")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Atalho para `python -m fin_assist import` (mesmas opções e códigos de saída)"""
+    from fin_assist.cli import main as cli_main
+
+    return cli_main(['import', *(sys.argv[1:] if argv is None else argv)])
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Medição das operações em lote sobre um banco temporário.
+
+Usado por `python -m fin_assist benchmark`: cria um usuário com `rows`
+transações sintéticas e cronometra importação, reimportação (tudo
+duplicado), exportação, backup, restauração, dashboard e relatório, além
+do tempo de import da própria CLI.
+"""
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+import src.database.database as db_module
+
+CATEGORIES = {
+    'income': ['Salário', 'Freelance'],
+    'expense': ['Moradia', 'Alimentação', 'Transporte', 'Lazer', 'Saúde'],
+    'investment': ['Renda Fixa', 'Ações'],
+}
+
+def write_sample_csv(path, rows, seed=0):
+    """Grava um CSV no formato do export com `rows` transações aleatórias"""
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Tipo', 'Categoria', 'Subcategoria', 'Valor', 'Descrição', 'Data'])
+        for i in range(rows):
+            type = rng.choice(('income', 'expense', 'expense', 'expense', 'investment'))
+            day = start + timedelta(days=rng.randrange(5 * 365))
+            writer.writerow([type, rng.choice(CATEGORIES[type]), '', f'{rng.uniform(5, 3000):.2f}',
+                             f'Lançamento {i}', day.strftime('%d-%m-%Y')])
+
+def run_benchmark(rows=10000):
+    """Executa as medições e retorna [(operação, segundos, registros)]"""
+    from src.controllers.goal_controller import GoalController
+    from src.controllers.transaction_controller import TransactionController
+    from src.models.user import User
+    from src.services.dashboard_service import DashboardService
+    from src.services.import_export import ImportExportService
+
+    results = []
+
+    def timed(name, func, records=None):
+        started = time.perf_counter()
+        value = func()
+        results.append((name, time.perf_counter() - started, records))
+        return value
+
+    original_path = db_module.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        db_module.close_all_connections()
+        db_module.DB_PATH = os.path.join(tmp, 'benchmark.db')
+        try:
+            db_module.init_db()
+            user = User(username='benchmark', password='-', email='benchmark@example.com')
+            user.save()
+            transactions = TransactionController(user)
+            service = ImportExportService(transactions, GoalController(user))
+
+            source = os.path.join(tmp, 'amostra.csv')
+            write_sample_csv(source, rows)
+
+            timed('importar CSV', lambda: service.import_transactions_csv(source), rows)
+            timed('reimportar (duplicadas)', lambda: service.import_transactions_csv(source), rows)
+            timed('exportar CSV', lambda: service.export_transactions_csv(os.path.join(tmp, 'export.csv')), rows)
+            backup_path = os.path.join(tmp, 'backup.ndjson.gz')
+            timed('backup (gzip)', lambda: service.backup(backup_path), rows)
+            timed('restaurar backup', lambda: service.restore(backup_path, replace=True), rows)
+            timed('dashboard', lambda: DashboardService(user).get_snapshot())
+
+            try:
+                from src.utils.pdf_generator import PDFGenerator
+            except ImportError:
+                pass  # reportlab ausente: relatório fora da medição
+            else:
+                timed('relatório PDF', lambda: PDFGenerator(user).generate_financial_report(
+                    transactions.iter_transactions(), [], os.path.join(tmp, 'relatorio.pdf'),
+                    totals=transactions.get_period_totals()), rows)
+        finally:
+            db_module.close_all_connections()
+            db_module.DB_PATH = original_path
+
+    from src.utils.startup import measure_imports
+    entries = measure_imports('fin_assist.cli')
+    total_us = next((cumulative for name, _, cumulative, _ in entries if name == 'fin_assist.cli'), 0)
+    results.append(('import da CLI', total_us / 1e6, None))
+    return results
+
+def format_benchmark(results):
+    """Tabela legível dos resultados de run_benchmark"""
+    lines = [f"{'operação':<26}{'tempo (s)':>10}{'registros/s':>14}"]
+    for name, elapsed, records in results:
+        rate = f"{records / elapsed:,.0f}" if records and elapsed > 0 else '-'
+        lines.append(f"{name:<26}{elapsed:>10.3f}{rate:>14}")
+    return "\n".join(lines)
@@ -1,127 +1,225 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import datetime
-from collections import defaultdict
+import math
 import customtkinter as ctk
 
+RANKING_LIMIT = 8  # Linhas do ranking de gastos
+
 class ChartGenerator:
-    def __init__(self):
+    """Gera os gráficos do mês a partir de totais já agregados.
+
+    `data_provider` (normalmente o TransactionController) fornece os dados
+    agrupados no banco:
+    - get_month_type_totals(ano, mês) -> {tipo: total}
+    - get_expense_ranking(ano, mês, limite) -> [(rótulo, total)], maior primeiro
+    Assim qualquer mês é desenhado a partir de poucas linhas agregadas, sem
+    percorrer as transações.
+    """
+    
+    def __init__(self, data_provider=None):
+        self.data_provider = data_provider
         self.colors = {
             'income': '#43A047',      # Verde
             'expense': '#E53935',     # Vermelho
             'investment': '#FBC02D'   # Amarelo
         }
     
-    def create_monthly_pie_chart(self, transactions, master_frame):
+    def _resolve_month(self, year, month):
+        if year is None or month is None:
+            now = datetime.datetime.now()
+            return now.year, now.month
+        return year, month
+    
+    def _provider(self):
+        if self.data_provider is None:
+            raise ValueError("ChartGenerator sem data_provider: informe os totais já agregados")
+        return self.data_provider
+    
+    def monthly_type_totals(self, year=None, month=None):
+        """Totais do mês por tipo (padrão: mês atual)"""
+        year, month = self._resolve_month(year, month)
+        totals = {'income': 0.0, 'expense': 0.0, 'investment': 0.0}
+        totals.update(self._provider().get_month_type_totals(year, month))
+        return totals
+    
+    def expense_ranking(self, year=None, month=None, limit=RANKING_LIMIT):
+        """Despesas do mês por categoria/subcategoria, da maior para a menor"""
+        year, month = self._resolve_month(year, month)
+        return self._provider().get_expense_ranking(year, month, limit)
+    
+    def create_monthly_pie_chart(self, master_frame, year=None, month=None):
         """Cria gráfico de pizza com distribuição financeira do mês"""
-        # Filtra transações do mês atual
-        now = datetime.datetime.now()
-        transacoes_mes = []
-        
-        for t in transactions:
-            data_str = t[7]  # data está em t[7]
-            try:
-                # Tenta com hora completa
-                data_dt = datetime.datetime.strptime(data_str, '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                try:
-                    # Tenta só com data
-                    data_dt = datetime.datetime.strptime(data_str, '%Y-%m-%d')
-                except Exception:
-                    continue
-            if data_dt.month == now.month and data_dt.year == now.year:
-                transacoes_mes.append(t)
-        
-        # Calcula valores por tipo
-        valores = []
-        labels = []
-        cores = []
-        
-        for tipo in ['income', 'expense', 'investment']:
-            valor = sum(t[5] for t in transacoes_mes if t[2] == tipo)
-            if valor > 0:
-                valores.append(valor)
-                labels.append(tipo.capitalize())
-                cores.append(self.colors[tipo])
-        
-        if sum(valores) == 0:
+        return self.create_pie_chart(self.monthly_type_totals(year, month), master_frame)
+    
+    def create_pie_chart(self, totals, master_frame):
+        """Cria gráfico de pizza a partir de {tipo: total}"""
+        if sum(v for v in totals.values() if v > 0) == 0:
             return None
-            
-        # Cria o gráfico
-        fig, ax = plt.subplots(figsize=(4, 4), dpi=100)
-        ax.pie(valores, labels=labels, autopct='%1.1f%%', colors=cores, textprops={'color':"w"})
-        ax.set_title('Distribuição Financeira do Mês', color='#fff')
-        fig.patch.set_facecolor('#232323')
-        
-        # Cria canvas
-        canvas = FigureCanvasTkAgg(fig, master=master_frame)
-        canvas.draw()
-        
-        return canvas
+        pie = PieChart(master_frame, self.colors)
+        pie.set_data(totals)
+        return pie
     
-    def create_expense_ranking(self, transactions, master_frame):
+    def create_expense_ranking(self, master_frame, year=None, month=None):
         """Cria ranking de gastos por categoria/subcategoria"""
-        # Filtra transações do mês atual
-        now = datetime.datetime.now()
-        transacoes_mes = []
+        return self.create_ranking_frame(self.expense_ranking(year, month), master_frame)
+    
+    def create_ranking_frame(self, ranking, master_frame):
+        """Cria o quadro de ranking a partir de [(rótulo, total)] ordenado"""
+        ranking_frame = RankingFrame(master_frame)
+        ranking_frame.set_data(ranking)
+        return ranking_frame
+    
+    def create_monthly_charts(self, master_frame, year=None, month=None):
+        """Cria layout completo com gráfico de pizza e ranking de gastos"""
+        return self.create_summary_charts(
+            self.monthly_type_totals(year, month),
+            self.expense_ranking(year, month),
+            master_frame
+        )
+    
+    def create_summary_charts(self, month_totals, ranking, master_frame):
+        """Cria o layout do dashboard a partir de dados já agregados.
+
+        Retorna o SummaryCharts; nos refreshes use `set_data` em vez de criar
+        outro.
+        """
+        charts = SummaryCharts(master_frame, self.colors)
+        charts.pack(fill="both", expand=True)
+        charts.set_data(month_totals, ranking)
+        return charts
+
+class PieChart:
+    """Gráfico de pizza criado uma vez e atualizado no lugar.
+
+    Usa a API orientada a objetos do matplotlib (Figure + FigureCanvasTkAgg,
+    sem o registro global do pyplot). Cada tipo tem uma fatia fixa: em
+    `set_data` só os ângulos e textos mudam. Chame `close` (ou destrua o
+    widget pai, via SummaryCharts) para liberar a figura.
+    """
+    TYPES = ('income', 'expense', 'investment')
+    
+    def __init__(self, master_frame=None, colors=None, title='Distribuição Financeira do Mês'):
+        from matplotlib.figure import Figure
+        from matplotlib.patches import Wedge
         
-        for t in transactions:
-            data_str = t[7]
-            try:
-                data_dt = datetime.datetime.strptime(data_str, '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                try:
-                    data_dt = datetime.datetime.strptime(data_str, '%Y-%m-%d')
-                except Exception:
-                    continue
-            if data_dt.month == now.month and data_dt.year == now.year:
-                transacoes_mes.append(t)
+        colors = colors or ChartGenerator().colors
+        self.figure = Figure(figsize=(4, 4), dpi=100, facecolor='#232323')
+        self.ax = self.figure.add_subplot()
+        self.ax.set_xlim(-1.25, 1.25)
+        self.ax.set_ylim(-1.25, 1.25)
+        self.ax.set_aspect('equal')
+        self.ax.axis('off')
+        self.ax.set_title(title, color='#fff')
         
-        # Agrupa despesas por categoria/subcategoria
-        gastos = defaultdict(float)
-        for t in transacoes_mes:
-            if t[2] == 'expense':
-                chave = t[3]  # Categoria
-                if t[4]:  # Subcategoria
-                    chave += f" / {t[4]}"
-                gastos[chave] += float(t[5])
+        self.wedges = {}
+        self.labels = {}
+        self.percents = {}
+        for tipo in self.TYPES:
+            wedge = Wedge((0, 0), 1, 0, 0, facecolor=colors[tipo], visible=False)
+            self.ax.add_patch(wedge)
+            self.wedges[tipo] = wedge
+            self.labels[tipo] = self.ax.text(0, 0, tipo.capitalize(), color='w', ha='center', va='center', visible=False)
+            self.percents[tipo] = self.ax.text(0, 0, '', color='w', ha='center', va='center', visible=False)
         
-        # Ordena do maior para o menor
-        ranking = sorted(gastos.items(), key=lambda x: x[1], reverse=True)
+        self.canvas = None
+        if master_frame is not None:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master_frame)
+    
+    def set_data(self, totals):
+        """Atualiza as fatias a partir de {tipo: total}; retorna False se não há dados"""
+        valores = {tipo: max(totals.get(tipo, 0) or 0, 0) for tipo in self.TYPES}
+        total = sum(valores.values())
+        inicio = 0.0
+        for tipo in self.TYPES:
+            visivel = total > 0 and valores[tipo] > 0
+            self.wedges[tipo].set_visible(visivel)
+            self.labels[tipo].set_visible(visivel)
+            self.percents[tipo].set_visible(visivel)
+            if not visivel:
+                continue
+            
+            # Mesma disposição do ax.pie: sentido anti-horário a partir de 0°
+            fim = inicio + 360.0 * valores[tipo] / total
+            self.wedges[tipo].set_theta1(inicio)
+            self.wedges[tipo].set_theta2(fim)
+            meio = math.radians((inicio + fim) / 2)
+            self.labels[tipo].set_position((1.1 * math.cos(meio), 1.1 * math.sin(meio)))
+            self.percents[tipo].set_position((0.6 * math.cos(meio), 0.6 * math.sin(meio)))
+            self.percents[tipo].set_text(f'{100.0 * valores[tipo] / total:.1f}%')
+            inicio = fim
         
-        # Cria frame para o ranking
-        ranking_frame = ctk.CTkFrame(master_frame, fg_color="#232323")
-        ctk.CTkLabel(ranking_frame, text="Principais Gastos do Mês", 
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+        return total > 0
+    
+    def get_tk_widget(self):
+        return self.canvas.get_tk_widget()
+    
+    def draw(self):
+        if self.canvas is not None:
+            self.canvas.draw()
+    
+    def close(self):
+        """Libera a figura e o canvas"""
+        if self.canvas is not None:
+            self.canvas.get_tk_widget().destroy()
+            self.canvas = None
+        self.figure.clear()
+
+class RankingFrame(ctk.CTkFrame):
+    """Ranking de gastos com um número fixo de linhas reaproveitadas"""
+    
+    def __init__(self, master_frame, limit=RANKING_LIMIT):
+        super().__init__(master_frame, fg_color="#232323")
+        ctk.CTkLabel(self, text="Principais Gastos do Mês", 
                     font=("Roboto", 14, "bold"), text_color="#fff").pack(anchor="w", pady=(0,8))
-        
+        self.rows = [ctk.CTkLabel(self, text="", font=("Roboto", 12), text_color="#fff") for _ in range(limit)]
+        self.empty_label = ctk.CTkLabel(self, text="Nenhuma despesa registrada.", 
+                                        font=("Roboto", 12), text_color="#bbb")
+    
+    def set_data(self, ranking):
+        """Mostra [(rótulo, total)] ordenado, sem recriar os labels"""
+        ranking = list(ranking)[:len(self.rows)]
+        for row in self.rows:
+            row.pack_forget()
+        self.empty_label.pack_forget()
         if ranking:
-            for i, (cat, val) in enumerate(ranking[:8]):
-                ctk.CTkLabel(ranking_frame, text=f"{i+1}. {cat}: R$ {val:.2f}", 
-                           font=("Roboto", 12), text_color="#fff").pack(anchor="w")
+            for i, (cat, val) in enumerate(ranking):
+                self.rows[i].configure(text=f"{i+1}. {cat}: R$ {val:.2f}")
+                self.rows[i].pack(anchor="w")
         else:
-            ctk.CTkLabel(ranking_frame, text="Nenhuma despesa registrada.", 
-                         font=("Roboto", 12), text_color="#bbb").pack(anchor="w")
-        
-        return ranking_frame
+            self.empty_label.pack(anchor="w")
+
+class SummaryCharts(ctk.CTkFrame):
+    """Gráfico de pizza à esquerda e ranking de gastos à direita.
+
+    Os widgets e a figura são criados uma vez; `set_data` troca os dados no
+    lugar. A figura é liberada quando o frame é destruído.
+    """
     
-    def create_monthly_charts(self, transactions, master_frame):
-        """Cria layout completo com gráfico de pizza e ranking de gastos"""
-        # Layout: gráfico à esquerda, ranking à direita
-        chart_content = ctk.CTkFrame(master_frame, fg_color="transparent")
-        chart_content.pack(fill="both", expand=True)
-        chart_content.grid_columnconfigure(0, weight=1)
-        chart_content.grid_columnconfigure(1, weight=1)
+    def __init__(self, master_frame, colors=None):
+        super().__init__(master_frame, fg_color="transparent")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_columnconfigure(1, weight=1)
         
-        # Gráfico de pizza
-        pie_canvas = self.create_monthly_pie_chart(transactions, chart_content)
-        if pie_canvas:
-            pie_canvas.get_tk_widget().grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
-        else:
-            ctk.CTkLabel(chart_content, text="Sem dados para exibir o gráfico do mês.", 
-                        font=("Roboto", 14), text_color="#fff").grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        # Gráfico de pizza (ou aviso, quando o mês não tem dados)
+        self.pie = PieChart(self, colors)
+        self.empty_label = ctk.CTkLabel(self, text="Sem dados para exibir o gráfico do mês.", 
+                                        font=("Roboto", 14), text_color="#fff")
         
         # Ranking de gastos
-        ranking_frame = self.create_expense_ranking(transactions, chart_content)
-        ranking_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
-        
-        return chart_content
\ No newline at end of file
+        self.ranking = RankingFrame(self)
+        self.ranking.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
+    
+    def set_data(self, month_totals, ranking):
+        if self.pie.set_data(month_totals):
+            self.empty_label.grid_forget()
+            self.pie.get_tk_widget().grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        else:
+            self.pie.get_tk_widget().grid_forget()
+            self.empty_label.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+        self.ranking.set_data(ranking)
+    
+    def destroy(self):
+        self.pie.close()
+        super().destroy()
@@ -1,16 +1,46 @@
-import csv
-import json
-from datetime import datetime
 from tkinter import filedialog, messagebox
-import customtkinter as ctk
+
+from src.utils.loading_utils import LoadingManager
+from src.services.import_export import ImportExportService
+from src.services.transaction_import import format_report
 
 class DataImportExport:
-    def __init__(self, transaction_controller, goal_controller, user):
+    """Diálogos Tk sobre o ImportExportService.
+
+    Aqui só se escolhe o arquivo e se mostra o resultado; o trabalho roda
+    no serviço, em segundo plano.
+    """
+    
+    def __init__(self, transaction_controller, goal_controller, user, runner=None):
         self.transaction_controller = transaction_controller
         self.goal_controller = goal_controller
         self.user = user
+        self.runner = runner
+        self.service = ImportExportService(transaction_controller, goal_controller)
+    
+    def _run_in_background(self, parent, work, message, on_success, error_message, on_done=None,
+                           with_task=False):
+        """Roda `work` fora da thread do Tk com loading e trata o resultado.
+
+        `on_success(resultado)` mostra o resultado e retorna se a operação teve
+        efeito; `on_done(ok)` é chamado ao final em qualquer caso. Com
+        with_task=True `work` recebe a Task (progresso e cancelamento).
+        """
+        def success(result):
+            ok = on_success(result)
+            if on_done:
+                on_done(ok)
+        
+        def error(e):
+            messagebox.showerror("Erro", f"{error_message}:\n{str(e)}")
+            if on_done:
+                on_done(False)
+        
+        loading = LoadingManager(parent, self.runner)
+        return loading.execute_with_loading(work, message=message, on_success=success, on_error=error,
+                                            with_task=with_task)
     
-    def export_transactions_csv(self, parent):
+    def export_transactions_csv(self, parent, on_done=None):
         """Exporta transações para CSV"""
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
@@ -20,39 +50,18 @@ class DataImportExport:
         
         if not filename:
             return False
-            
-        try:
-            transactions = self.transaction_controller.get_transactions()
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['ID', 'Tipo', 'Categoria', 'Subcategoria', 'Valor', 'Descrição', 'Data'])
-                
-                for t in transactions:
-                    # Converte data para DD-MM-YYYY para exportação
-                    try:
-                        data_display = datetime.strptime(t[7][:10], '%Y-%m-%d').strftime('%d-%m-%Y')
-                    except:
-                        data_display = t[7][:10]
-                    
-                    writer.writerow([
-                        t[0],  # ID
-                        t[2],  # Tipo
-                        t[3],  # Categoria
-                        t[4],  # Subcategoria
-                        t[5],  # Valor
-                        t[6],  # Descrição
-                        data_display  # Data
-                    ])
-            
-            messagebox.showinfo("Sucesso", f"Transações exportadas para:\n{filename}")
+        
+        def work():
+            return self.service.export_transactions_csv(filename)
+        
+        def success(result):
+            messagebox.showinfo("Sucesso", f"{result.records} transações exportadas para:\n{filename}")
             return True
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar transações:\n{str(e)}")
-            return False
+        
+        return self._run_in_background(parent, work, "Exportando transações...", success,
+                                       "Erro ao exportar transações", on_done)
     
-    def export_goals_csv(self, parent):
+    def export_goals_csv(self, parent, on_done=None):
         """Exporta metas para CSV"""
         filename = filedialog.asksaveasfilename(
             defaultextension=".csv",
@@ -62,38 +71,18 @@ class DataImportExport:
         
         if not filename:
             return False
-            
-        try:
-            goals = self.goal_controller.get_goals()
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(['ID', 'Título', 'Valor Alvo', 'Valor Atual', 'Prazo', 'Status'])
-                
-                for g in goals:
-                    # Converte data para DD-MM-YYYY para exportação
-                    try:
-                        data_display = datetime.strptime(g[5], '%Y-%m-%d').strftime('%d-%m-%Y')
-                    except:
-                        data_display = g[5]
-                    
-                    writer.writerow([
-                        g[0],  # ID
-                        g[2],  # Título
-                        g[3],  # Valor Alvo
-                        g[4],  # Valor Atual
-                        data_display,  # Prazo
-                        g[6]   # Status
-                    ])
-            
-            messagebox.showinfo("Sucesso", f"Metas exportadas para:\n{filename}")
+        
+        def work():
+            return self.service.export_goals_csv(filename)
+        
+        def success(result):
+            messagebox.showinfo("Sucesso", f"{result.records} metas exportadas para:\n{filename}")
             return True
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar metas:\n{str(e)}")
-            return False
+        
+        return self._run_in_background(parent, work, "Exportando metas...", success,
+                                       "Erro ao exportar metas", on_done)
     
-    def import_transactions_csv(self, parent):
+    def import_transactions_csv(self, parent, on_done=None):
         """Importa transações de CSV"""
         filename = filedialog.askopenfilename(
             filetypes=[("CSV files", "*.csv")],
@@ -102,104 +91,80 @@ class DataImportExport:
         
         if not filename:
             return False
+        
+        def work(task):
+            def progress(fraction, imported):
+                task.check_cancelled()  # Cancelar desfaz a importação inteira
+                task.report_progress(fraction)
             
-        try:
-            with open(filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                imported_count = 0
-                errors = []
-                
-                for row_num, row in enumerate(reader, start=2):  # Começa em 2 (linha 1 é cabeçalho)
-                    try:
-                        # Converte data DD-MM-YYYY para YYYY-MM-DD
-                        data_iso = datetime.strptime(row['Data'], '%d-%m-%Y').strftime('%Y-%m-%d')
-                        
-                        # Adiciona transação
-                        success = self.transaction_controller.add_transaction(
-                            tipo=row['Tipo'],
-                            categoria=row['Categoria'],
-                            valor=float(row['Valor']),
-                            descricao=row['Descrição'],
-                            data=data_iso,
-                            subcategoria=row['Subcategoria']
-                        )
-                        
-                        if success:
-                            imported_count += 1
-                        else:
-                            errors.append(f"Linha {row_num}: Erro ao adicionar transação")
-                            
-                    except Exception as e:
-                        errors.append(f"Linha {row_num}: {str(e)}")
-                
-                # Mostra resultado
-                if imported_count > 0:
-                    message = f"Importadas {imported_count} transações com sucesso!"
-                    if errors:
-                        message += f"\n\nErros encontrados:\n" + "\n".join(errors[:5])
-                        if len(errors) > 5:
-                            message += f"\n... e mais {len(errors) - 5} erros"
-                    messagebox.showinfo("Importação Concluída", message)
-                else:
-                    messagebox.showerror("Erro", "Nenhuma transação foi importada.\n" + "\n".join(errors[:5]))
-                
-                return imported_count > 0
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao importar transações:\n{str(e)}")
-            return False
+            return self.service.import_transactions_csv(filename, progress_callback=progress)
+        
+        def success(result):
+            # Mostra resultado
+            if result.imported > 0:
+                messagebox.showinfo("Importação Concluída", format_report(result))
+            elif result.duplicates and not result.errors:
+                messagebox.showinfo("Importação Concluída", "Todas as transações do arquivo já estavam cadastradas.")
+            else:
+                messagebox.showerror("Erro", "Nenhuma transação foi importada.\n" + format_report(result))
+            
+            return result.imported > 0
+        
+        return self._run_in_background(parent, work, "Importando transações...", success,
+                                       "Erro ao importar transações", on_done, with_task=True)
     
-    def export_all_data_json(self, parent):
-        """Exporta todos os dados para JSON"""
+    def export_all_data_json(self, parent, on_done=None):
+        """Exporta todos os dados para o backup NDJSON (compactado com gzip por padrão)"""
         filename = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON files", "*.json")],
-            title="Salvar backup completo como JSON..."
+            defaultextension=".ndjson.gz",
+            filetypes=[("Backup compactado", "*.ndjson.gz"), ("Backup compactado (xz)", "*.ndjson.xz"),
+                       ("Backup sem compactação", "*.ndjson")],
+            title="Salvar backup completo..."
         )
         
         if not filename:
             return False
-            
-        try:
-            transactions = self.transaction_controller.get_transactions()
-            goals = self.goal_controller.get_goals()
-            
-            data = {
-                'user_id': self.user.id,
-                'export_date': datetime.now().isoformat(),
-                'transactions': [],
-                'goals': []
-            }
-            
-            # Adiciona transações
-            for t in transactions:
-                data['transactions'].append({
-                    'id': t[0],
-                    'type': t[2],
-                    'category': t[3],
-                    'subcategory': t[4],
-                    'amount': t[5],
-                    'description': t[6],
-                    'date': t[7]
-                })
-            
-            # Adiciona metas
-            for g in goals:
-                data['goals'].append({
-                    'id': g[0],
-                    'title': g[2],
-                    'target_amount': g[3],
-                    'current_amount': g[4],
-                    'deadline': g[5],
-                    'status': g[6]
-                })
-            
-            with open(filename, 'w', encoding='utf-8') as jsonfile:
-                json.dump(data, jsonfile, indent=2, ensure_ascii=False)
-            
-            messagebox.showinfo("Sucesso", f"Backup completo salvo em:\n{filename}")
+        
+        def work():
+            return self.service.backup(filename)
+        
+        def success(result):
+            messagebox.showinfo("Sucesso", f"Backup completo salvo em:\n{filename}\n\n"
+                                           f"{result.transactions} transações e {result.goals} metas.")
             return True
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao exportar backup:\n{str(e)}")
+        
+        return self._run_in_background(parent, work, "Salvando backup...", success,
+                                       "Erro ao exportar backup", on_done)
+    
+    def restore_backup(self, parent, on_done=None):
+        """Restaura um backup (NDJSON ou o JSON antigo)"""
+        filename = filedialog.askopenfilename(
+            filetypes=[("Backup do Fin-Assist", "*.ndjson.gz *.ndjson.xz *.ndjson *.json")],
+            title="Selecionar backup para restaurar..."
+        )
+        
+        if not filename:
+            return False
+        
+        replace = messagebox.askyesnocancel(
+            "Restaurar Backup",
+            "Substituir os dados atuais pelos do backup?\n\n"
+            "Sim: apaga suas transações e metas antes de restaurar.\n"
+            "Não: adiciona os dados do backup aos atuais."
+        )
+        if replace is None:
             return False
+        
+        def work(task):
+            def progress(restored):
+                task.check_cancelled()  # Cancelar desfaz a restauração inteira
+            
+            return self.service.restore(filename, replace=replace, progress_callback=progress)
+        
+        def success(result):
+            messagebox.showinfo("Sucesso", f"Backup restaurado: {result.transactions} transações "
+                                           f"e {result.goals} metas em {result.elapsed:.1f}s.")
+            return True
+        
+        return self._run_in_background(parent, work, "Restaurando backup...", success,
+                                       "Erro ao restaurar backup", on_done, with_task=True)
@@ -0,0 +1,109 @@
+import json
+import unicodedata
+from collections import deque, namedtuple
+
+# Intenção reconhecida e as frases da mensagem que a justificam
+IntentMatch = namedtuple('IntentMatch', ['intent', 'evidence'])
+
+def fold_text(text):
+    """Minúsculas e sem acentos: 'Orçamento' e 'orcamento' ficam iguais"""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+class IntentMatcher:
+    """Classifica mensagens por intenção em uma única passada.
+
+    Todas as frases são compiladas uma vez em um autômato de Aho-Corasick
+    sobre o texto sem acentos, então o custo de `match` depende só do
+    tamanho da mensagem, não da quantidade de frases. Uma frase precisa
+    começar no início de uma palavra, mas pode terminar no meio de outra:
+    'gasto' casa com 'gastos', 'acao' não casa com 'renegociação'.
+
+    `intents` é uma sequência de (nome, frases) em ordem de prioridade:
+    quando frases de várias intenções aparecem, vence a primeira da lista.
+    """
+
+    def __init__(self, intents):
+        self.intents = []
+        self._phrases = []  # (índice da intenção, frase original, tamanho sem acentos)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for intent_index, (name, phrases) in enumerate(intents):
+            self.intents.append(name)
+            for phrase in phrases:
+                folded = fold_text(phrase)
+                if folded:
+                    self._add(folded, len(self._phrases))
+                    self._phrases.append((intent_index, phrase, len(folded)))
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path):
+        """Carrega o matcher e as respostas de um JSON de intenções.
+
+        Retorna (matcher, respostas por intenção, resposta padrão).
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        intents = data['intents']
+        matcher = cls((intent['name'], intent['phrases']) for intent in intents)
+        responses = {intent['name']: intent['response'] for intent in intents}
+        return matcher, responses, data.get('default_response')
+
+    def _add(self, folded, phrase_id):
+        state = 0
+        for char in folded:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(phrase_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Frases que terminam no sufixo também terminam aqui
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, message):
+        """Retorna os índices das frases encontradas, na ordem em que aparecem"""
+        found = []
+        state = 0
+        goto, fail, output, phrases = self._goto, self._fail, self._output, self._phrases
+        text = fold_text(message)
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for phrase_id in output[state]:
+                start = end - phrases[phrase_id][2] + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    found.append(phrase_id)
+        return found
+
+    def match(self, message):
+        """Retorna IntentMatch da intenção de maior prioridade, ou None"""
+        found = self.find_all(message)
+        if not found:
+            return None
+
+        best = min(self._phrases[phrase_id][0] for phrase_id in found)
+        evidence = []
+        for phrase_id in found:
+            intent_index, phrase, _ = self._phrases[phrase_id]
+            if intent_index == best and phrase not in evidence:
+                evidence.append(phrase)
+        return IntentMatch(self.intents[best], evidence)
@@ -1,6 +1,6 @@
 import customtkinter as ctk
-import threading
-import time
+
+from src.utils.task_runner import TaskRunner
 
 class LoadingDialog:
     def __init__(self, parent, message="Carregando..."):
@@ -8,6 +8,7 @@ class LoadingDialog:
         self.message = message
         self.dialog = None
         self.is_running = False
+        self.determinate = False
         
     def show(self):
         """Mostra o diálogo de loading"""
@@ -58,7 +59,9 @@ class LoadingDialog:
         if not self.is_running:
             return
             
-        # Simula progresso indeterminado
+        # Simula progresso indeterminado (até receber um progresso real)
+        if self.determinate:
+            return
         current = self.progress_bar.get()
         if current >= 1.0:
             self.progress_bar.set(0)
@@ -67,6 +70,15 @@ class LoadingDialog:
             
         self.dialog.after(100, self._animate_progress)
     
+    def set_progress(self, value, message=None):
+        """Mostra o progresso real (0.0 a 1.0) no lugar da animação"""
+        if not self.dialog:
+            return
+        self.determinate = True
+        self.progress_bar.set(max(0.0, min(1.0, value)))
+        if message:
+            self.message_label.configure(text=message)
+    
     def hide(self):
         """Esconde o diálogo de loading"""
         self.is_running = False
@@ -84,8 +96,9 @@ class ConfirmationDialog:
 class LoadingManager:
     """Gerencia estados de loading para operações longas"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, runner=None):
         self.parent = parent
+        self.runner = runner
         self.loading_dialog = None
         
     def show_loading(self, message="Carregando..."):
@@ -99,19 +112,30 @@ class LoadingManager:
             self.loading_dialog.hide()
             self.loading_dialog = None
     
-    def execute_with_loading(self, func, *args, **kwargs):
-        """Executa função com loading"""
-        def run():
-            try:
-                result = func(*args, **kwargs)
-                self.parent.after(0, self.hide_loading)
-                return result
-            except Exception as e:
-                self.parent.after(0, self.hide_loading)
-                raise e
+    def update_progress(self, value, message=None):
+        """Atualiza a barra com o progresso real (0.0 a 1.0)"""
+        if self.loading_dialog:
+            self.loading_dialog.set_progress(value, message)
+    
+    def execute_with_loading(self, func, *args, message="Carregando...", on_success=None,
+                             on_error=None, with_task=False, **kwargs):
+        """Executa `func` em segundo plano com o diálogo de loading.
+
+        O loading é fechado quando a tarefa termina (com sucesso, erro ou
+        cancelamento) e o resultado/exceção chega a on_success/on_error na
+        thread do Tk. Valores passados a task.report_progress (0.0 a 1.0)
+        atualizam a barra. Retorna a Task.
+        """
+        if self.runner is None:
+            self.runner = TaskRunner(self.parent)
         
-        self.show_loading()
-        thread = threading.Thread(target=run)
-        thread.daemon = True
-        thread.start()
-        return thread
+        self.show_loading(message)
+        return self.runner.submit(
+            func, *args,
+            on_success=on_success,
+            on_error=on_error,
+            on_progress=self.update_progress,
+            on_finally=self.hide_loading,
+            with_task=with_task,
+            **kwargs
+        )
@@ -1,9 +1,40 @@
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from datetime import datetime
+from itertools import islice
+
+from src.config.settings import REPORT_SETTINGS
+
+# Tabela de transações: altura fixa das linhas, para saber quantas cabem na página
+TRANSACTION_HEADER_HEIGHT = 20
+TRANSACTION_ROW_HEIGHT = 15
+TRANSACTION_COL_WIDTHS = [1*inch, 1*inch, 1.5*inch, 1*inch, 2*inch]
+
+class _FlowableStream(list):
+    """Lista de flowables preenchida sob demanda a partir de um iterável.
+
+    O doc.build consome a lista pela frente e testa len() a cada passo;
+    aqui len() repõe até `lookahead` itens, então só algumas tabelas (uma
+    página de transações cada) existem em memória ao mesmo tempo.
+    """
+
+    _END = object()
+
+    def __init__(self, flowables, lookahead=4):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        while list.__len__(self) < self._lookahead:
+            flowable = next(self._source, self._END)
+            if flowable is self._END:
+                break
+            self.append(flowable)
+        return list.__len__(self)
 
 class PDFGenerator:
     def __init__(self, user):
@@ -15,9 +46,38 @@ class PDFGenerator:
             fontSize=12,
             spaceAfter=20
         )
+        self.transaction_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('TOPPADDING', (0, 0), (-1, -1), 2),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black)
+        ])
     
-    def generate_financial_report(self, transactions, goals, output_path):
-        """Gera um relatório financeiro completo em PDF"""
+    def generate_financial_report(self, transactions, goals, output_path, totals=None, max_transactions=None):
+        """Gera um relatório financeiro completo em PDF.
+
+        `transactions` pode ser uma lista ou um iterador (ex.: iter_transactions)
+        e é listado inteiro (até `max_transactions`, padrão
+        REPORT_SETTINGS['max_transactions_per_report']) em tabelas do tamanho
+        de uma página, montadas à medida que o PDF é escrito. `totals`
+        ({'income', 'expense', ...}, ex.: get_period_totals) alimenta o
+        resumo; sem ele as transações são carregadas para somar.
+        """
+        if max_transactions is None:
+            max_transactions = REPORT_SETTINGS['max_transactions_per_report']
+        if totals is None:
+            transactions = list(transactions)
+            totals = self._sum_totals(transactions)
+        
         doc = SimpleDocTemplate(
             output_path,
             pagesize=letter,
@@ -41,7 +101,7 @@ class PDFGenerator:
         
         # Resumo financeiro
         elements.append(Paragraph("Resumo Financeiro", self.styles['Heading2']))
-        elements.append(self._create_summary_table(transactions))
+        elements.append(self._create_summary_table(totals))
         elements.append(Spacer(1, 20))
         
         # Metas financeiras
@@ -49,17 +109,26 @@ class PDFGenerator:
         elements.append(self._create_goals_table(goals))
         elements.append(Spacer(1, 20))
         
-        # Transações recentes
-        elements.append(Paragraph("Transações Recentes", self.styles['Heading2']))
-        elements.append(self._create_transactions_table(transactions))
+        # Transações: geradas sob demanda durante o build
+        def flowables():
+            yield from elements
+            yield from self._transaction_section(doc, transactions, max_transactions)
         
-        doc.build(elements)
+        doc.build(_FlowableStream(flowables()))
+    
+    @staticmethod
+    def _sum_totals(transactions):
+        """Soma as transações por tipo"""
+        totals = {'income': 0.0, 'expense': 0.0, 'investment': 0.0}
+        for t in transactions:
+            if t.type in totals:
+                totals[t.type] += t.value
+        return totals
     
-    def _create_summary_table(self, transactions):
+    def _create_summary_table(self, totals):
         """Cria a tabela de resumo financeiro"""
-        # transactions: (id, user_id, type, category, subcategory, amount, description, date)
-        income = sum(float(t[5]) for t in transactions if t[2] == 'income')
-        expenses = sum(float(t[5]) for t in transactions if t[2] == 'expense')
+        income = totals['income']
+        expenses = totals['expense']
         balance = income - expenses
         
         data = [
@@ -91,13 +160,12 @@ class PDFGenerator:
         data = [['Meta', 'Valor Alvo', 'Valor Atual', 'Progresso', 'Status']]
         
         for goal in goals:
-            progress = (goal[4] / goal[3]) * 100 if goal[3] > 0 else 0
             data.append([
-                goal[2],
-                f'R$ {goal[3]:.2f}',
-                f'R$ {goal[4]:.2f}',
-                f'{progress:.1f}%',
-                goal[6]
+                goal.title,
+                f'R$ {goal.target:.2f}',
+                f'R$ {goal.current:.2f}',
+                f'{goal.progress:.1f}%',
+                goal.status
             ])
         
         table = Table(data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1*inch, 1*inch])
@@ -117,40 +185,65 @@ class PDFGenerator:
         
         return table
     
-    def _create_transactions_table(self, transactions):
-        """Cria a tabela de transações recentes"""
-        data = [['Data', 'Tipo', 'Categoria', 'Valor', 'Descrição']]
-        
-        for transaction in transactions[:10]:  # Mostra apenas as 10 transações mais recentes
-            # Data pode estar em 'YYYY-MM-DD HH:MM:SS' ou 'YYYY-MM-DD'
-            try:
-                dt = datetime.strptime(transaction[7], '%Y-%m-%d %H:%M:%S')
-            except ValueError:
-                try:
-                    dt = datetime.strptime(transaction[7], '%Y-%m-%d')
-                except Exception:
-                    dt = None
-            data.append([
-                dt.strftime('%d/%m/%Y') if dt else (transaction[7] or ''),
-                transaction[2].capitalize(),
-                transaction[3],
-                f'R$ {float(transaction[5]):.2f}',
-                transaction[6] or ''
-            ])
-        
-        table = Table(data, colWidths=[1*inch, 1*inch, 1.5*inch, 1*inch, 2*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        return table 
\ No newline at end of file
+    def _transaction_section(self, doc, transactions, limit):
+        """Gera o título e as tabelas de transações, uma por página.
+
+        A listagem começa em uma página nova; com altura de linha fixa cada
+        tabela ocupa exatamente uma página e repete o cabeçalho. Se algo
+        sair da conta, a tabela é quebrada pelo reportlab e o cabeçalho é
+        repetido na continuação (repeatRows).
+        """
+        iterator = iter(transactions)
+        rows = (self._transaction_row(t) for t in islice(iterator, limit))
+        first = next(rows, None)
+        
+        heading = Paragraph("Transações", self.styles['Heading2'])
+        if first is None:
+            yield heading
+            yield Paragraph("Nenhuma transação no período.", self.styles['Normal'])
+            return
+        
+        yield PageBreak()
+        yield heading
+        
+        # Altura útil do quadro (menos o padding de 6pt em cima e embaixo)
+        frame_height = doc.height - 12
+        per_page = int((frame_height - TRANSACTION_HEADER_HEIGHT) // TRANSACTION_ROW_HEIGHT)
+        heading_height = heading.wrap(doc.width, doc.height)[1] + heading.getSpaceAfter()
+        first_page = int((frame_height - heading_height - TRANSACTION_HEADER_HEIGHT) // TRANSACTION_ROW_HEIGHT)
+        
+        chunk = [first] + list(islice(rows, first_page - 1))
+        while chunk:
+            yield self._create_transactions_table(chunk)
+            chunk = list(islice(rows, per_page))
+        
+        # Limite atingido: avisa se ainda havia transações
+        if next(iterator, None) is not None:
+            yield Spacer(1, 10)
+            yield Paragraph(f"Relatório limitado às primeiras {limit} transações.", self.styles['Italic'])
+        close = getattr(iterator, 'close', None)
+        if close:
+            close()  # Devolve a conexão de um gerador interrompido
+    
+    @staticmethod
+    def _transaction_row(transaction):
+        dt = transaction.parsed_date
+        return [
+            dt.strftime('%d/%m/%Y') if dt else (transaction.date or ''),
+            transaction.type.capitalize(),
+            transaction.category,
+            f'R$ {transaction.value:.2f}',
+            transaction.description or ''
+        ]
+    
+    def _create_transactions_table(self, rows):
+        """Cria uma tabela de transações (uma página) com cabeçalho"""
+        data = [['Data', 'Tipo', 'Categoria', 'Valor', 'Descrição']] + rows
+        table = Table(
+            data,
+            colWidths=TRANSACTION_COL_WIDTHS,
+            rowHeights=[TRANSACTION_HEADER_HEIGHT] + [TRANSACTION_ROW_HEIGHT] * len(rows),
+            repeatRows=1
+        )
+        table.setStyle(self.transaction_style)
+        return table
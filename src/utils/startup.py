@@ -0,0 +1,100 @@
+"""Tempo de inicialização: pré-carga de dependências pesadas e relatório de imports.
+
+Gemini, matplotlib e reportlab só são importados quando a funcionalidade é
+usada pela primeira vez. `prewarm` adianta esses imports em uma thread de
+fundo enquanto a tela está ociosa, e o relatório (`python -m
+src.utils.startup`) mostra quanto cada módulo custa na partida, acusando
+se algum módulo pesado voltou a ser importado antes da primeira tela.
+"""
+import importlib
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+from src.config.settings import STARTUP_SETTINGS
+from src.utils.logger import Logger
+
+# Módulos que não podem ser importados na partida (carregados sob demanda)
+HEAVY_MODULES = (
+    'google.generativeai',
+    'matplotlib',
+    'matplotlib.backends.backend_tkagg',
+    'reportlab',
+)
+
+def prewarm(modules=None):
+    """Importa os módulos em uma thread de fundo; retorna a thread.
+
+    Imports concorrentes do mesmo módulo na thread do Tk apenas esperam
+    este terminar, então pré-carregar nunca atrasa mais do que o import
+    sob demanda atrasaria.
+    """
+    modules = list(modules if modules is not None else STARTUP_SETTINGS['prewarm_modules'])
+    logger = Logger.get_logger(__name__)
+
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                # Sem a dependência, o import sob demanda mostrará o erro ao usuário
+                logger.warning(f"Pré-carga de {name} falhou: {e}")
+
+    thread = threading.Thread(target=run, name='fin-assist-prewarm', daemon=True)
+    thread.start()
+    return thread
+
+def measure_imports(target='main', cwd=None):
+    """Importa `target` em um novo interpretador com -X importtime.
+
+    Retorna [(módulo, próprio_us, acumulado_us, profundidade)] na ordem do
+    relatório do Python.
+    """
+    cwd = cwd or Path(__file__).resolve().parent.parent.parent
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {target}: {result.stderr.strip().splitlines()[-1:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+def startup_report(target='main', top=15):
+    """Monta o relatório de tempo de import; retorna (texto, módulos pesados carregados)"""
+    entries = measure_imports(target)
+    total = next((cumulative for name, _, cumulative, _ in entries if name == target), 0)
+    loaded = {name for name, _, _, _ in entries}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+
+    lines = [f"Import de '{target}': {total / 1000:.1f} ms ({len(entries)} módulos)", "",
+             f"{'próprio (ms)':>12}  {'acumulado (ms)':>14}  módulo"]
+    # Só módulos de primeiro nível: o acumulado deles já inclui os dependentes
+    roots = sorted((e for e in entries if e[3] <= 1), key=lambda e: e[2], reverse=True)
+    for name, self_us, cumulative_us, _ in roots[:top]:
+        lines.append(f"{self_us / 1000:>12.1f}  {cumulative_us / 1000:>14.1f}  {name}")
+
+    lines.append("")
+    if heavy:
+        lines.append("ATENÇÃO: módulos pesados importados na partida: " + ", ".join(heavy))
+    else:
+        lines.append("Nenhum módulo pesado importado na partida.")
+    return "\n".join(lines), heavy
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    target = argv[0] if argv else 'main'
+    report, heavy = startup_report(target)
+    print(report)
+    return 1 if heavy else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import TASK_SETTINGS
+from src.utils.logger import Logger
+
+class TaskCancelled(Exception):
+    """Levantada dentro de uma tarefa que foi cancelada"""
+
+class Task:
+    """Tarefa submetida ao TaskRunner.
+
+    Dentro da função (quando submetida com with_task=True) use
+    `report_progress` para informar o andamento e `check_cancelled` para
+    interromper o trabalho assim que a tarefa for cancelada.
+    """
+
+    def __init__(self, runner, name, callbacks):
+        self.name = name
+        self.future = None
+        self._runner = runner
+        self._callbacks = callbacks
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Cancela a tarefa; nenhum callback de resultado será chamado"""
+        self._cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check_cancelled(self):
+        """Levanta TaskCancelled se a tarefa foi cancelada"""
+        if self.cancelled:
+            raise TaskCancelled(self.name)
+
+    def report_progress(self, value):
+        """Envia um valor de progresso para o callback on_progress (na thread do Tk)"""
+        if not self.cancelled:
+            self._runner._post(self, 'progress', value)
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def result(self, timeout=None):
+        """Espera e retorna o resultado (bloqueia; não use na thread do Tk)"""
+        return self.future.result(timeout)
+
+class TaskRunner:
+    """Executa trabalho de I/O fora da thread do Tk.
+
+    As funções rodam em um pool limitado de threads e os callbacks
+    (on_success, on_error, on_progress, on_finally) são sempre chamados na
+    thread do Tk: os eventos ficam em uma fila lida por `widget.after()`
+    enquanto houver tarefas pendentes. `submit` deve ser chamado na thread
+    do Tk.
+    """
+
+    def __init__(self, widget, max_workers=None, poll_interval_ms=None):
+        self.widget = widget
+        self.max_workers = max_workers or TASK_SETTINGS['max_workers']
+        self.poll_interval_ms = poll_interval_ms or TASK_SETTINGS['poll_interval_ms']
+        self.logger = Logger.get_logger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fin-assist-task')
+        self._events = queue.SimpleQueue()
+        self._tasks = set()
+        self._poll_scheduled = False
+        self._closed = False
+
+    @property
+    def pending(self):
+        """Quantidade de tarefas cujo resultado ainda não foi entregue"""
+        return len(self._tasks)
+
+    def submit(self, func, *args, on_success=None, on_error=None, on_progress=None,
+               on_finally=None, with_task=False, name=None, **kwargs):
+        """Agenda `func(*args, **kwargs)` e retorna a Task.
+
+        Com with_task=True a função recebe a Task como primeiro argumento.
+        Sem on_error, exceções são registradas no log.
+        """
+        if self._closed:
+            raise RuntimeError("TaskRunner já foi encerrado")
+
+        callbacks = {
+            'success': on_success,
+            'error': on_error,
+            'progress': on_progress,
+            'finally': on_finally,
+        }
+        task = Task(self, name or getattr(func, '__name__', 'tarefa'), callbacks)
+
+        def run():
+            task.check_cancelled()
+            if with_task:
+                return func(task, *args, **kwargs)
+            return func(*args, **kwargs)
+
+        self._tasks.add(task)
+        task.future = self._executor.submit(run)
+        task.future.add_done_callback(lambda future: self._post(task, 'done', None))
+        self._schedule_poll()
+        return task
+
+    def cancel_all(self):
+        """Cancela todas as tarefas pendentes"""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def shutdown(self, wait=False):
+        """Cancela o que estiver pendente e encerra o pool"""
+        self._closed = True
+        self.cancel_all()
+        self._tasks.clear()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _post(self, task, kind, value):
+        # Chamado nas threads do pool: só enfileira, nunca toca no Tk
+        self._events.put((task, kind, value))
+
+    def _schedule_poll(self):
+        if self._poll_scheduled or self._closed:
+            return
+        try:
+            self.widget.after(self.poll_interval_ms, self._poll)
+            self._poll_scheduled = True
+        except Exception:
+            # Widget destruído: não há mais onde entregar resultados
+            self.shutdown()
+
+    def _poll(self):
+        """Entrega os eventos enfileirados (roda na thread do Tk)"""
+        self._poll_scheduled = False
+        while not self._closed:
+            try:
+                task, kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._dispatch(task, kind, value)
+
+        if self._tasks:
+            self._schedule_poll()
+
+    def _dispatch(self, task, kind, value):
+        callbacks = task._callbacks
+        try:
+            if kind == 'progress':
+                if not task.cancelled and callbacks['progress']:
+                    callbacks['progress'](value)
+                return
+
+            self._tasks.discard(task)
+            future = task.future
+            try:
+                if task.cancelled or future.cancelled():
+                    return
+                error = future.exception()
+                if isinstance(error, TaskCancelled):
+                    return
+                if error is not None:
+                    if callbacks['error']:
+                        callbacks['error'](error)
+                    else:
+                        self.logger.error(f"Erro na tarefa {task.name}: {error}")
+                elif callbacks['success']:
+                    callbacks['success'](future.result())
+            finally:
+                if callbacks['finally']:
+                    callbacks['finally']()
+        except Exception as e:
+            # Um callback com erro não pode interromper a entrega dos demais
+            self.logger.error(f"Erro no callback da tarefa {task.name}: {e}")
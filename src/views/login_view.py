@@ -2,13 +2,19 @@ import customtkinter as ctk
 from src.models.user import User
 from src.views.main_view import MainView
 from src.views.register_view import RegisterView
+from src.utils.task_runner import TaskRunner
 
 class LoginView(ctk.CTkFrame):
     def __init__(self, master):
         super().__init__(master)
         self.master = master
+        self.tasks = TaskRunner(self)
         self.setup_ui()
     
+    def destroy(self):
+        self.tasks.shutdown()
+        super().destroy()
+    
     def setup_ui(self):
         # Configuração do frame principal
         self.configure(fg_color="#1a1a1a")
@@ -52,7 +58,7 @@ class LoginView(ctk.CTkFrame):
         self.password_entry.pack(pady=10)
         
         # Botão de login
-        login_button = ctk.CTkButton(
+        self.login_button = login_button = ctk.CTkButton(
             input_frame,
             text="Entrar",
             width=300,
@@ -81,11 +87,20 @@ class LoginView(ctk.CTkFrame):
             self.show_error("Por favor, preencha todos os campos")
             return
         
-        user = User.authenticate(username, password)
-        if user:
-            self.show_main_view(user)
-        else:
-            self.show_error("Usuário ou senha inválidos")
+        # A verificação do bcrypt é lenta de propósito: roda fora da thread do Tk
+        def autenticado(user):
+            self.login_button.configure(state="normal")
+            if user:
+                self.show_main_view(user)
+            else:
+                self.show_error("Usuário ou senha inválidos")
+        
+        def falhou(e):
+            self.login_button.configure(state="normal")
+            self.show_error(f"Erro ao entrar: {e}")
+        
+        self.login_button.configure(state="disabled")
+        self.tasks.submit(User.authenticate, username, password, on_success=autenticado, on_error=falhou)
     
     def show_register(self):
         self.destroy()
@@ -2,6 +2,9 @@ import customtkinter as ctk
 from src.controllers.transaction_controller import TransactionController
 from src.controllers.goal_controller import GoalController
 from src.controllers.chatbot_controller import ChatbotController
+from src.services.dashboard_service import DashboardService
+from src.views.virtual_table import VirtualTable
+from src.utils.task_runner import TaskRunner
 from datetime import datetime
 
 from src.utils.message_utils import MessageUtils
@@ -28,10 +31,26 @@ class MainView(ctk.CTkFrame):
         self.closed = False  # Flag para indicar se a janela foi fechada
         self.transaction_controller = TransactionController(user)
         self.goal_controller = GoalController(user)
+        self.dashboard_service = DashboardService(user)
         self.chatbot_controller = ChatbotController(user, self.transaction_controller, self.goal_controller)
+        # Consultas, relatórios e chamadas à IA rodam fora da thread do Tk
+        self.tasks = TaskRunner(self)
         
         self.setup_ui()
     
+    def destroy(self):
+        self.closed = True
+        self.tasks.shutdown()
+        super().destroy()
+    
+    @staticmethod
+    def _exists(widget):
+        """Indica se o widget ainda está na tela (o usuário pode ter trocado de aba)"""
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+    
     def setup_ui(self):
         # Configuração do frame principal
         self.configure(fg_color="#1a1a1a")
@@ -93,11 +112,34 @@ class MainView(ctk.CTkFrame):
         )
         title_label.pack(pady=20)
         
-        # Cards de resumo
-        self.create_summary_cards()
+        loading_label = ctk.CTkLabel(self.main_area, text="Carregando...", font=("Roboto", 12), text_color="#bbb")
+        loading_label.pack(pady=10)
         
-        # Gráficos
-        self.create_charts()
+        # Todos os números do dashboard vêm de um único snapshot agregado
+        def render(snapshot):
+            if not self._exists(loading_label):
+                return
+            loading_label.destroy()
+            
+            # Cards de resumo
+            self.create_summary_cards(snapshot)
+            
+            # Gráficos
+            self.create_charts(snapshot)
+        
+        self.tasks.submit(self.dashboard_service.get_snapshot, on_success=render)
+    
+    def refresh_dashboard(self):
+        """Recarrega os cards e gráficos em segundo plano, se estiverem visíveis"""
+        def render(snapshot):
+            if hasattr(self, 'cards_frame') and self._exists(self.cards_frame):
+                self.create_summary_cards(snapshot)
+            if hasattr(self, 'chart_frame') and self._exists(self.chart_frame):
+                self.create_charts(snapshot)
+        
+        if (hasattr(self, 'cards_frame') and self._exists(self.cards_frame)) or \
+                (hasattr(self, 'chart_frame') and self._exists(self.chart_frame)):
+            self.tasks.submit(self.dashboard_service.get_snapshot, on_success=render)
     
     def show_transactions(self):
         self.clear_main_area()
@@ -195,7 +237,18 @@ class MainView(ctk.CTkFrame):
         filtro_btn.grid(row=0, column=6, padx=10, sticky="we")
         
         # --- Lista de transações ---
-        self.trans_list_frame = ctk.CTkFrame(trans_frame, fg_color="#232323")
+        # Só as linhas visíveis viram widgets; as páginas são buscadas ao rolar
+        self._trans_filters = None
+        self.trans_list_frame = VirtualTable(
+            trans_frame,
+            columns=["Data", "Tipo", "Categoria", "Subcategoria", "Valor", "Descrição"],
+            row_values=lambda t: (t.date_display, tipo_para_pt(t.type), t.category, t.subcategory or "", f'R$ {t.value:.2f}', t.description or ""),
+            actions=[
+                ("Editar", lambda t: self.edit_transaction(t.id), {}),
+                ("Excluir", lambda t: self.delete_transaction(t.id), {"fg_color": "#E53935", "hover_color": "#b71c1c"}),
+            ],
+            empty_text="Nenhuma transação encontrada."
+        )
         self.trans_list_frame.pack(padx=10, pady=10, fill="both", expand=True)
         self.update_transaction_list()
     
@@ -244,29 +297,28 @@ class MainView(ctk.CTkFrame):
         )
         title_label.pack(pady=20)
         
+        # Conecta ao Gemini em segundo plano na primeira visita; as respostas
+        # esperam a conexão no worker, sem travar a tela
+        self.chatbot_controller.start()
+        
         # Área de chat
         self.create_chat_area()
     
-    def is_number(self, val):
-        try:
-            float(val)
-            return True
-        except Exception:
-            return False
-
-    def create_summary_cards(self):
+    def create_summary_cards(self, snapshot):
         # Limpa área de cards se já existir
         if hasattr(self, 'cards_frame'):
             self.cards_frame.destroy()
+        # No refresh os gráficos continuam no lugar: cards e metas voltam para cima deles
+        before = {'before': self.chart_frame} if hasattr(self, 'chart_frame') and self._exists(self.chart_frame) else {}
         self.cards_frame = ctk.CTkFrame(self.main_area, fg_color="transparent")
-        self.cards_frame.pack(pady=10, padx=10, fill="x")
+        self.cards_frame.pack(pady=10, padx=10, fill="x", **before)
 
         # Obtém dados
-        saldo = self.transaction_controller.get_balance()
-        transacoes = self.transaction_controller.get_transactions()
-        receitas = sum(float(t[5]) for t in transacoes if tipo_para_en(t[2]) == 'income' and self.is_number(t[5]))
-        despesas = sum(float(t[5]) for t in transacoes if tipo_para_en(t[2]) == 'expense' and self.is_number(t[5]))
-        investimentos = sum(float(t[5]) for t in transacoes if tipo_para_en(t[2]) == 'investment' and self.is_number(t[5]))
+        totais = snapshot.totals
+        saldo = snapshot.balance
+        receitas = totais['income']
+        despesas = totais['expense']
+        investimentos = totais['investment']
 
         # Cores
         cores = {
@@ -309,9 +361,9 @@ class MainView(ctk.CTkFrame):
         if hasattr(self, 'goals_frame'):
             self.goals_frame.destroy()
         self.goals_frame = ctk.CTkFrame(self.main_area, fg_color="#232323", height=int(120*1.25))
-        self.goals_frame.pack(pady=20, padx=10, fill="x")
+        self.goals_frame.pack(pady=20, padx=10, fill="x", **before)
         self.goals_frame.pack_propagate(False)
-        metas = self.goal_controller.get_goals()
+        metas = snapshot.goals
         ctk.CTkLabel(self.goals_frame, text="Progresso das Metas", font=("Roboto", 16, "bold"), text_color="#fff").pack(anchor="w", padx=10, pady=(10, 0))
         if metas:
             table_frame = ctk.CTkFrame(self.goals_frame, fg_color="transparent")
@@ -320,34 +372,30 @@ class MainView(ctk.CTkFrame):
             for j, h in enumerate(headers):
                 ctk.CTkLabel(table_frame, text=h, font=("Roboto", 12, "bold"), text_color="#90caf9").grid(row=0, column=j, padx=8, pady=2)
             for i, meta in enumerate(metas):
-                progresso = (float(meta[4])/float(meta[3])*100) if (meta[3] or 0) > 0 else 0
-                row = [meta[2], f'R$ {float(meta[3]):.2f}', f'R$ {float(meta[4]):.2f}', f'{progresso:.1f}%', meta[6]]
+                row = [meta.title, f'R$ {meta.target:.2f}', f'R$ {meta.current:.2f}', f'{meta.progress:.1f}%', meta.status]
                 for j, val in enumerate(row):
                     ctk.CTkLabel(table_frame, text=val, font=("Roboto", 12), text_color="#fff").grid(row=i+1, column=j, padx=8, pady=2)
         else:
             ctk.CTkLabel(self.goals_frame, text="Nenhuma meta cadastrada.", font=("Roboto", 12), text_color="#bbb").pack(pady=10)
 
-    def create_charts(self):
-        # Limpa área de gráficos se já existir
-        if hasattr(self, 'chart_frame'):
-            self.chart_frame.destroy()
+    def create_charts(self, snapshot):
+        # Gráficos já visíveis são atualizados no lugar (mesma figura e canvas)
+        if hasattr(self, 'chart_frame') and self._exists(self.chart_frame):
+            self.dashboard_charts.set_data(snapshot.month_totals, snapshot.top_expenses)
+            return
         self.chart_frame = ctk.CTkFrame(self.main_area, fg_color="#232323")
         self.chart_frame.pack(pady=10, padx=10, fill="both", expand=True)
 
         # Usa o ChartGenerator para criar os gráficos
         from src.utils.chart_generator import ChartGenerator
-        transacoes = self.transaction_controller.get_transactions()
         chart_gen = ChartGenerator()
-        chart_gen.create_monthly_charts(transacoes, self.chart_frame)
+        self.dashboard_charts = chart_gen.create_summary_charts(snapshot.month_totals, snapshot.top_expenses, self.chart_frame)
     
     def create_transaction_form(self):
         # TODO: Implementar formulário de transação
         pass
     
     def update_transaction_list(self):
-        for widget in self.trans_list_frame.winfo_children():
-            widget.destroy()
-
         # Filtros
         tipo = self.filtro_tipo_var.get()
         tipo_en = tipo_para_en(tipo) if tipo != "todos" else None
@@ -364,40 +412,16 @@ class MainView(ctk.CTkFrame):
             self.show_trans_error("Formato de data inválido nos filtros! Use DD-MM-YYYY.")
             return
             
-        transacoes = self.transaction_controller.get_transactions(
-            start_date=data_ini,
-            end_date=data_fim,
-            type=tipo_en
-        )
-
-        # Cabeçalho da tabela estilo Excel
-        headers = ["Data", "Tipo", "Categoria", "Subcategoria", "Valor", "Descrição", "Editar", "Excluir"]
-        for j, h in enumerate(headers):
-            header = ctk.CTkLabel(self.trans_list_frame, text=h, font=("Roboto", 12, "bold"), text_color="#90caf9", fg_color="#1a1a1a", width=14)
-            header.grid(row=0, column=j, padx=1, pady=1, sticky="nsew")
-            self.trans_list_frame.grid_columnconfigure(j, weight=1)
-
-        if not transacoes:
-            ctk.CTkLabel(self.trans_list_frame, text="Nenhuma transação encontrada.", font=("Roboto", 12), text_color="#bbb").grid(row=1, column=0, columnspan=8, pady=10, sticky="nsew")
+        filtros = {'start_date': data_ini, 'end_date': data_fim, 'type': tipo_en}
+        if filtros == self._trans_filters:
+            # Mesmos filtros (após editar/excluir): recarrega mantendo a rolagem
+            self.trans_list_frame.reload()
             return
 
-        for i, t in enumerate(transacoes):
-            bg = "#232323" if i % 2 == 0 else "#1a1a1a"
-            # Converte data para DD-MM-YYYY para exibição
-            try:
-                data_display = datetime.strptime(t[7][:10], '%Y-%m-%d').strftime('%d-%m-%Y')
-            except:
-                data_display = t[7][:10]
-            ctk.CTkLabel(self.trans_list_frame, text=data_display, font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=0, padx=1, pady=1, sticky="nsew")  # Data
-            ctk.CTkLabel(self.trans_list_frame, text=tipo_para_pt(t[2]), font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=1, padx=1, pady=1, sticky="nsew")  # Tipo
-            ctk.CTkLabel(self.trans_list_frame, text=t[3], font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=2, padx=1, pady=1, sticky="nsew")  # Categoria
-            ctk.CTkLabel(self.trans_list_frame, text=t[4], font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=3, padx=1, pady=1, sticky="nsew")  # Subcategoria
-            ctk.CTkLabel(self.trans_list_frame, text=f'R$ {t[5]:.2f}', font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=4, padx=1, pady=1, sticky="nsew")  # Valor
-            ctk.CTkLabel(self.trans_list_frame, text=t[6] or "", font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=5, padx=1, pady=1, sticky="nsew")  # Descrição
-            edit_btn = ctk.CTkButton(self.trans_list_frame, text="Editar", width=60, command=lambda tid=t[0]: self.edit_transaction(tid))
-            edit_btn.grid(row=i+1, column=6, padx=1, pady=1, sticky="nsew")
-            del_btn = ctk.CTkButton(self.trans_list_frame, text="Excluir", width=60, fg_color="#E53935", hover_color="#b71c1c", command=lambda tid=t[0]: self.delete_transaction(tid))
-            del_btn.grid(row=i+1, column=7, padx=1, pady=1, sticky="nsew")
+        self._trans_filters = filtros
+        self.trans_list_frame.load(
+            lambda cursor: self.transaction_controller.get_transactions_page(cursor=cursor, **filtros)
+        )
 
     def create_goal_form(self):
         # Formulário para adicionar metas
@@ -433,25 +457,26 @@ class MainView(ctk.CTkFrame):
             header.grid(row=0, column=j, padx=1, pady=1, sticky="nsew")
             metas_frame.grid_columnconfigure(j, weight=1)
 
-        # Obtém as metas do controlador
-        metas = self.goal_controller.get_goals()
+        # Obtém as metas do controlador em segundo plano
+        def render(metas):
+            if self._exists(metas_frame):
+                self._fill_goal_list(metas_frame, metas, len(headers))
 
+        self.tasks.submit(self.goal_controller.get_goals, on_success=render)
+
+    def _fill_goal_list(self, metas_frame, metas, columns):
+        """Preenche a tabela de metas com os registros carregados"""
         if not metas:
-            ctk.CTkLabel(metas_frame, text="Nenhuma meta cadastrada.", font=("Roboto", 12), text_color="#bbb").grid(row=1, column=0, columnspan=len(headers), pady=10, sticky="nsew")
+            ctk.CTkLabel(metas_frame, text="Nenhuma meta cadastrada.", font=("Roboto", 12), text_color="#bbb").grid(row=1, column=0, columnspan=columns, pady=10, sticky="nsew")
             return
 
         for i, meta in enumerate(metas):
             bg = "#232323" if i % 2 == 0 else "#1a1a1a"
-            title = meta[2]
-            valor_alvo = float(meta[3]) if meta[3] is not None else 0.0
-            valor_atual = float(meta[4]) if meta[4] is not None else 0.0
-            # Exibir prazo no formato DD-MM-YYYY
-            try:
-                from datetime import datetime as _dt
-                deadline = _dt.strptime(meta[5], '%Y-%m-%d').strftime('%d-%m-%Y') if meta[5] else ''
-            except Exception:
-                deadline = meta[5]
-            progresso = (valor_atual / valor_alvo) * 100 if valor_alvo > 0 else 0
+            title = meta.title
+            valor_alvo = meta.target
+            valor_atual = meta.current
+            deadline = meta.deadline_display
+            progresso = meta.progress
 
             ctk.CTkLabel(metas_frame, text=title, font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=0, padx=1, pady=1, sticky="nsew")
             ctk.CTkLabel(metas_frame, text=f"R$ {valor_alvo:.2f}", font=("Roboto", 12), text_color="#fff", fg_color=bg).grid(row=i+1, column=1, padx=1, pady=1, sticky="nsew")
@@ -480,7 +505,8 @@ class MainView(ctk.CTkFrame):
         
         ctk.CTkButton(report_frame, text="Exportar Transações (CSV)", command=self.export_transactions_csv, width=200).pack(anchor="w", pady=5)
         ctk.CTkButton(report_frame, text="Importar Transações (CSV)", command=self.import_transactions_csv, width=200).pack(anchor="w", pady=5)
-        ctk.CTkButton(report_frame, text="Backup Completo (JSON)", command=self.export_all_data_json, width=200).pack(anchor="w", pady=5)
+        ctk.CTkButton(report_frame, text="Backup Completo", command=self.export_all_data_json, width=200).pack(anchor="w", pady=5)
+        ctk.CTkButton(report_frame, text="Restaurar Backup", command=self.restore_backup, width=200).pack(anchor="w", pady=5)
 
     def create_chat_area(self):
         # Área de chat
@@ -531,6 +557,12 @@ class MainView(ctk.CTkFrame):
 
         ctk.CTkButton(input_frame, text="Enviar", command=self.send_chat_message, 
                      width=100, height=40, font=("Roboto", 12, "bold")).grid(row=0, column=1, sticky="w")
+        
+        # Interrompe a resposta em andamento
+        self.chat_stop_btn = ctk.CTkButton(input_frame, text="Parar", command=self.stop_chat_response,
+                                           width=80, height=40, font=("Roboto", 12, "bold"),
+                                           fg_color="#E53935", hover_color="#b71c1c", state="disabled")
+        self.chat_stop_btn.grid(row=0, column=2, sticky="w", padx=(10, 0))
 
         # Área de saída do chat
         self.chat_output = ctk.CTkScrollableFrame(chat_frame, fg_color="#232323")
@@ -572,7 +604,16 @@ class MainView(ctk.CTkFrame):
             return
 
         # Adiciona transação
-        if self.transaction_controller.add_transaction(tipo, categoria, valor, descricao, data_iso, subcategoria):
+        self.tasks.submit(
+            self.transaction_controller.add_transaction,
+            tipo, categoria, valor, descricao, data_iso, subcategoria,
+            on_success=self._on_transaction_added
+        )
+
+    def _on_transaction_added(self, ok):
+        if not self._exists(self.trans_list_frame):
+            return
+        if ok:
             from src.utils.message_utils import MessageUtils
             MessageUtils.show_success(self.main_area, "Transação adicionada com sucesso!")
             self.categoria_var.set(self.categorias_receita[0])
@@ -583,27 +624,28 @@ class MainView(ctk.CTkFrame):
             self.data_entry.insert(0, datetime.now().strftime('%d-%m-%Y'))
             self.update_transaction_list()
             # Atualiza dashboard se visível
-            if hasattr(self, 'cards_frame') and self.cards_frame.winfo_exists():
-                self.create_summary_cards()
-            if hasattr(self, 'chart_frame') and self.chart_frame.winfo_exists():
-                self.create_charts()
+            self.refresh_dashboard()
         else:
             self.show_trans_error("Erro ao adicionar transação!")
 
     def show_trans_error(self, msg):
-        # Mensagem de erro na tabela de transações usando grid
+        # Mensagem de erro sobreposta ao rodapé da tabela de transações
         if self.closed:
             return
         error_label = ctk.CTkLabel(self.trans_list_frame, text=msg, text_color="#ff4444", font=("Roboto", 12))
-        # row=999 para garantir que fique no final da tabela
-        error_label.grid(row=999, column=0, columnspan=8, pady=5)
+        error_label.place(relx=0.5, rely=1.0, y=-5, anchor="s")
         def safe_destroy():
             if not self.closed:
                 error_label.destroy()
         self.trans_list_frame.after(3000, safe_destroy)
 
     def edit_transaction(self, trans_id):
-        trans = self.transaction_controller.get_transaction_by_id(trans_id)
+        self.tasks.submit(self.transaction_controller.get_transaction_by_id, trans_id,
+                          on_success=self._open_edit_transaction)
+
+    def _open_edit_transaction(self, trans):
+        if not self._exists(self.trans_list_frame):
+            return
         if not trans:
             self.show_trans_error("Transação não encontrada!")
             return
@@ -615,38 +657,33 @@ class MainView(ctk.CTkFrame):
 
         # Campos
         ctk.CTkLabel(edit_win, text="Tipo:").grid(row=0, column=0, padx=10, pady=10, sticky="e")
-        tipo_var = ctk.StringVar(value=tipo_para_pt(trans[2]).lower())
+        tipo_var = ctk.StringVar(value=tipo_para_pt(trans.type).lower())
         tipo_combo = ctk.CTkComboBox(edit_win, values=["receita", "despesa", "investimento"], variable=tipo_var, width=120)
         tipo_combo.grid(row=0, column=1, padx=5, pady=10, sticky="w")
 
         ctk.CTkLabel(edit_win, text="Categoria:").grid(row=1, column=0, padx=10, pady=10, sticky="e")
-        categoria_var = ctk.StringVar(value=trans[3])
+        categoria_var = ctk.StringVar(value=trans.category)
         categoria_combo = ctk.CTkComboBox(edit_win, values=self.categorias_receita+self.categorias_despesa+self.categorias_investimento, variable=categoria_var, width=120)
         categoria_combo.grid(row=1, column=1, padx=5, pady=10, sticky="w")
 
         ctk.CTkLabel(edit_win, text="Subcategoria:").grid(row=2, column=0, padx=10, pady=10, sticky="e")
         subcategoria_entry = ctk.CTkEntry(edit_win, width=120)
-        subcategoria_entry.insert(0, trans[4] or "")
+        subcategoria_entry.insert(0, trans.subcategory or "")
         subcategoria_entry.grid(row=2, column=1, padx=5, pady=10, sticky="w")
 
         ctk.CTkLabel(edit_win, text="Valor:").grid(row=3, column=0, padx=10, pady=10, sticky="e")
         valor_entry = ctk.CTkEntry(edit_win, width=120)
-        valor_entry.insert(0, str(trans[5]))
+        valor_entry.insert(0, str(trans.amount))
         valor_entry.grid(row=3, column=1, padx=5, pady=10, sticky="w")
 
         ctk.CTkLabel(edit_win, text="Descrição:").grid(row=4, column=0, padx=10, pady=10, sticky="e")
         desc_entry = ctk.CTkEntry(edit_win, width=250)
-        desc_entry.insert(0, trans[6] or "")
+        desc_entry.insert(0, trans.description or "")
         desc_entry.grid(row=4, column=1, padx=5, pady=10, sticky="w")
 
         ctk.CTkLabel(edit_win, text="Data (DD-MM-YYYY):").grid(row=5, column=0, padx=10, pady=10, sticky="e")
         data_entry = ctk.CTkEntry(edit_win, width=120)
-        # Converte data para DD-MM-YYYY para exibição
-        try:
-            data_display = datetime.strptime(trans[7][:10], '%Y-%m-%d').strftime('%d-%m-%Y')
-        except:
-            data_display = trans[7][:10]
-        data_entry.insert(0, data_display)
+        data_entry.insert(0, trans.date_display)
         data_entry.grid(row=5, column=1, padx=5, pady=10, sticky="w")
 
         def salvar_edicao():
@@ -671,19 +708,22 @@ class MainView(ctk.CTkFrame):
                 self.show_trans_error("Formato de data inválido! Use DD-MM-YYYY.")
                 return
                 
-            ok = self.transaction_controller.update_transaction(
-                trans[0], tipo_db, categoria_var.get(), subcategoria_entry.get(), valor, desc_entry.get(), data_iso
+            self.tasks.submit(
+                self.transaction_controller.update_transaction,
+                trans.id, tipo_db, categoria_var.get(), subcategoria_entry.get(), valor, desc_entry.get(), data_iso,
+                on_success=edicao_salva
             )
+
+        def edicao_salva(ok):
+            if not self._exists(edit_win):
+                return
             if ok:
                 from src.utils.message_utils import MessageUtils
                 MessageUtils.show_success(self.main_area, "Transação atualizada com sucesso!")
                 edit_win.destroy()
                 self.update_transaction_list()
                 # Atualiza dashboard se visível
-                if hasattr(self, 'cards_frame') and self.cards_frame.winfo_exists():
-                    self.create_summary_cards()
-                if hasattr(self, 'chart_frame') and self.chart_frame.winfo_exists():
-                    self.create_charts()
+                self.refresh_dashboard()
             else:
                 self.show_trans_error("Erro ao atualizar transação!")
 
@@ -691,32 +731,40 @@ class MainView(ctk.CTkFrame):
         salvar_btn.grid(row=6, column=0, columnspan=2, pady=20)
 
     def delete_transaction(self, trans_id):
+        # Busca dados da transação para mostrar na confirmação
+        self.tasks.submit(self.transaction_controller.get_transaction_by_id, trans_id,
+                          on_success=self._confirm_delete_transaction)
+
+    def _confirm_delete_transaction(self, trans):
         from src.utils.message_utils import MessageUtils
         from src.utils.loading_utils import ConfirmationDialog
         
-        # Busca dados da transação para mostrar na confirmação
-        transactions = self.transaction_controller.get_transactions()
-        trans = next((t for t in transactions if t[0] == trans_id), None)
-        
+        if not self._exists(self.trans_list_frame):
+            return
         if not trans:
             MessageUtils.show_error(self.main_area, "Transação não encontrada!")
             return
         
         # Confirmação antes de excluir
-        trans_desc = f"{trans[3]} - R$ {trans[5]:.2f}" if trans[6] else f"{trans[3]} - R$ {trans[5]:.2f}"
+        trans_desc = f"{trans.category} - R$ {trans.amount:.2f}"
         if not ConfirmationDialog.show(self, "Confirmar Exclusão", 
                                      f"Tem certeza que deseja excluir a transação '{trans_desc}'?"):
             return
         
         # Excluir transação
-        if self.transaction_controller.delete_transaction(trans_id):
+        self.tasks.submit(self.transaction_controller.delete_transaction, trans.id,
+                          on_success=self._on_transaction_deleted)
+
+    def _on_transaction_deleted(self, ok):
+        from src.utils.message_utils import MessageUtils
+        
+        if not self._exists(self.trans_list_frame):
+            return
+        if ok:
             MessageUtils.show_success(self.main_area, "Transação excluída com sucesso!")
             self.update_transaction_list()
             # Atualiza dashboard se visível
-            if hasattr(self, 'cards_frame') and self.cards_frame.winfo_exists():
-                self.create_summary_cards()
-            if hasattr(self, 'chart_frame') and self.chart_frame.winfo_exists():
-                self.create_charts()
+            self.refresh_dashboard()
         else:
             self.show_trans_error("Erro ao excluir transação!")
 
@@ -727,12 +775,15 @@ class MainView(ctk.CTkFrame):
         tipo_en = tipo_para_en(tipo)
         
         # Busca categorias do banco de dados
-        category_controller = CategoryController(self.user)
-        categories = category_controller.get_categories(tipo_en)
+        def render(categories):
+            if not self._exists(self.categoria_combo):
+                return
+            self.categoria_combo.configure(values=categories)
+            if categories:
+                self.categoria_var.set(categories[0])
         
-        self.categoria_combo.configure(values=categories)
-        if categories:
-            self.categoria_var.set(categories[0])
+        category_controller = CategoryController(self.user)
+        self.tasks.submit(category_controller.get_categories, tipo_en, on_success=render)
     
     def add_custom_category(self):
         """Adiciona uma nova categoria personalizada"""
@@ -762,7 +813,12 @@ class MainView(ctk.CTkFrame):
             tipo_en = tipo_para_en(tipo)
             
             category_controller = CategoryController(self.user)
-            if category_controller.add_custom_category(tipo_en, nome):
+            self.tasks.submit(category_controller.add_custom_category, tipo_en, nome, on_success=categoria_salva)
+        
+        def categoria_salva(ok):
+            if not self._exists(cat_win):
+                return
+            if ok:
                 MessageUtils.show_success(cat_win, "Categoria adicionada com sucesso!")
                 # Atualiza lista de categorias
                 self.update_categoria_options()
@@ -800,7 +856,15 @@ class MainView(ctk.CTkFrame):
             return
 
         # Adiciona a meta (usa assinatura do controller: title, target_amount, deadline)
-        if self.goal_controller.add_goal(nome, valor_alvo, prazo_convertido):
+        self.tasks.submit(self.goal_controller.add_goal, nome, valor_alvo, prazo_convertido,
+                          on_success=self._on_goal_added)
+
+    def _on_goal_added(self, ok):
+        from src.utils.message_utils import MessageUtils
+        
+        if not self._exists(self.meta_nome_entry):
+            return
+        if ok:
             MessageUtils.show_success(self.main_area, "Meta adicionada com sucesso!")
             # Limpa os campos
             self.meta_nome_entry.delete(0, 'end')
@@ -817,15 +881,19 @@ class MainView(ctk.CTkFrame):
         
         # Confirmação antes de excluir
         if not ConfirmationDialog.show(self, "Confirmar Exclusão", 
-                                     f"Tem certeza que deseja excluir a meta '{meta[2]}'?"):
+                                     f"Tem certeza que deseja excluir a meta '{meta.title}'?"):
             return
         
-        meta_id = meta[0]  # Supondo que o ID da meta seja o primeiro elemento da tupla
-        if self.goal_controller.delete_goal(meta_id):
-            MessageUtils.show_success(self.main_area, "Meta excluída com sucesso!")
-            self.show_goals()  # Atualiza a lista de metas após a exclusão
-        else:
-            MessageUtils.show_error(self.main_area, "Erro ao excluir meta!")
+        def meta_excluida(ok):
+            if not self._exists(self.meta_nome_entry):
+                return
+            if ok:
+                MessageUtils.show_success(self.main_area, "Meta excluída com sucesso!")
+                self.show_goals()  # Atualiza a lista de metas após a exclusão
+            else:
+                MessageUtils.show_error(self.main_area, "Erro ao excluir meta!")
+        
+        self.tasks.submit(self.goal_controller.delete_goal, meta.id, on_success=meta_excluida)
 
     def edit_goal(self, meta):
         """Abre um layout para editar uma meta."""
@@ -837,19 +905,17 @@ class MainView(ctk.CTkFrame):
         # Campos
         ctk.CTkLabel(edit_win, text="Nome da Meta:", font=("Roboto", 12)).pack(pady=5)
         nome_entry = ctk.CTkEntry(edit_win, width=300)
-        nome_entry.insert(0, meta[2])
+        nome_entry.insert(0, meta.title)
         nome_entry.pack(pady=5)
 
         ctk.CTkLabel(edit_win, text="Valor Alvo:", font=("Roboto", 12)).pack(pady=5)
         valor_entry = ctk.CTkEntry(edit_win, width=300)
-        valor_entry.insert(0, str(meta[3]))
+        valor_entry.insert(0, str(meta.target_amount))
         valor_entry.pack(pady=5)
 
         ctk.CTkLabel(edit_win, text="Prazo (DD-MM-YYYY):", font=("Roboto", 12)).pack(pady=5)
         prazo_entry = ctk.CTkEntry(edit_win, width=300)
-        # Converte o prazo para o formato DD-MM-YYYY
-        prazo_formatado = datetime.strptime(meta[5], '%Y-%m-%d').strftime('%d-%m-%Y')
-        prazo_entry.insert(0, prazo_formatado)  # Supondo que o prazo seja o quarto elemento da tupla
+        prazo_entry.insert(0, meta.deadline_display)
         prazo_entry.pack(pady=5)
 
         def salvar_edicao():
@@ -874,8 +940,13 @@ class MainView(ctk.CTkFrame):
                 MessageUtils.show_error(edit_win, "Prazo inválido! Use o formato DD-MM-YYYY.")
                 return
 
-            meta_id = meta[0]
-            if self.goal_controller.update_goal(meta_id, nome, valor_alvo, prazo_convertido):
+            self.tasks.submit(self.goal_controller.update_goal, meta.id, nome, valor_alvo, prazo_convertido,
+                              on_success=edicao_salva)
+
+        def edicao_salva(ok):
+            if not self._exists(edit_win):
+                return
+            if ok:
                 MessageUtils.show_success(self.main_area, "Meta atualizada com sucesso!")
                 edit_win.destroy()
                 self.show_goals()
@@ -938,32 +1009,31 @@ class MainView(ctk.CTkFrame):
             if not filename:
                 return
                 
-            try:
-                from src.utils.loading_utils import LoadingManager
-                
-                # Mostra loading
-                loading_manager = LoadingManager(period_win)
-                loading_manager.show_loading("Gerando relatório...")
-                
-                # Busca transações do período
-                transactions = self.transaction_controller.get_transactions(
+            from src.utils.loading_utils import LoadingManager
+            
+            def gerar():
+                # Busca transações do período (lidas em streaming na thread da tarefa)
+                transactions = self.transaction_controller.iter_transactions(
                     start_date=start_iso,
                     end_date=end_iso
                 )
+                totals = self.transaction_controller.get_period_totals(start_iso, end_iso)
                 
                 # Gera PDF
                 pdf_gen = PDFGenerator(self.user)
-                pdf_gen.generate_financial_report(transactions, [], filename)
-                
-                # Esconde loading e mostra sucesso
-                loading_manager.hide_loading()
+                pdf_gen.generate_financial_report(transactions, [], filename, totals=totals)
+            
+            def sucesso(_):
                 messagebox.showinfo("Sucesso", f"Relatório salvo em:\n{filename}")
-                period_win.destroy()
-                
-            except Exception as e:
-                if 'loading_manager' in locals():
-                    loading_manager.hide_loading()
+                if self._exists(period_win):
+                    period_win.destroy()
+            
+            def erro(e):
                 messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{str(e)}")
+            
+            loading_manager = LoadingManager(period_win, self.tasks)
+            loading_manager.execute_with_loading(gerar, message="Gerando relatório...",
+                                                 on_success=sucesso, on_error=erro)
         
         ctk.CTkButton(period_win, text="Gerar Relatório", command=generate_report, width=150).pack(pady=20)
 
@@ -983,60 +1053,68 @@ class MainView(ctk.CTkFrame):
         if not filename:
             return
             
-        try:
-            from src.utils.loading_utils import LoadingManager
-            
-            # Mostra loading
-            loading_manager = LoadingManager(self)
-            loading_manager.show_loading("Gerando relatório de metas...")
-            
+        from src.utils.loading_utils import LoadingManager
+        
+        def gerar():
             # Busca todas as metas
             goals = self.goal_controller.get_goals()
             
             # Gera PDF (sem transações, só metas)
             pdf_gen = PDFGenerator(self.user)
             pdf_gen.generate_financial_report([], goals, filename)
-            
-            # Esconde loading e mostra sucesso
-            loading_manager.hide_loading()
-            messagebox.showinfo("Sucesso", f"Relatório de metas salvo em:\n{filename}")
-            
-        except Exception as e:
-            if 'loading_manager' in locals():
-                loading_manager.hide_loading()
-            messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{str(e)}")
+        
+        loading_manager = LoadingManager(self, self.tasks)
+        loading_manager.execute_with_loading(
+            gerar,
+            message="Gerando relatório de metas...",
+            on_success=lambda _: messagebox.showinfo("Sucesso", f"Relatório de metas salvo em:\n{filename}"),
+            on_error=lambda e: messagebox.showerror("Erro", f"Erro ao gerar relatório:\n{str(e)}")
+        )
 
     def export_transactions_csv(self):
         """Exporta transações para CSV"""
         from src.utils.data_import_export import DataImportExport
         
-        data_export = DataImportExport(self.transaction_controller, self.goal_controller, self.user)
-        if data_export.export_transactions_csv(self):
-            # Atualiza lista se visível
-            if hasattr(self, 'trans_list_frame') and self.trans_list_frame.winfo_exists():
-                self.update_transaction_list()
+        data_export = DataImportExport(self.transaction_controller, self.goal_controller, self.user, self.tasks)
+        data_export.export_transactions_csv(self)
 
     def import_transactions_csv(self):
         """Importa transações de CSV"""
         from src.utils.data_import_export import DataImportExport
         
-        data_import = DataImportExport(self.transaction_controller, self.goal_controller, self.user)
-        if data_import.import_transactions_csv(self):
+        def importado(ok):
             # Atualiza lista e dashboard se visível
-            if hasattr(self, 'trans_list_frame') and self.trans_list_frame.winfo_exists():
+            if not ok:
+                return
+            if hasattr(self, 'trans_list_frame') and self._exists(self.trans_list_frame):
                 self.update_transaction_list()
-            if hasattr(self, 'cards_frame') and self.cards_frame.winfo_exists():
-                self.create_summary_cards()
-            if hasattr(self, 'chart_frame') and self.chart_frame.winfo_exists():
-                self.create_charts()
+            self.refresh_dashboard()
+        
+        data_import = DataImportExport(self.transaction_controller, self.goal_controller, self.user, self.tasks)
+        data_import.import_transactions_csv(self, on_done=importado)
 
     def export_all_data_json(self):
-        """Exporta todos os dados para JSON"""
+        """Exporta todos os dados para o backup completo"""
         from src.utils.data_import_export import DataImportExport
         
-        data_export = DataImportExport(self.transaction_controller, self.goal_controller, self.user)
+        data_export = DataImportExport(self.transaction_controller, self.goal_controller, self.user, self.tasks)
         data_export.export_all_data_json(self)
 
+    def restore_backup(self):
+        """Restaura um backup completo"""
+        from src.utils.data_import_export import DataImportExport
+        
+        def restaurado(ok):
+            # Atualiza lista e dashboard se visíveis
+            if not ok:
+                return
+            if hasattr(self, 'trans_list_frame') and self._exists(self.trans_list_frame):
+                self.update_transaction_list()
+            self.refresh_dashboard()
+        
+        data_import = DataImportExport(self.transaction_controller, self.goal_controller, self.user, self.tasks)
+        data_import.restore_backup(self, on_done=restaurado)
+
     def send_chat_message(self):
         from src.utils.message_utils import MessageUtils
         
@@ -1051,20 +1129,52 @@ class MainView(ctk.CTkFrame):
         # Limpa o campo de entrada
         self.chat_input.delete(0, 'end')
         
-        # Mostra indicador de carregamento
-        loading_label = ctk.CTkLabel(self.chat_output, text="FinBot está pensando...", 
-                                   font=("Roboto", 12, "italic"), text_color="#bbb")
-        loading_label.pack(anchor="w", pady=5)
-        self.update()
+        # Uma resposta por vez: a anterior é interrompida
+        self.stop_chat_response()
         
-        # Obtém resposta do chatbot
-        try:
-            resposta = self.chatbot_controller.get_response(mensagem)
-            loading_label.destroy()  # Remove indicador de carregamento
-            self._add_chat_message("FinBot", resposta, "bot")
-        except Exception as e:
-            loading_label.destroy()
-            self._add_chat_message("FinBot", f"Desculpe, ocorreu um erro: {str(e)}", "error")
+        # A resposta aparece aos poucos, conforme os trechos chegam do worker
+        message_label = self._add_chat_message("FinBot", "FinBot está pensando...", "bot")
+        message_label.configure(text_color="#bbb")
+        partes = []
+        
+        def gerar(task):
+            for trecho in self.chatbot_controller.stream_response(mensagem, is_cancelled=lambda: task.cancelled):
+                task.report_progress(trecho)
+        
+        def trecho_recebido(trecho):
+            if not self._exists(message_label):
+                return
+            if not partes:
+                message_label.configure(text_color="#fff")
+            partes.append(trecho)
+            message_label.configure(text="".join(partes))
+            self._scroll_chat_to_end()
+        
+        def falhou(e):
+            if self._exists(message_label):
+                message_label.configure(text=f"Desculpe, ocorreu um erro: {str(e)}", text_color="#ffcccc")
+        
+        def finalizado():
+            if self._chat_task is task:
+                self._chat_task = None
+                if self._exists(self.chat_stop_btn):
+                    self.chat_stop_btn.configure(state="disabled")
+            if not partes and self._exists(message_label) and message_label.cget("text") == "FinBot está pensando...":
+                message_label.configure(text="(resposta interrompida)")
+        
+        task = self.tasks.submit(gerar, with_task=True, on_progress=trecho_recebido,
+                                 on_error=falhou, on_finally=finalizado)
+        self._chat_task = task
+        self.chat_stop_btn.configure(state="normal")
+    
+    def stop_chat_response(self):
+        """Cancela a resposta do chatbot em andamento, se houver"""
+        task = getattr(self, '_chat_task', None)
+        if task is not None:
+            task.cancel()
+            self._chat_task = None
+        if hasattr(self, 'chat_stop_btn') and self._exists(self.chat_stop_btn):
+            self.chat_stop_btn.configure(state="disabled")
     
     def _ask_suggestion(self, suggestion):
         """Faz uma pergunta sugerida"""
@@ -1115,7 +1225,12 @@ class MainView(ctk.CTkFrame):
         message_label.grid(row=0, column=0, sticky="ew", padx=15, pady=15)
         
         # Scroll para a última mensagem
-        self.chat_output.update()
+        self._scroll_chat_to_end()
+        return message_label
+    
+    def _scroll_chat_to_end(self):
+        """Rola o chat até a última mensagem"""
+        self.chat_output.update_idletasks()
         self.chat_output._parent_canvas.yview_moveto(1.0)
     
 
@@ -1125,6 +1240,8 @@ class MainView(ctk.CTkFrame):
         print("Usuário desconectado.")  # Mensagem de logout (opcional)
 
     def clear_main_area(self):
+        # Sai do chat: não há mais onde mostrar a resposta
+        self.stop_chat_response()
         # Remove todos os widgets da área principal
         for widget in self.main_area.winfo_children():
             widget.destroy()
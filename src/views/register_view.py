@@ -1,12 +1,18 @@
 import customtkinter as ctk
 from src.models.user import User
+from src.utils.task_runner import TaskRunner
 
 class RegisterView(ctk.CTkFrame):
     def __init__(self, master):
         super().__init__(master)
         self.master = master
+        self.tasks = TaskRunner(self)
         self.setup_ui()
     
+    def destroy(self):
+        self.tasks.shutdown()
+        super().destroy()
+    
     def setup_ui(self):
         # Configuração do frame principal
         self.configure(fg_color="#1a1a1a")
@@ -71,7 +77,7 @@ class RegisterView(ctk.CTkFrame):
         self.confirm_password_entry.pack(pady=10)
         
         # Botão de cadastro
-        register_button = ctk.CTkButton(
+        self.register_button = register_button = ctk.CTkButton(
             input_frame,
             text="Cadastrar",
             width=300,
@@ -120,19 +126,29 @@ class RegisterView(ctk.CTkFrame):
             self.show_error(message)
             return
         
-        # Cria o usuário
-        user = User(
-            username=username,
-            password=User.hash_password(password).decode('utf-8'),
-            email=email
-        )
-        
-        # Tenta salvar o usuário
-        if user.save():
-            self.show_success("Cadastro realizado com sucesso!")
-            self.after(2000, self.show_login)
-        else:
-            self.show_error("Nome de usuário ou email já cadastrado")
+        # Hash da senha e gravação rodam fora da thread do Tk
+        def criar_usuario():
+            user = User(
+                username=username,
+                password=User.hash_password(password).decode('utf-8'),
+                email=email
+            )
+            return user.save()
+        
+        def salvo(ok):
+            self.register_button.configure(state="normal")
+            if ok:
+                self.show_success("Cadastro realizado com sucesso!")
+                self.after(2000, self.show_login)
+            else:
+                self.show_error("Nome de usuário ou email já cadastrado")
+        
+        def falhou(e):
+            self.register_button.configure(state="normal")
+            self.show_error(f"Erro ao cadastrar: {e}")
+        
+        self.register_button.configure(state="disabled")
+        self.tasks.submit(criar_usuario, on_success=salvo, on_error=falhou)
     
     def show_login(self):
         self.destroy()
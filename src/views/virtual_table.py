@@ -0,0 +1,227 @@
+import sys
+
+import customtkinter as ctk
+
+DEFAULT_ROW_HEIGHT = 30
+PREFETCH_ROWS = 20  # Linhas carregadas além do fim da área visível
+
+class PagedRowSource:
+    """Lista de linhas carregada sob demanda, página a página.
+
+    `fetch_page(cursor)` deve devolver um objeto com `rows` e `next_cursor`
+    (como TransactionPage); a primeira chamada recebe cursor None.
+    """
+
+    def __init__(self, fetch_page):
+        self.fetch_page = fetch_page
+        self.rows = []
+        self.next_cursor = None
+        self.exhausted = False
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    @property
+    def has_more(self):
+        return not self.exhausted
+
+    def ensure(self, count):
+        """Busca páginas até ter pelo menos `count` linhas (ou acabar os dados)"""
+        while len(self.rows) < count and not self.exhausted:
+            page = self.fetch_page(self.next_cursor)
+            self.rows.extend(page.rows)
+            self.next_cursor = page.next_cursor
+            if not page.next_cursor or not page.rows:
+                self.exhausted = True
+        return len(self.rows)
+
+class _TableRow(ctk.CTkFrame):
+    """Linha reutilizável da tabela: os widgets são criados uma vez e só o texto muda"""
+
+    def __init__(self, table, columns, actions, row_height):
+        super().__init__(table.body, height=row_height, corner_radius=0)
+        self.grid_propagate(False)
+        self.index = None
+        self.record = None
+
+        self.grid_rowconfigure(0, weight=1)
+        self.cells = []
+        for j, _ in enumerate(columns):
+            self.grid_columnconfigure(j, weight=1, uniform="col")
+            cell = ctk.CTkLabel(self, text="", font=("Roboto", 12), text_color="#fff", anchor="center")
+            cell.grid(row=0, column=j, padx=1, sticky="nsew")
+            self.cells.append(cell)
+
+        for k, (text, command, colors) in enumerate(actions):
+            j = len(columns) + k
+            self.grid_columnconfigure(j, weight=1, uniform="col")
+            button = ctk.CTkButton(self, text=text, width=60, command=lambda c=command: c(self.record), **colors)
+            button.grid(row=0, column=j, padx=1, pady=1, sticky="nsew")
+            self.cells.append(button)
+
+        table._bind_wheel(self)
+        for widget in self.cells:
+            table._bind_wheel(widget)
+
+    def show(self, index, record, values):
+        """Associa a linha a um registro, atualizando só o que mudou"""
+        if index == self.index and record is self.record:
+            return
+        self.index = index
+        self.record = record
+        bg = "#232323" if index % 2 == 0 else "#1a1a1a"
+        self.configure(fg_color=bg)
+        for cell, value in zip(self.cells, values):
+            cell.configure(text=value, fg_color=bg)
+
+class VirtualTable(ctk.CTkFrame):
+    """Tabela que só cria widgets para as linhas visíveis.
+
+    As linhas vêm de um PagedRowSource e são buscadas conforme a rolagem se
+    aproxima do fim do que já foi carregado. Um conjunto fixo de linhas
+    (o suficiente para preencher a área visível) é reaproveitado ao rolar:
+    o custo de desenhar independe do número de registros.
+
+    `columns`: títulos das colunas de texto; `row_values(registro)` devolve
+    os textos na mesma ordem. `actions`: lista de (texto, callback(registro),
+    kwargs de cor do botão) exibidos como botões ao fim de cada linha.
+    """
+
+    def __init__(self, master, columns, row_values, actions=(), row_height=DEFAULT_ROW_HEIGHT,
+                 empty_text="Nenhum registro encontrado.", **kwargs):
+        kwargs.setdefault("fg_color", "#232323")
+        super().__init__(master, **kwargs)
+        self.columns = list(columns)
+        self.row_values = row_values
+        self.actions = list(actions)
+        self.row_height = row_height
+        self.empty_text = empty_text
+
+        self.source = None
+        self._top = 0  # Deslocamento da rolagem, em unidades da tabela
+        self._viewport_height = 0
+        self._pool = []
+
+        # Cabeçalho com as mesmas proporções das linhas
+        header = ctk.CTkFrame(self, fg_color="#1a1a1a", corner_radius=0)
+        header.pack(fill="x")
+        headers = self.columns + [text for text, _, _ in self.actions]
+        for j, h in enumerate(headers):
+            header.grid_columnconfigure(j, weight=1, uniform="col")
+            ctk.CTkLabel(header, text=h, font=("Roboto", 12, "bold"), text_color="#90caf9").grid(row=0, column=j, padx=1, pady=1, sticky="nsew")
+
+        content = ctk.CTkFrame(self, fg_color="transparent")
+        content.pack(fill="both", expand=True)
+        self.scrollbar = ctk.CTkScrollbar(content, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.body = ctk.CTkFrame(content, fg_color="transparent", corner_radius=0)
+        self.body.pack(side="left", fill="both", expand=True)
+        self.empty_label = ctk.CTkLabel(self.body, text=self.empty_text, font=("Roboto", 12), text_color="#bbb")
+
+        self.body.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.body)
+
+    def load(self, fetch_page):
+        """Troca a fonte de dados e volta ao topo"""
+        self.source = PagedRowSource(fetch_page)
+        self._top = 0
+        for row in self._pool:
+            row.index = row.record = None
+        self._refresh()
+
+    def reload(self):
+        """Recarrega os dados mantendo a posição da rolagem, se possível"""
+        if self.source is None:
+            return
+        top = self._top
+        self.source = PagedRowSource(self.source.fetch_page)
+        self._top = top
+        for row in self._pool:
+            row.index = row.record = None
+        self._refresh()
+
+    # --- Rolagem ---
+
+    def _bind_wheel(self, widget):
+        if sys.platform.startswith("linux"):
+            widget.bind("<Button-4>", lambda e: self._scroll_units(-3), add="+")
+            widget.bind("<Button-5>", lambda e: self._scroll_units(3), add="+")
+        else:
+            widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+
+    def _on_mousewheel(self, event):
+        step = event.delta / 120 if sys.platform.startswith("win") else event.delta
+        self._scroll_units(-3 if step > 0 else 3)
+
+    def _scroll_units(self, rows):
+        self._scroll_to(self._top + rows * self.row_height)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._scroll_to(float(args[0]) * self._content_height())
+        elif action == "scroll":
+            amount = int(args[0])
+            if len(args) > 1 and args[1] == "pages":
+                self._scroll_to(self._top + amount * self._viewport_height)
+            else:
+                self._scroll_units(max(-3, min(3, amount)))
+
+    def _on_resize(self, event):
+        self._viewport_height = event.height / self._get_widget_scaling()
+        self._refresh()
+
+    def _content_height(self):
+        return len(self.source) * self.row_height if self.source is not None else 0
+
+    def _visible_rows(self):
+        return int(self._viewport_height // self.row_height) + 2
+
+    def _scroll_to(self, top):
+        if self.source is None:
+            return
+        # Carrega o necessário para a posição pedida antes de limitar a rolagem
+        first = int(max(0, top) // self.row_height)
+        self.source.ensure(first + self._visible_rows() + PREFETCH_ROWS)
+        max_top = max(0, self._content_height() - self._viewport_height)
+        self._top = min(max(0, top), max_top)
+        self._layout()
+
+    def _refresh(self):
+        self._scroll_to(self._top)
+
+    # --- Desenho ---
+
+    def _layout(self):
+        """Posiciona as linhas reaproveitadas de acordo com a rolagem"""
+        total = len(self.source)
+        if total == 0:
+            for row in self._pool:
+                row.place_forget()
+            self.empty_label.place(relx=0.5, y=20, anchor="n")
+            self.scrollbar.set(0, 1)
+            return
+        self.empty_label.place_forget()
+
+        visible = self._visible_rows()
+        while len(self._pool) < visible:
+            self._pool.append(_TableRow(self, self.columns, self.actions, self.row_height))
+
+        first = int(self._top // self.row_height)
+        offset = self._top - first * self.row_height
+        for i, row in enumerate(self._pool):
+            index = first + i
+            if i < visible and index < total:
+                record = self.source[index]
+                row.show(index, record, self.row_values(record))
+                row.place(x=0, y=i * self.row_height - offset, relwidth=1)
+            else:
+                row.place_forget()
+
+        content = self._content_height()
+        if content <= self._viewport_height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self._top / content, (self._top + self._viewport_height) / content)
@@ -0,0 +1,155 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db, get_db_connection
+from src.controllers.transaction_controller import TransactionController
+from src.controllers.goal_controller import GoalController
+from src.controllers.category_controller import CategoryController
+from src.services.backup import write_backup, read_backup, restore_backup, open_backup
+
+class TestBackup(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        init_db()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.transactions = TransactionController(self.user)
+        self.goals = GoalController(self.user)
+
+        self.transactions.add_transactions_bulk([
+            ('income', 'Salário', 3000.0, 'Pagamento', '2025-01-05', None),
+            ('expense', 'Moradia', 900.0, None, '2025-01-06', 'Aluguel'),
+            ('expense', 'Alimentação', 35.5, 'Padaria "Pão"', '2025-02-01 08:30:00', None),
+        ])
+        self.goals.add_goal('Viagem', 5000.0, '2030-01-01')
+        # Categorias personalizadas sem nenhuma transação
+        self.categories = CategoryController(self.user)
+        self.categories.add_custom_category('expense', 'Pets')
+        self.categories.add_custom_category('expense', 'Ração', parent_name='Pets')
+
+        self.other = User(username="outro", password="hash", email="outro@example.com")
+        self.other.save()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def _snapshot(self, user):
+        rows = sorted((t.type, t.category, t.subcategory, t.amount, t.description, t.date)
+                      for t in TransactionController(user).get_transactions())
+        goals = [(g.title, g.target_amount, g.deadline, g.status) for g in GoalController(user).get_goals()]
+        conn = get_db_connection()
+        categories = sorted(conn.execute(
+            """
+            SELECT c.type, c.name, p.name FROM categories c
+            LEFT JOIN categories p ON p.id = c.parent_id WHERE c.user_id = ?
+            """,
+            (user.id,)
+        ).fetchall(), key=repr)
+        conn.close()
+        return rows, goals, categories
+
+    def test_round_trip_compressed(self):
+        """Testa backup e restauração em arquivos gzip, xz e texto"""
+        for name in ('backup.ndjson.gz', 'backup.ndjson.xz', 'backup.ndjson'):
+            path = os.path.join(self.temp_dir.name, name)
+            written = write_backup(self.transactions, self.goals, path)
+            self.assertEqual((written.transactions, written.goals), (3, 1))
+
+            restored = restore_backup(TransactionController(self.other), path, replace=True)
+            self.assertEqual((restored.transactions, restored.goals), (3, 1))
+            self.assertEqual(self._snapshot(self.other), self._snapshot(self.user))
+            self.assertIn('Pets', CategoryController(self.other).get_categories('expense'))
+
+    def test_file_is_one_record_per_line(self):
+        """Testa o formato NDJSON: cabeçalho e um registro por linha"""
+        path = os.path.join(self.temp_dir.name, 'backup.ndjson')
+        write_backup(self.transactions, self.goals, path)
+        with open_backup(path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[0]['format'], 'fin-assist-backup')
+        self.assertEqual([line['kind'] for line in lines[1:]], ['category'] * 5 + ['goal'] + ['transaction'] * 3)
+        self.assertEqual(lines[5], {'kind': 'category', 'type': 'expense', 'name': 'Ração', 'parent': 'Pets'})
+
+    def test_merge_and_replace(self):
+        """Testa restaurar somando aos dados atuais ou substituindo-os"""
+        stream = io.StringIO()
+        write_backup(self.transactions, self.goals, stream)
+
+        stream.seek(0)
+        restore_backup(self.transactions, stream)
+        self.assertEqual(len(self.transactions.get_transactions()), 6)
+
+        stream.seek(0)
+        restore_backup(self.transactions, stream, replace=True)
+        self.assertEqual(len(self.transactions.get_transactions()), 3)
+        self.assertEqual(len(self.goals.get_goals()), 1)
+        self.assertEqual(self.transactions.get_balance(), 3000.0 - 900.0 - 35.5)
+
+    def test_invalid_line_rolls_back(self):
+        """Testa se uma linha inválida desfaz a restauração inteira"""
+        stream = io.StringIO()
+        write_backup(self.transactions, self.goals, stream)
+        broken = io.StringIO(stream.getvalue() + '{"kind": "transaction", "type": \n')
+
+        with self.assertRaises(ValueError):
+            restore_backup(TransactionController(self.other), broken, batch_size=1)
+        self.assertEqual(self._snapshot(self.other), ([], [], []))
+
+    def test_legacy_json_backup(self):
+        """Testa a leitura do backup JSON antigo"""
+        legacy = io.StringIO(json.dumps({
+            'user_id': 1, 'export_date': '2025-01-01',
+            'transactions': [{'id': 1, 'type': 'income', 'category': 'Salário', 'subcategory': None,
+                              'amount': 10.0, 'description': None, 'date': '2025-01-01'}],
+            'goals': [{'id': 1, 'title': 'Meta', 'target_amount': 100.0, 'current_amount': 0,
+                       'deadline': '2030-01-01', 'status': 'active'}],
+        }, indent=2))
+        self.assertEqual([kind for kind, _ in read_backup(legacy)], ['goal', 'transaction'])
+
+    def test_legacy_category_placeholder_becomes_category(self):
+        """Testa se a transação-sentinela do backup antigo vira categoria, não despesa"""
+        legacy = io.StringIO(json.dumps({
+            'user_id': 1, 'export_date': '2025-01-01',
+            'transactions': [
+                {'id': 1, 'type': 'expense', 'category': 'Pets', 'subcategory': '',
+                 'amount': 0.01, 'description': 'Categoria personalizada', 'date': '2025-01-01'},
+                {'id': 2, 'type': 'expense', 'category': 'Lazer', 'subcategory': None,
+                 'amount': 10.0, 'description': None, 'date': '2025-01-02'},
+            ],
+            'goals': [],
+        }))
+        other = TransactionController(self.other)
+        result = restore_backup(other, legacy)
+
+        self.assertEqual(result.transactions, 1)
+        self.assertEqual(other.get_balance(), -10.0)
+        self.assertIn('Pets', CategoryController(self.other).get_categories('expense'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db, get_db_connection
+from src.controllers.category_controller import CategoryController, invalidate_category_cache
+from src.controllers.transaction_controller import TransactionController
+
+class TestCategoryController(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        init_db()
+        invalidate_category_cache()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.controller = CategoryController(self.user)
+        self.transactions = TransactionController(self.user)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+        invalidate_category_cache()
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def test_add_custom_category(self):
+        """Testa se a categoria é gravada sem criar transações"""
+        self.assertTrue(self.controller.add_custom_category('expense', 'Pets'))
+        self.assertIn('Pets', self.controller.get_categories('expense'))
+
+        conn = get_db_connection()
+        count = conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        conn.close()
+        self.assertEqual(count, 0)
+
+    def test_add_duplicate_category(self):
+        """Testa se uma categoria repetida é recusada"""
+        self.assertTrue(self.controller.add_custom_category('expense', 'Pets'))
+        self.assertFalse(self.controller.add_custom_category('expense', ' Pets '))
+        self.assertFalse(self.controller.add_custom_category('expense', '  '))
+        self.assertEqual(self.controller.get_categories('expense').count('Pets'), 1)
+
+    def test_subcategory(self):
+        """Testa categorias filhas"""
+        self.controller.add_custom_category('expense', 'Pets')
+        self.assertTrue(self.controller.add_custom_category('expense', 'Ração', parent_name='Pets'))
+        self.assertFalse(self.controller.add_custom_category('expense', 'Ração', parent_name='Inexistente'))
+        self.assertNotIn('Ração', self.controller.get_categories('expense'))
+
+    def test_defaults_included(self):
+        """Testa se as categorias padrão aparecem junto das personalizadas"""
+        categories = self.controller.get_categories('income')
+        self.assertIn('Salário', categories)
+        self.assertEqual(len(categories), len(set(categories)))
+
+    def test_transaction_category_invalidates_cache(self):
+        """Testa se categorias usadas em transações aparecem sem recarregar"""
+        self.assertNotIn('Academia', self.controller.get_categories('expense'))
+        self.transactions.add_transaction('expense', 'Academia', 90.0, date='2024-01-05')
+        self.assertIn('Academia', self.controller.get_categories('expense'))
+
+    def test_delete_custom_category(self):
+        """Testa a remoção de categorias com e sem transações"""
+        self.controller.add_custom_category('expense', 'Pets')
+        self.transactions.add_transaction('expense', 'Academia', 90.0, date='2024-01-05')
+
+        self.assertFalse(self.controller.delete_custom_category('expense', 'Academia'))
+        self.assertTrue(self.controller.delete_custom_category('expense', 'Pets'))
+        self.assertNotIn('Pets', self.controller.get_categories('expense'))
+
+    def test_category_stats(self):
+        """Testa as estatísticas por categoria"""
+        self.transactions.add_transaction('expense', 'Mercado', 100.0, date='2024-01-05')
+        self.transactions.add_transaction('expense', 'Mercado', 50.0, date='2024-02-05')
+        self.transactions.add_transaction('expense', 'Lazer', 30.0, date='2024-02-06')
+        self.controller.add_custom_category('expense', 'Pets')
+
+        stats = self.controller.get_category_stats('expense')
+        self.assertEqual(stats[0], {'category': 'Mercado', 'count': 2, 'total': 150.0})
+        self.assertEqual([s['category'] for s in stats], ['Mercado', 'Lazer'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.chart_generator import ChartGenerator, PieChart
+
+class FakeProvider:
+    """Fonte de dados agregados que registra os meses pedidos"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_month_type_totals(self, year, month):
+        self.calls.append(('totals', year, month))
+        return {'income': 500.0, 'expense': 200.0}
+
+    def get_expense_ranking(self, year, month, limit):
+        self.calls.append(('ranking', year, month, limit))
+        return [('Moradia', 150.0), ('Lazer', 50.0)][:limit]
+
+class TestChartGeneratorData(unittest.TestCase):
+
+    def test_any_month_from_provider(self):
+        """Testa se os dados de qualquer mês vêm já agregados do provedor"""
+        provider = FakeProvider()
+        chart_gen = ChartGenerator(provider)
+
+        totals = chart_gen.monthly_type_totals(2023, 7)
+        self.assertEqual(totals, {'income': 500.0, 'expense': 200.0, 'investment': 0.0})
+        self.assertEqual(chart_gen.expense_ranking(2023, 7, limit=1), [('Moradia', 150.0)])
+        self.assertEqual(provider.calls, [('totals', 2023, 7), ('ranking', 2023, 7, 1)])
+
+    def test_requires_provider(self):
+        """Testa o erro ao pedir dados sem provedor"""
+        with self.assertRaises(ValueError):
+            ChartGenerator().monthly_type_totals()
+
+class TestPieChart(unittest.TestCase):
+
+    def setUp(self):
+        self.pie = PieChart()
+
+    def tearDown(self):
+        self.pie.close()
+
+    def test_wedges_updated_in_place(self):
+        """Testa se as mesmas fatias são reaproveitadas com novos ângulos"""
+        wedges = dict(self.pie.wedges)
+        self.assertTrue(self.pie.set_data({'income': 300.0, 'expense': 100.0, 'investment': 0.0}))
+
+        self.assertEqual((self.pie.wedges['income'].theta1, self.pie.wedges['income'].theta2), (0.0, 270.0))
+        self.assertEqual((self.pie.wedges['expense'].theta1, self.pie.wedges['expense'].theta2), (270.0, 360.0))
+        self.assertFalse(self.pie.wedges['investment'].get_visible())
+        self.assertEqual(self.pie.percents['income'].get_text(), '75.0%')
+
+        self.pie.set_data({'income': 100.0, 'expense': 100.0, 'investment': 200.0})
+        self.assertEqual(self.pie.wedges, wedges)
+        self.assertEqual(len(self.pie.ax.patches), 3)
+        self.assertTrue(self.pie.wedges['investment'].get_visible())
+        self.assertEqual(self.pie.wedges['investment'].theta2, 360.0)
+
+    def test_empty_month(self):
+        """Testa se um mês sem valores esconde todas as fatias"""
+        self.assertFalse(self.pie.set_data({'income': 0.0, 'expense': 0.0, 'investment': 0.0}))
+        self.assertFalse(any(w.get_visible() for w in self.pie.wedges.values()))
+        self.assertIsNone(ChartGenerator().create_pie_chart({'income': 0.0}, None))
+
+    def test_no_global_pyplot_figures(self):
+        """Testa se o gráfico não registra figuras no pyplot"""
+        import matplotlib.pyplot as plt
+        before = plt.get_fignums()
+        PieChart().close()
+        self.assertEqual(plt.get_fignums(), before)
+
+if __name__ == '__main__':
+    unittest.main()
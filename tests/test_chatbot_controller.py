@@ -0,0 +1,184 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.controllers.chatbot_controller import ChatbotController
+from src.controllers.transaction_controller import TransactionController
+from src.controllers.goal_controller import GoalController
+from src.database.database import init_db, get_data_version
+from src.models.user import User
+
+class FakeChat:
+    """Sessão de chat falsa que devolve a resposta em pedaços"""
+
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.last = None
+        self.rewound = 0
+
+    def send_message(self, message, stream=False):
+        def generate():
+            for i, text in enumerate(self.chunks):
+                if self.fail_after is not None and i >= self.fail_after:
+                    raise RuntimeError("conexão perdida")
+                yield SimpleNamespace(text=text)
+        self.last = object()
+        return generate()
+
+    def rewind(self):
+        self.last = None
+        self.rewound += 1
+
+class TestChatbotStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = ChatbotController()
+        self.controller.chat = FakeChat(["Olá", ", tudo", " bem?"])
+
+    def test_stream_yields_chunks(self):
+        """Testa se a resposta chega em pedaços e completa o histórico"""
+        chunks = list(self.controller.stream_response("como economizar?"))
+        self.assertEqual(chunks, ["Olá", ", tudo", " bem?"])
+        self.assertEqual(self.controller.chat.rewound, 0)
+
+    def test_get_response_joins_stream(self):
+        """Testa se get_response continua devolvendo o texto completo"""
+        self.assertEqual(self.controller.get_response("como economizar?"), "Olá, tudo bem?")
+
+    def test_cancel_discards_exchange(self):
+        """Testa se o cancelamento interrompe e limpa a troca incompleta"""
+        received = []
+        for chunk in self.controller.stream_response("como economizar?", is_cancelled=lambda: len(received) >= 1):
+            received.append(chunk)
+        self.assertEqual(received, ["Olá"])
+        self.assertEqual(self.controller.chat.rewound, 1)
+
+    def test_error_before_first_chunk_uses_fallback(self):
+        """Testa a resposta local quando o Gemini falha antes de responder"""
+        self.controller.chat = FakeChat(["nunca"], fail_after=0)
+        chunks = list(self.controller.stream_response("como economizar?"))
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0], self.controller._get_fallback_response("como economizar?"))
+        self.assertEqual(self.controller.chat.rewound, 1)
+
+    def test_without_gemini_is_single_chunk(self):
+        """Testa se a resposta local (sem Gemini) vem em um único pedaço"""
+        self.controller.chat = None
+        chunks = list(self.controller.stream_response("oi"))
+        self.assertEqual(len(chunks), 1)
+
+class TestChatbotStartup(unittest.TestCase):
+
+    def test_setup_is_deferred_and_off_thread(self):
+        """Testa se o Gemini só é configurado no start(), fora da thread chamadora"""
+        calls = []
+        release = threading.Event()
+        controller = ChatbotController()
+
+        def fake_setup():
+            calls.append(threading.current_thread())
+            release.wait(2)
+            controller.chat = FakeChat(["pronto"])
+        controller.setup_gemini = fake_setup
+
+        self.assertEqual(calls, [])
+        self.assertFalse(controller.ready)
+
+        ready = controller.start()
+        self.assertIs(controller.start(), ready)
+        self.assertFalse(ready.done())
+        release.set()
+
+        self.assertTrue(ready.result(2))
+        self.assertTrue(controller.ready)
+        self.assertEqual(len(calls), 1)
+        self.assertIsNot(calls[0], threading.current_thread())
+
+    def test_response_waits_for_setup(self):
+        """Testa se a primeira resposta espera a configuração e usa o chat pronto"""
+        controller = ChatbotController()
+        controller.setup_gemini = lambda: setattr(controller, 'chat', FakeChat(["Oi!"]))
+        self.assertEqual(controller.get_response("como economizar?"), "Oi!")
+
+    def test_without_key_is_not_ready(self):
+        """Testa se, sem chave de API, o futuro resolve para False"""
+        controller = ChatbotController()
+        controller.api_key = None
+        self.assertFalse(controller.wait_ready(2))
+        self.assertIsNone(controller.chat)
+
+class TestChatbotContextCache(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        init_db()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.transactions = TransactionController(self.user)
+        self.goals = GoalController(self.user)
+        self.controller = ChatbotController(self.user, self.transactions, self.goals)
+
+        # Conta quantas vezes o contexto é realmente recalculado
+        self.builds = 0
+        original_build = self.controller._build_user_financial_data
+        def counting_build():
+            self.builds += 1
+            return original_build()
+        self.controller._build_user_financial_data = counting_build
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def test_context_reused_until_data_changes(self):
+        """Testa se o contexto só é recalculado após uma escrita"""
+        first = self.controller._get_user_financial_data()
+        self.assertEqual(self.controller._get_user_financial_data(), first)
+        self.assertEqual(self.builds, 1)
+
+        self.transactions.add_transaction('income', 'Salário', 1000.0, date=datetime.now().strftime('%Y-%m-%d'))
+        updated = self.controller._get_user_financial_data()
+        self.assertEqual(self.builds, 2)
+        self.assertIn('R$ 1000.00', updated)
+
+        self.goals.add_goal('Viagem', 5000.0, '2030-01-01')
+        self.assertIn('Metas ativas: 1', self.controller._get_user_financial_data())
+        self.assertEqual(self.builds, 3)
+
+    def test_goal_writes_bump_version(self):
+        """Testa se inserir, alterar e excluir metas muda a versão dos dados"""
+        versions = [get_data_version(self.user.id)]
+        self.goals.add_goal('Viagem', 5000.0, '2030-01-01')
+        versions.append(get_data_version(self.user.id))
+        goal = self.goals.get_goals()[0]
+        self.goals.update_goal(goal.id, 'Viagem longa', 6000.0, '2030-01-01')
+        versions.append(get_data_version(self.user.id))
+        self.goals.delete_goal(goal.id)
+        versions.append(get_data_version(self.user.id))
+
+        self.assertEqual(len(set(versions)), 4)
+
+if __name__ == '__main__':
+    unittest.main()
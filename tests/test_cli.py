@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import io
+import subprocess
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db
+from src.controllers.transaction_controller import TransactionController
+from src.utils.benchmark import write_sample_csv
+from fin_assist.cli import main
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'cli.db')
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.db_path
+
+        init_db()
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+    def run_cli(self, *argv):
+        """Executa a CLI no banco do teste; retorna (código, saída, erros)"""
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = main(['--db', self.db_path, *argv])
+        return code, out.getvalue(), err.getvalue()
+
+    def path(self, name):
+        return os.path.join(self.temp_dir.name, name)
+
+    def test_import_export_and_stats(self):
+        """Testa importação, exportação e resumo pela linha de comando"""
+        write_sample_csv(self.path('amostra.csv'), 50)
+
+        code, out, _ = self.run_cli('import', 'testuser', self.path('amostra.csv'))
+        self.assertEqual(code, 0)
+        self.assertIn("Importadas 50 de 50", out)
+
+        code, out, _ = self.run_cli('export', 'testuser', self.path('export.csv'))
+        self.assertEqual(code, 0)
+        with open(self.path('export.csv'), encoding='utf-8') as f:
+            self.assertEqual(sum(1 for _ in f), 51)
+
+        balance = TransactionController(self.user).get_balance()
+        code, out, _ = self.run_cli('stats', 'testuser')
+        self.assertEqual(code, 0)
+        self.assertIn(f"Saldo: R$ {balance:.2f}", out)
+
+    def test_backup_restore_and_reindex(self):
+        """Testa backup, restauração com substituição e reindexação"""
+        TransactionController(self.user).add_transaction('income', 'Salário', 1000.0, date='2025-01-05')
+
+        self.assertEqual(self.run_cli('backup', 'testuser', self.path('b.ndjson.gz'))[0], 0)
+        code, out, _ = self.run_cli('backup', 'testuser', self.path('b.ndjson.gz'), '--restore', '--replace')
+        self.assertEqual(code, 0)
+        self.assertIn("Restauradas 1 transações", out)
+
+        code, out, _ = self.run_cli('reindex')
+        self.assertEqual(code, 0)
+        self.assertIn("0 corrigido(s)", out)
+        self.assertEqual(TransactionController(self.user).get_balance(), 1000.0)
+
+    def test_errors(self):
+        """Testa os códigos de saída de usuário inexistente e arquivo ausente"""
+        code, _, err = self.run_cli('export', 'ninguem', self.path('x.csv'))
+        self.assertEqual(code, 2)
+        self.assertIn("Usuário não encontrado", err)
+
+        code, _, err = self.run_cli('import', 'testuser', self.path('nao_existe.csv'))
+        self.assertEqual(code, 1)
+
+    def test_cli_does_not_import_tk(self):
+        """Testa se a CLI não carrega customtkinter, tkinter nem o backend Tk"""
+        root = os.path.join(os.path.dirname(__file__), '..')
+        code = ("import sys, runpy; sys.argv = ['fin_assist', '--db', sys.argv[1], 'stats']\n"
+                "try:\n    runpy.run_module('fin_assist', run_name='__main__')\n"
+                "except SystemExit:\n    pass\n"
+                "print(sorted(m for m in ('tkinter', 'customtkinter', 'matplotlib') if m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code, self.db_path], cwd=root,
+                                capture_output=True, text=True)
+        self.assertEqual(output.stdout.strip().splitlines()[-1], '[]', output.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
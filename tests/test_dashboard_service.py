@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db
+from src.controllers.transaction_controller import TransactionController
+from src.controllers.goal_controller import GoalController
+from src.services.dashboard_service import DashboardService
+
+class TestDashboardService(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        init_db()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.transactions = TransactionController(self.user)
+        self.service = DashboardService(self.user)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def test_empty_snapshot(self):
+        """Testa o snapshot de um usuário sem dados"""
+        snapshot = self.service.get_snapshot(2024, 3)
+        self.assertEqual(snapshot.balance, 0)
+        self.assertEqual(snapshot.month_totals, {'income': 0.0, 'expense': 0.0, 'investment': 0.0})
+        self.assertEqual(snapshot.top_expenses, [])
+        self.assertEqual(snapshot.goals, [])
+
+    def test_snapshot_figures(self):
+        """Testa totais gerais, do mês, ranking e metas"""
+        self.transactions.add_transactions_bulk([
+            ('income', 'Salário', 5000.0, None, '2024-03-05', None),
+            ('expense', 'Moradia', 1500.0, None, '2024-03-10', 'Aluguel'),
+            ('expense', 'Alimentação', 300.0, None, '2024-03-31 23:59:59', None),
+            ('expense', 'Alimentação', 200.0, None, '2024-03-15', None),
+            ('investment', 'CDB', 400.0, None, '2024-03-20', None),
+            ('expense', 'Lazer', 999.0, None, '2024-04-01', None),
+        ])
+        goals = GoalController(self.user)
+        goals.add_goal('Viagem', 1000.0, '2024-12-31')
+        goals.add_goal('Reserva', 500.0, '2024-06-30')
+
+        snapshot = self.service.get_snapshot(2024, 3)
+
+        self.assertEqual(snapshot.year_month, '2024-03')
+        self.assertAlmostEqual(snapshot.totals['expense'], 2999.0)
+        self.assertAlmostEqual(snapshot.balance, 2001.0)
+        self.assertEqual(snapshot.month_totals, {'income': 5000.0, 'expense': 2000.0, 'investment': 400.0})
+        self.assertEqual(snapshot.top_expenses, [('Moradia / Aluguel', 1500.0), ('Alimentação', 500.0)])
+        # Mesma ordem de GoalController.get_goals: prazo mais próximo primeiro
+        self.assertEqual([g.title for g in snapshot.goals], ['Reserva', 'Viagem'])
+
+    def test_top_expenses_limit(self):
+        """Testa o limite do ranking"""
+        self.transactions.add_transactions_bulk(
+            ('expense', f'Cat{i}', float(i + 1), None, '2024-03-05', None) for i in range(12)
+        )
+        snapshot = self.service.get_snapshot(2024, 3, top_limit=3)
+        self.assertEqual([label for label, _ in snapshot.top_expenses], ['Cat11', 'Cat10', 'Cat9'])
+
+if __name__ == '__main__':
+    unittest.main()
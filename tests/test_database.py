@@ -7,7 +7,10 @@ import sqlite3
 # Adiciona o diretório raiz ao path para importar módulos
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.database.database import init_db, get_db_connection
+import threading
+
+from src.database.database import init_db, get_db_connection, ConnectionPool, PooledConnection
+from src.database.migrations import MIGRATIONS, LATEST_VERSION, Migration, get_schema_version, migrate
 
 class TestDatabase(unittest.TestCase):
     
@@ -29,10 +32,13 @@ class TestDatabase(unittest.TestCase):
         """Limpeza após cada teste"""
         # Restaura o caminho original do banco
         import src.database.database as db_module
+        db_module.close_all_connections()
         db_module.DB_PATH = self.original_db_path
         
-        # Remove o arquivo temporário
-        os.unlink(self.temp_db.name)
+        # Remove o arquivo temporário (e os arquivos auxiliares do WAL)
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
     
     def test_database_initialization(self):
         """Testa se o banco é inicializado corretamente"""
@@ -132,5 +138,223 @@ class TestDatabase(unittest.TestCase):
         
         conn.close()
 
+class TestConnectionPool(unittest.TestCase):
+    
+    def setUp(self):
+        """Cria um banco temporário e um pool dedicado"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'pool.db')
+        self.pool = ConnectionPool(self.db_path, size=2)
+    
+    def tearDown(self):
+        self.pool.close_all()
+        self.temp_dir.cleanup()
+    
+    def test_pragmas_applied(self):
+        """Testa se WAL, synchronous e cache são configurados na abertura"""
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 1)  # 1 = NORMAL
+            self.assertLess(conn.execute("PRAGMA cache_size").fetchone()[0], 0)
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+    
+    def test_connection_reused(self):
+        """Testa se a mesma conexão é reaproveitada após ser devolvida"""
+        first = self.pool.acquire()
+        self.pool.release(first)
+        second = self.pool.acquire()
+        self.pool.release(second)
+        self.assertIs(first, second)
+    
+    def test_nested_acquire_same_thread(self):
+        """Testa se chamadas aninhadas na mesma thread recebem a mesma conexão"""
+        outer = self.pool.acquire()
+        inner = self.pool.acquire()
+        self.assertIs(outer, inner)
+        self.pool.release(inner)
+        self.pool.release(outer)
+    
+    def test_threads_get_distinct_connections(self):
+        """Testa se threads simultâneas recebem conexões diferentes"""
+        main_conn = self.pool.acquire()
+        result = {}
+        
+        def worker():
+            conn = self.pool.acquire()
+            result['conn'] = conn
+            self.pool.release(conn)
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        self.pool.release(main_conn)
+        
+        self.assertIsNot(result['conn'], main_conn)
+    
+    def test_context_manager_commit_and_rollback(self):
+        """Testa commit ao sair normalmente e rollback em caso de exceção"""
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise ValueError("falha")
+        
+        with self.pool.connection() as conn:
+            rows = conn.execute("SELECT v FROM t").fetchall()
+        self.assertEqual(rows, [(1,)])
+    
+    def test_close_without_commit_discards(self):
+        """Testa se devolver a conexão sem commit descarta a transação"""
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+        
+        pooled = PooledConnection(self.pool, self.pool.acquire())
+        pooled.execute("INSERT INTO t VALUES (1)")
+        pooled.close()
+        pooled.close()  # fechar duas vezes não deve falhar
+        
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+
+    def test_release_from_other_thread_frees_slot(self):
+        """Testa se devolver a conexão em outra thread libera a vaga do pool"""
+        pool = ConnectionPool(self.db_path, size=1)
+        borrowed = {}
+        
+        def worker():
+            borrowed['conn'] = PooledConnection(pool, pool.acquire())
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        borrowed['conn'].close()  # Ex.: gerador finalizado na thread principal
+        
+        self.assertTrue(pool._slots.acquire(timeout=0.5))
+        pool._slots.release()
+        self.assertEqual(pool.depth(borrowed['conn'].raw), 0)
+        pool.close_all()
+    
+    def test_nested_context_keeps_outer_transaction(self):
+        """Testa se o bloco aninhado não confirma nem desfaz a transação externa"""
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (v INTEGER)")
+        
+        with self.assertRaises(ValueError):
+            with self.pool.connection() as outer:
+                outer.execute("INSERT INTO t VALUES (1)")
+                with self.pool.connection() as inner:
+                    inner.execute("INSERT INTO t VALUES (2)")
+                self.assertTrue(outer.in_transaction)
+                raise ValueError("falha")
+        
+        with self.pool.connection() as outer:
+            outer.execute("INSERT INTO t VALUES (3)")
+            try:
+                with self.pool.connection() as inner:
+                    raise ValueError("falha interna")
+            except ValueError:
+                pass
+            self.assertTrue(outer.in_transaction)
+        
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT v FROM t").fetchall(), [(3,)])
+
+class TestMigrations(unittest.TestCase):
+    
+    def setUp(self):
+        """Cria um banco temporário vazio"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.temp_dir.name, 'migrations.db'))
+    
+    def tearDown(self):
+        self.conn.close()
+        self.temp_dir.cleanup()
+    
+    def test_fresh_database_reaches_latest_version(self):
+        """Testa se um banco novo é levado até a última versão"""
+        self.assertEqual(migrate(self.conn), LATEST_VERSION)
+        self.assertEqual(get_schema_version(self.conn), LATEST_VERSION)
+    
+    def test_migrate_is_noop_when_up_to_date(self):
+        """Testa se rodar de novo não reaplica nenhuma migração"""
+        migrate(self.conn)
+        calls = []
+        import src.database.migrations as migrations_module
+        original = migrations_module.MIGRATIONS
+        migrations_module.MIGRATIONS = [
+            Migration(m.version, m.description, lambda conn, v=m.version: calls.append(v))
+            for m in original
+        ]
+        try:
+            migrate(self.conn)
+        finally:
+            migrations_module.MIGRATIONS = original
+        self.assertEqual(calls, [])
+    
+    def test_legacy_database_without_subcategory(self):
+        """Testa a migração de um banco antigo sem a coluna subcategory"""
+        self.conn.execute('''
+            CREATE TABLE transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                category TEXT NOT NULL,
+                amount REAL NOT NULL,
+                description TEXT,
+                date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self.conn.execute("INSERT INTO transactions (user_id, type, category, amount) VALUES (1, 'income', 'Salário', 10)")
+        self.conn.commit()
+        
+        migrate(self.conn)
+        
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(transactions)")]
+        self.assertIn('subcategory', columns)
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0], 1)
+    
+    def test_failed_migration_is_rolled_back(self):
+        """Testa se uma migração com erro não altera o banco nem a versão"""
+        migrate(self.conn)
+        
+        def broken(conn):
+            conn.execute("CREATE TABLE temp_table (id INTEGER)")
+            conn.execute("INSERT INTO missing_table VALUES (1)")
+        
+        import src.database.migrations as migrations_module
+        original = migrations_module.MIGRATIONS
+        migrations_module.MIGRATIONS = original + [Migration(LATEST_VERSION + 1, "quebrada", broken)]
+        try:
+            with self.assertRaises(sqlite3.OperationalError):
+                migrate(self.conn, LATEST_VERSION + 1)
+        finally:
+            migrations_module.MIGRATIONS = original
+        
+        self.assertEqual(get_schema_version(self.conn), LATEST_VERSION)
+        tables = [row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        self.assertNotIn('temp_table', tables)
+    
+    def test_sentinel_categories_are_migrated(self):
+        """Testa se as transações-sentinela viram linhas da tabela categories"""
+        migrate(self.conn, 4)
+        self.conn.execute("INSERT INTO transactions (user_id, type, category, amount, description) VALUES (1, 'expense', 'Pets', 0.01, 'Categoria personalizada')")
+        self.conn.execute("INSERT INTO transactions (user_id, type, category, amount) VALUES (1, 'expense', 'Mercado', 80)")
+        self.conn.commit()
+
+        migrate(self.conn)
+
+        names = {row[0] for row in self.conn.execute("SELECT name FROM categories WHERE user_id = 1 AND type = 'expense'")}
+        self.assertEqual(names, {'Pets', 'Mercado'})
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0], 1)
+        total = self.conn.execute("SELECT expense FROM user_totals WHERE user_id = 1").fetchone()[0]
+        self.assertAlmostEqual(total, 80)
+
+    def test_versions_are_sequential(self):
+        """Testa se as migrações estão numeradas em sequência"""
+        self.assertEqual([m.version for m in MIGRATIONS], list(range(1, len(MIGRATIONS) + 1)))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+import io
+import subprocess
+import tempfile
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db
+from src.controllers.transaction_controller import TransactionController
+from src.controllers.goal_controller import GoalController
+from src.services.import_export import ImportExportService
+
+class TestImportExportService(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        init_db()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.transactions = TransactionController(self.user)
+        self.goals = GoalController(self.user)
+        self.service = ImportExportService(self.transactions, self.goals)
+
+        self.transactions.add_transactions_bulk([
+            ('income', 'Salário', 3000.0, 'Pagamento', '2025-01-05', None),
+            ('expense', 'Moradia', 900.0, 'Aluguel, janeiro', '2025-01-06', 'Aluguel'),
+        ])
+        self.goals.add_goal('Viagem', 5000.0, '2030-01-01')
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+        self.temp_dir.cleanup()
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def test_export_results(self):
+        """Testa as contagens e tempos devolvidos pelas exportações"""
+        path = os.path.join(self.temp_dir.name, 'transacoes.csv')
+        result = self.service.export_transactions_csv(path)
+        self.assertEqual((result.path, result.records), (path, 2))
+        self.assertGreaterEqual(result.elapsed, 0)
+
+        stream = io.StringIO()
+        result = self.service.export_goals_csv(stream)
+        self.assertEqual((result.path, result.records), (None, 1))
+        self.assertTrue(stream.getvalue().startswith('ID,Título'))
+
+    def test_csv_round_trip(self):
+        """Testa se o CSV exportado é importado de volta por outro usuário"""
+        path = os.path.join(self.temp_dir.name, 'transacoes.csv')
+        self.service.export_transactions_csv(path)
+
+        other = User(username="outro", password="hash", email="outro@example.com")
+        other.save()
+        other_service = ImportExportService(TransactionController(other), GoalController(other))
+        result = other_service.import_transactions_csv(path, batch_size=1)
+
+        self.assertEqual((result.imported, result.errors), (2, []))
+        self.assertEqual(other_service.transaction_controller.get_balance(), 2100.0)
+
+        # Importar de novo não duplica nada
+        self.assertEqual(other_service.import_transactions_csv(path).duplicates, 2)
+
+    def test_backup_and_restore(self):
+        """Testa backup e restauração pelo serviço"""
+        path = os.path.join(self.temp_dir.name, 'backup.ndjson.gz')
+        self.assertEqual(self.service.backup(path).transactions, 2)
+        result = self.service.restore(path, replace=True)
+        self.assertEqual((result.transactions, result.goals), (2, 1))
+
+    def test_service_does_not_need_tk(self):
+        """Testa se o serviço pode ser usado sem tkinter (servidores sem tela)"""
+        root = os.path.join(os.path.dirname(__file__), '..')
+        code = "import sys, src.services.import_export; print('tkinter' in sys.modules)"
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True)
+        self.assertEqual(output.stdout.strip(), 'False', output.stderr)
+
+if __name__ == '__main__':
+    unittest.main()
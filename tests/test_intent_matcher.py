@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.config.settings import CHATBOT_INTENTS_FILE
+from src.utils.intent_matcher import IntentMatcher, IntentMatch, fold_text
+
+class TestIntentMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = IntentMatcher([
+            ('debt', ['sair do vermelho', 'dívida']),
+            ('investment', ['investir', 'ação', 'tesouro direto']),
+            ('budget', ['orçamento', 'gasto']),
+        ])
+
+    def test_fold_text(self):
+        """Testa a remoção de acentos e maiúsculas"""
+        self.assertEqual(fold_text("Orçamento DÍVIDA"), "orcamento divida")
+
+    def test_match_ignores_accents_and_case(self):
+        """Testa se variações com e sem acento casam com a mesma frase"""
+        for message in ["Como fazer um ORCAMENTO?", "meu orçamento", "Orçamento"]:
+            self.assertEqual(self.matcher.match(message), IntentMatch('budget', ['orçamento']))
+
+    def test_priority_and_evidence(self):
+        """Testa se vence a intenção de maior prioridade, com todas as suas frases"""
+        match = self.matcher.match("quero investir para sair do vermelho e pagar a divida")
+        self.assertEqual(match.intent, 'debt')
+        self.assertEqual(match.evidence, ['sair do vermelho', 'dívida'])
+
+    def test_phrases_start_at_word_boundary(self):
+        """Testa se a frase precisa começar uma palavra, mas pode terminar no meio"""
+        self.assertIsNone(self.matcher.match("renegociação"))
+        self.assertEqual(self.matcher.match("meus gastos").intent, 'budget')
+        self.assertEqual(self.matcher.match("uma ação da bolsa").intent, 'investment')
+
+    def test_overlapping_phrases(self):
+        """Testa frases que são sufixo ou prefixo de outras"""
+        matcher = IntentMatcher([('a', ['tesouro direto']), ('b', ['direto', 'tes'])])
+        self.assertEqual(matcher.find_all("tesouro direto"), [2, 0, 1])
+        self.assertEqual(matcher.match("tesouro direto").intent, 'a')
+
+    def test_no_match(self):
+        """Testa mensagem sem nenhuma frase conhecida"""
+        self.assertIsNone(self.matcher.match("bom dia"))
+        self.assertEqual(self.matcher.find_all(""), [])
+
+    def test_intents_file(self):
+        """Testa se o arquivo de intenções tem resposta para toda intenção"""
+        matcher, responses, default_response = IntentMatcher.from_file(CHATBOT_INTENTS_FILE)
+        self.assertEqual(set(matcher.intents), set(responses))
+        self.assertTrue(default_response)
+        self.assertEqual(matcher.match("como sair do vermelho?").intent, 'debt')
+        self.assertEqual(matcher.match("quero montar orcamento").intent, 'budget')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.transaction import Transaction, parse_db_date, format_display_date
+from src.models.goal import Goal
+
+class TestTransactionRecord(unittest.TestCase):
+
+    def test_tuple_compatibility(self):
+        """Testa se o registro continua acessível por índice e comparável a tuplas"""
+        t = Transaction(1, 2, 'expense', 'Lazer', None, 25.5, 'Cinema', '2025-03-10')
+        self.assertEqual(t[2], 'expense')
+        self.assertEqual(t.amount, t[5])
+        self.assertEqual(t, (1, 2, 'expense', 'Lazer', None, 25.5, 'Cinema', '2025-03-10'))
+
+    def test_no_instance_dict(self):
+        """Testa se o registro não carrega __dict__ por instância"""
+        t = Transaction(1, 2, 'income', 'Salário', None, 10, None, '2025-01-01')
+        self.assertFalse(hasattr(t, '__dict__'))
+
+    def test_lazy_conversions(self):
+        """Testa as conversões de data e valor"""
+        t = Transaction(1, 2, 'income', 'Salário', None, '10.5', None, '2025-01-31 10:00:00')
+        self.assertEqual(t.value, 10.5)
+        self.assertEqual(t.parsed_date, datetime(2025, 1, 31, 10, 0, 0))
+        self.assertEqual(t.date_display, '31-01-2025')
+
+    def test_invalid_values(self):
+        """Testa valores inválidos ou nulos"""
+        t = Transaction(1, 2, 'income', 'Salário', None, 'abc', None, None)
+        self.assertEqual(t.value, 0.0)
+        self.assertIsNone(t.parsed_date)
+        self.assertEqual(t.date_display, '')
+        self.assertIsNone(parse_db_date('31/01/2025'))
+        self.assertEqual(format_display_date('2025-02-03'), '03-02-2025')
+
+class TestGoalRecord(unittest.TestCase):
+
+    def test_progress_and_deadline(self):
+        """Testa o cálculo de progresso e formatação do prazo"""
+        g = Goal(1, 2, 'Viagem', 2000.0, 500.0, '2025-12-31', 'active')
+        self.assertEqual(g.progress, 25.0)
+        self.assertEqual(g.deadline_display, '31-12-2025')
+        self.assertEqual(g[2], 'Viagem')
+
+    def test_zero_target(self):
+        """Testa meta com valor alvo zero ou prazo vazio"""
+        g = Goal(1, 2, 'Vazia', 0, None, None, 'active')
+        self.assertEqual(g.progress, 0)
+        self.assertEqual(g.deadline_display, '')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import re
+import tempfile
+from types import SimpleNamespace
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from reportlab.platypus import Table
+from src.models.transaction import Transaction
+from src.utils.pdf_generator import PDFGenerator
+
+def make_transactions(count):
+    """Gera transações sintéticas (despesas de R$ 10,00)"""
+    for i in range(count):
+        yield Transaction(i, 1, 'expense', 'Lazer', None, 10.0, f'Item {i}', f'2025-01-{i % 28 + 1:02d}')
+
+class TestPDFGenerator(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.temp_dir.name, 'relatorio.pdf')
+        self.generator = PDFGenerator(SimpleNamespace(username='testuser'))
+
+        # Registra as tabelas de transações geradas
+        self.tables = []
+        original = self.generator._create_transactions_table
+        def record(rows):
+            table = original(rows)
+            self.tables.append(table)
+            return table
+        self.generator._create_transactions_table = record
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        self.temp_dir.cleanup()
+
+    def page_count(self):
+        with open(self.output, 'rb') as f:
+            return len(re.findall(rb'/Type /Page\b', f.read()))
+
+    def test_lists_every_transaction_one_table_per_page(self):
+        """Testa se todas as transações são listadas, uma tabela por página"""
+        self.generator.generate_financial_report(make_transactions(500), [], self.output,
+                                                 totals={'income': 0.0, 'expense': 5000.0})
+
+        self.assertEqual(sum(len(t._cellvalues) - 1 for t in self.tables), 500)
+        self.assertTrue(all(isinstance(t, Table) and t.repeatRows == 1 for t in self.tables))
+        # Resumo e metas na primeira página, depois uma página por tabela
+        self.assertEqual(self.page_count(), len(self.tables) + 1)
+
+    def test_limit_and_streaming(self):
+        """Testa o limite de transações e o consumo do iterador sob demanda"""
+        consumed = []
+        def transactions():
+            for t in make_transactions(10000):
+                consumed.append(t.id)
+                yield t
+
+        self.generator.generate_financial_report(transactions(), [], self.output,
+                                                 totals={'income': 0.0, 'expense': 0.0}, max_transactions=100)
+
+        self.assertEqual(sum(len(t._cellvalues) - 1 for t in self.tables), 100)
+        # Só uma transação além do limite é lida (para o aviso)
+        self.assertEqual(len(consumed), 101)
+
+    def test_totals_from_list_and_empty_report(self):
+        """Testa o resumo calculado da lista e o relatório sem transações"""
+        self.generator.generate_financial_report([], [], self.output)
+        self.assertEqual(self.tables, [])
+        self.assertEqual(self.page_count(), 1)
+
+        self.assertEqual(PDFGenerator._sum_totals(list(make_transactions(3)))['expense'], 30.0)
+
+if __name__ == '__main__':
+    unittest.main()
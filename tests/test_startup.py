@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.startup import prewarm, measure_imports, startup_report
+
+class TestStartup(unittest.TestCase):
+
+    def test_heavy_modules_not_imported_at_startup(self):
+        """Testa se Gemini, matplotlib e reportlab ficam fora da partida"""
+        report, heavy = startup_report('main')
+        self.assertEqual(heavy, [], report)
+
+    def test_measure_imports(self):
+        """Testa a leitura da saída de -X importtime"""
+        entries = measure_imports('src.utils.intent_matcher')
+        names = [name for name, _, _, _ in entries]
+        self.assertIn('src.utils.intent_matcher', names)
+        for name, self_us, cumulative_us, depth in entries:
+            self.assertGreaterEqual(cumulative_us, self_us)
+            self.assertGreaterEqual(depth, 0)
+
+    def test_prewarm_ignores_missing_modules(self):
+        """Testa se a pré-carga importa o que existe e ignora o que falta"""
+        sys.modules.pop('colorsys', None)
+        thread = prewarm(['modulo_que_nao_existe', 'colorsys'])
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertIn('colorsys', sys.modules)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.task_runner import TaskRunner
+
+class FakeWidget:
+    """Simula o after() do Tk: os callbacks ficam guardados até pump()"""
+
+    def __init__(self):
+        self.scheduled = []
+        self.thread = threading.current_thread()
+
+    def after(self, ms, func):
+        self.scheduled.append(func)
+
+    def pump(self, timeout=2.0):
+        """Roda o laço de eventos até não haver mais nada agendado"""
+        deadline = time.monotonic() + timeout
+        while self.scheduled:
+            if time.monotonic() > deadline:
+                raise AssertionError("tarefas não terminaram a tempo")
+            func = self.scheduled.pop(0)
+            func()
+            time.sleep(0.001)
+
+class TestTaskRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.widget = FakeWidget()
+        self.runner = TaskRunner(self.widget, max_workers=2, poll_interval_ms=1)
+
+    def tearDown(self):
+        self.runner.shutdown(wait=True)
+
+    def test_result_delivered_on_tk_thread(self):
+        """Testa se o resultado chega ao callback na thread do Tk"""
+        results = []
+        worker_threads = []
+
+        def work(x):
+            worker_threads.append(threading.current_thread())
+            return x * 2
+
+        def done(value):
+            results.append((value, threading.current_thread()))
+
+        self.runner.submit(work, 21, on_success=done)
+        self.widget.pump()
+
+        self.assertEqual(results, [(42, self.widget.thread)])
+        self.assertNotEqual(worker_threads[0], self.widget.thread)
+        self.assertEqual(self.runner.pending, 0)
+
+    def test_error_delivered(self):
+        """Testa se exceções chegam ao on_error e o on_finally sempre roda"""
+        errors = []
+        finished = []
+
+        def work():
+            raise ValueError("falhou")
+
+        self.runner.submit(work, on_error=errors.append, on_finally=lambda: finished.append(True))
+        self.widget.pump()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], ValueError)
+        self.assertEqual(finished, [True])
+
+    def test_progress_and_cancellation(self):
+        """Testa progresso e cancelamento cooperativo"""
+        progress = []
+        results = []
+        finished = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def work(task):
+            task.report_progress(0.5)
+            started.set()
+            release.wait(2)
+            task.check_cancelled()
+            return "não deveria chegar"
+
+        task = self.runner.submit(work, with_task=True, on_success=results.append,
+                                  on_progress=progress.append, on_finally=lambda: finished.append(True))
+        started.wait(2)
+        self.widget.scheduled.pop(0)()  # Entrega o progresso já enfileirado
+        task.cancel()
+        release.set()
+        self.widget.pump()
+
+        self.assertEqual(progress, [0.5])
+        self.assertEqual(results, [])
+        self.assertEqual(finished, [True])
+        self.assertTrue(task.cancelled)
+
+    def test_polling_stops_when_idle(self):
+        """Testa se o after() deixa de ser agendado sem tarefas pendentes"""
+        self.runner.submit(lambda: None)
+        self.widget.pump()
+        self.assertEqual(self.widget.scheduled, [])
+
+    def test_pool_is_bounded(self):
+        """Testa se no máximo max_workers tarefas rodam ao mesmo tempo"""
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+        for _ in range(6):
+            self.runner.submit(work)
+        self.widget.pump()
+
+        self.assertEqual(peak[0], 2)
+
+    def test_submit_after_shutdown(self):
+        """Testa se o runner encerrado recusa novas tarefas"""
+        self.runner.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.runner.submit(lambda: None)
+
+if __name__ == '__main__':
+    unittest.main()
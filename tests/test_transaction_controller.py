@@ -0,0 +1,335 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db, get_db_connection, rebuild_monthly_totals
+from src.models.transaction import Transaction
+from src.controllers.transaction_controller import TransactionController, decode_page_cursor
+
+class TestTransactionController(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        # Cria um banco temporário para testes
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+
+        # Substitui temporariamente o caminho do banco
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        # Inicializa o banco de teste
+        init_db()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.controller = TransactionController(self.user)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        # Restaura o caminho original do banco
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+
+        # Remove o arquivo temporário (e os arquivos auxiliares do WAL)
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def _count(self):
+        conn = get_db_connection()
+        count = conn.execute("SELECT COUNT(*) FROM transactions WHERE user_id = ?", (self.user.id,)).fetchone()[0]
+        conn.close()
+        return count
+
+    def test_bulk_insert_dicts_and_tuples(self):
+        """Testa a inserção em lote com dicts e tuplas"""
+        rows = [
+            {'type': 'income', 'category': 'Salário', 'amount': 3000, 'date': '2025-01-05'},
+            ('expense', 'Moradia', 900.0, 'Aluguel', '2025-01-06', 'Aluguel'),
+        ]
+        inserted = self.controller.add_transactions_bulk(rows)
+
+        self.assertEqual(inserted, 2)
+        transactions = self.controller.get_transactions()
+        self.assertEqual(len(transactions), 2)
+        self.assertEqual(transactions[0][2:], ('expense', 'Moradia', 'Aluguel', 900.0, 'Aluguel', '2025-01-06'))
+        self.assertIsInstance(transactions[0], Transaction)
+        self.assertEqual(transactions[0].category, 'Moradia')
+
+    def test_bulk_insert_chunks_and_progress(self):
+        """Testa se o callback de progresso é chamado a cada lote"""
+        rows = (('expense', 'Lazer', i + 1, None, '2025-02-01', None) for i in range(25))
+        progress = []
+
+        inserted = self.controller.add_transactions_bulk(rows, chunk_size=10, progress_callback=progress.append)
+
+        self.assertEqual(inserted, 25)
+        self.assertEqual(progress, [10, 20, 25])
+        self.assertEqual(self._count(), 25)
+
+    def test_bulk_insert_rolls_back_on_error(self):
+        """Testa se um erro em qualquer lote desfaz toda a importação"""
+        rows = [('income', 'Salário', 100, None, '2025-01-01', None)] * 5
+        rows.append(('income', None, 100, None, '2025-01-01', None))  # categoria NOT NULL
+
+        with self.assertRaises(Exception):
+            self.controller.add_transactions_bulk(rows, chunk_size=2)
+
+        self.assertEqual(self._count(), 0)
+
+    def test_bulk_insert_default_date(self):
+        """Testa se linhas sem data recebem a data atual"""
+        self.controller.add_transactions_bulk([{'type': 'income', 'category': 'Vendas', 'amount': 10}])
+        self.assertIsNotNone(self.controller.get_transactions()[0][7])
+
+    def test_pagination_walks_all_rows_in_order(self):
+        """Testa se as páginas cobrem todas as linhas sem repetição"""
+        rows = [('expense', 'Lazer', i + 1, None, f'2025-03-{(i % 5) + 1:02d}', None) for i in range(23)]
+        self.controller.add_transactions_bulk(rows)
+
+        seen = []
+        page = self.controller.get_transactions_page(page_size=5)
+        pages = 1
+        while page.next_cursor:
+            seen.extend(page.rows)
+            page = self.controller.get_transactions_page(cursor=page.next_cursor, page_size=5)
+            pages += 1
+        seen.extend(page.rows)
+
+        self.assertEqual(pages, 5)
+        keys = [(t[7], t[0]) for t in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        self.assertEqual(len(set(keys)), 23)
+
+    def test_pagination_with_filters_and_null_dates(self):
+        """Testa a paginação com filtro de tipo e datas nulas no fim"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 100, None, '2025-01-10', None),
+            ('expense', 'Lazer', 50, None, '2025-01-11', None),
+            ('income', 'Vendas', 30, None, '2025-01-12', None),
+        ])
+        conn = get_db_connection()
+        conn.execute("INSERT INTO transactions (user_id, type, category, amount, date) VALUES (?, 'income', 'Outros', 5, NULL)", (self.user.id,))
+        conn.commit()
+        conn.close()
+
+        first = self.controller.get_transactions_page(page_size=2, type='income')
+        self.assertEqual([t[3] for t in first.rows], ['Vendas', 'Salário'])
+        second = self.controller.get_transactions_page(cursor=first.next_cursor, page_size=2, type='income')
+        self.assertEqual([t[3] for t in second.rows], ['Outros'])
+        self.assertIsNone(second.next_cursor)
+
+    def test_invalid_cursor(self):
+        """Testa se um cursor corrompido gera ValueError"""
+        with self.assertRaises(ValueError):
+            decode_page_cursor("nao-e-um-cursor")
+
+    def test_iter_transactions_matches_get_transactions(self):
+        """Testa se o gerador devolve as mesmas linhas, em blocos"""
+        rows = [('income', 'Vendas', i + 1, None, f'2025-04-{(i % 28) + 1:02d}', None) for i in range(30)]
+        self.controller.add_transactions_bulk(rows)
+
+        streamed = list(self.controller.iter_transactions(chunk_size=7))
+        self.assertEqual(streamed, self.controller.get_transactions())
+
+        filtered = list(self.controller.iter_transactions(start_date='2025-04-20', chunk_size=4))
+        self.assertTrue(filtered)
+        self.assertTrue(all(t[7] >= '2025-04-20' for t in filtered))
+
+    def test_iter_transactions_releases_connection_when_closed(self):
+        """Testa se fechar o gerador no meio devolve a conexão ao pool"""
+        self.controller.add_transactions_bulk([('income', 'Vendas', 1, None, '2025-01-01', None)] * 10)
+
+        gen = self.controller.iter_transactions(chunk_size=2)
+        next(gen)
+        gen.close()
+
+        import src.database.database as db_module
+        self.assertEqual(db_module.get_pool()._borrowed, {})
+
+    def _monthly_totals_snapshot(self):
+        conn = get_db_connection()
+        rows = conn.execute(
+            "SELECT year_month, type, category, ROUND(total, 2), count FROM monthly_totals WHERE user_id = ? ORDER BY 1, 2, 3",
+            (self.user.id,)
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def test_monthly_totals_follow_writes(self):
+        """Testa se os triggers mantêm monthly_totals em INSERT/UPDATE/DELETE"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 3000, None, '2025-01-05', None),
+            ('expense', 'Lazer', 100, None, '2025-01-10 20:00:00', None),
+            ('expense', 'Lazer', 50, None, '2025-01-31 10:00:00', None),
+            ('expense', 'Moradia', 900, None, '2025-02-01', None),
+        ])
+        self.assertEqual(self._monthly_totals_snapshot(), [
+            ('2025-01', 'expense', 'Lazer', 150.0, 2),
+            ('2025-01', 'income', 'Salário', 3000.0, 1),
+            ('2025-02', 'expense', 'Moradia', 900.0, 1),
+        ])
+
+        lazer = [t for t in self.controller.get_transactions() if t.category == 'Lazer']
+        self.controller.update_transaction(lazer[0].id, 'expense', 'Moradia', None, 75, None, '2025-02-03')
+        self.controller.delete_transaction(lazer[1].id)
+
+        self.assertEqual(self._monthly_totals_snapshot(), [
+            ('2025-01', 'income', 'Salário', 3000.0, 1),
+            ('2025-02', 'expense', 'Moradia', 975.0, 2),
+        ])
+
+    def test_rebuild_monthly_totals(self):
+        """Testa se o rebuild reconstrói os agregados a partir das transações"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 3000, None, '2025-01-05', None),
+            ('expense', 'Lazer', 100, None, '2025-03-10', None),
+        ])
+        expected = self._monthly_totals_snapshot()
+
+        conn = get_db_connection()
+        conn.execute("UPDATE monthly_totals SET total = 0")
+        conn.commit()
+        conn.close()
+
+        rebuild_monthly_totals(self.user.id)
+        self.assertEqual(self._monthly_totals_snapshot(), expected)
+
+    def test_summaries_read_from_aggregates(self):
+        """Testa os resumos mensais e por categoria"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 3000, None, '2025-02-05', None),
+            ('expense', 'Lazer', 100, None, '2025-02-28 23:00:00', None),
+            ('expense', 'Lazer', 40, None, '2025-03-01', None),
+        ])
+
+        summary = dict((row[0], (row[1], row[2])) for row in self.controller.get_monthly_summary(2025, 2))
+        self.assertEqual(summary, {'income': (3000.0, 1), 'expense': (100.0, 1)})
+
+        whole_months = self.controller.get_category_summary('2025-02-01', '2025-02-28')
+        self.assertEqual(whole_months, [('Lazer', 'expense', 100.0, 1), ('Salário', 'income', 3000.0, 1)])
+
+        partial = self.controller.get_category_summary('2025-02-10', '2025-03-15')
+        self.assertEqual(partial, [('Lazer', 'expense', 140.0, 2)])
+
+        totals = self.controller.get_totals_by_type()
+        self.assertEqual(totals, {'income': 3000.0, 'expense': 140.0, 'investment': 0.0})
+
+    def test_monthly_series_half_open_ranges(self):
+        """Testa a série mensal com meses curtos, horários no último dia e meses vazios"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 3000, None, '2024-12-31 23:59:59', None),
+            ('expense', 'Lazer', 100, None, '2025-02-28 10:00:00', None),
+            ('expense', 'Lazer', 40, None, '2025-03-01', None),
+            ('income', 'Vendas', 10, None, '2025-04-15', None),
+        ])
+
+        series = self.controller.get_monthly_series('2024-12', (2025, 3))
+
+        self.assertEqual([m['month'] for m in series], ['2024-12', '2025-01', '2025-02', '2025-03'])
+        self.assertEqual(series[0]['income'], 3000.0)
+        self.assertEqual(series[1]['count'], 0)
+        self.assertEqual(series[2]['expense'], 100.0)
+        self.assertEqual(series[3]['expense'], 40.0)
+
+        with self.assertRaises(ValueError):
+            self.controller.get_monthly_series('2025-03', '2025-01')
+
+    def test_end_date_includes_whole_last_day(self):
+        """Testa se o filtro de data final inclui transações com horário"""
+        self.controller.add_transactions_bulk([
+            ('expense', 'Lazer', 100, None, '2025-01-31 10:00:00', None),
+            ('expense', 'Lazer', 50, None, '2025-02-01', None),
+        ])
+        rows = self.controller.get_transactions(start_date='2025-01-01', end_date='2025-01-31')
+        self.assertEqual([t.amount for t in rows], [100.0])
+
+    def test_balance_cache_follows_writes(self):
+        """Testa se o saldo em cache acompanha inclusões, edições e exclusões"""
+        self.assertEqual(self.controller.get_balance(), 0)
+        self.controller.add_transaction('income', 'Salário', 3000, date='2025-01-05')
+        self.controller.add_transactions_bulk([
+            ('expense', 'Lazer', 200, None, '2025-01-10', None),
+            ('investment', 'CDB', 500, None, '2025-01-11', None),
+        ])
+        self.assertAlmostEqual(self.controller.get_balance(), 2800)
+
+        lazer = next(t for t in self.controller.get_transactions() if t.category == 'Lazer')
+        self.controller.update_transaction(lazer.id, 'expense', 'Lazer', None, 250, None, '2025-01-10')
+        self.assertAlmostEqual(self.controller.get_balance(), 2750)
+
+        self.controller.delete_transaction(lazer.id)
+        totals = self.controller.get_cached_totals()
+        self.assertAlmostEqual(totals['income'], 3000)
+        self.assertAlmostEqual(totals['expense'], 0)
+        self.assertAlmostEqual(totals['investment'], 500)
+        self.assertEqual(totals['count'], 2)
+        self.assertTrue(self.controller.verify_balance_cache()['ok'])
+
+    def test_balance_cache_version_increments(self):
+        """Testa se a versão muda a cada escrita"""
+        before = self.controller.get_cached_totals()['version']
+        self.controller.add_transaction('income', 'Salário', 10, date='2025-01-05')
+        self.assertGreater(self.controller.get_cached_totals()['version'], before)
+
+    def test_verify_balance_cache_repairs(self):
+        """Testa se a verificação detecta e corrige divergências"""
+        self.controller.add_transactions_bulk([('income', 'Salário', 100, None, '2025-01-05', None)])
+        conn = get_db_connection()
+        conn.execute("UPDATE user_totals SET income = 999 WHERE user_id = ?", (self.user.id,))
+        conn.commit()
+        conn.close()
+
+        result = self.controller.verify_balance_cache()
+        self.assertFalse(result['ok'])
+        self.assertEqual(result['actual']['income'], 100)
+        self.assertEqual(self.controller.get_balance(), 100)
+        self.assertTrue(self.controller.verify_balance_cache()['ok'])
+
+    def test_period_totals(self):
+        """Testa os totais de um período com data final inclusiva"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 100, None, '2025-01-05', None),
+            ('expense', 'Lazer', 30, None, '2025-01-31 22:00:00', None),
+            ('expense', 'Lazer', 50, None, '2025-02-01', None),
+        ])
+        totals = self.controller.get_period_totals('2025-01-01', '2025-01-31')
+        self.assertEqual(totals, {'income': 100.0, 'expense': 30.0, 'investment': 0.0, 'count': 2})
+        self.assertEqual(self.controller.get_period_totals()['count'], 3)
+
+    def test_month_aggregates_for_charts(self):
+        """Testa os totais por tipo e o ranking de despesas de um mês qualquer"""
+        self.controller.add_transactions_bulk([
+            ('income', 'Salário', 3000.0, None, '2024-02-05', None),
+            ('expense', 'Moradia', 900.0, None, '2024-02-06', 'Aluguel'),
+            ('expense', 'Alimentação', 200.0, None, '2024-02-07', None),
+            ('expense', 'Alimentação', 150.0, None, '2024-02-29 20:00', None),
+            ('expense', 'Moradia', 50.0, None, '2024-03-01', 'Aluguel'),
+        ])
+
+        totals = self.controller.get_month_type_totals(2024, 2)
+        self.assertEqual(totals['income'], 3000.0)
+        self.assertEqual(totals['expense'], 1250.0)
+
+        ranking = self.controller.get_expense_ranking(2024, 2)
+        self.assertEqual(ranking, [('Moradia / Aluguel', 900.0), ('Alimentação', 350.0)])
+        self.assertEqual(self.controller.get_expense_ranking(2024, 2, limit=1), [('Moradia / Aluguel', 900.0)])
+        self.assertEqual(self.controller.get_expense_ranking(2023, 12), [])
+
+    def test_expense_ranking_merges_empty_subcategories(self):
+        """Testa se subcategoria '' e None formam um único item do ranking"""
+        self.controller.add_transaction('expense', 'Alimentação', 100.0, date='2024-02-07', subcategory='')
+        self.controller.add_transactions_bulk([('expense', 'Alimentação', 50.0, None, '2024-02-08', None)])
+
+        self.assertEqual(self.controller.get_expense_ranking(2024, 2), [('Alimentação', 150.0)])
+
+if __name__ == '__main__':
+    unittest.main()
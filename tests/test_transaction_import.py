@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.user import User
+from src.database.database import init_db, get_db_connection
+from src.controllers.transaction_controller import TransactionController
+from src.services.transaction_import import (
+    TransactionImporter, ImportAborted, normalize_row, parse_amount, main
+)
+
+HEADER = "ID,Tipo,Categoria,Subcategoria,Valor,Descrição,Data\n"
+
+def csv_bytes(*lines):
+    return io.BytesIO((HEADER + "".join(line + "\n" for line in lines)).encode('utf-8'))
+
+class TestTransactionImport(unittest.TestCase):
+
+    def setUp(self):
+        """Configuração antes de cada teste"""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        self.temp_db.close()
+
+        import src.database.database as db_module
+        self.original_db_path = db_module.DB_PATH
+        db_module.DB_PATH = self.temp_db.name
+
+        init_db()
+
+        self.user = User(username="testuser", password="hash", email="test@example.com")
+        self.user.save()
+        self.controller = TransactionController(self.user)
+        self.importer = TransactionImporter(self.controller, batch_size=2)
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        import src.database.database as db_module
+        db_module.close_all_connections()
+        db_module.DB_PATH = self.original_db_path
+
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def _count(self):
+        conn = get_db_connection()
+        count = conn.execute("SELECT COUNT(*) FROM transactions WHERE user_id = ?", (self.user.id,)).fetchone()[0]
+        conn.close()
+        return count
+
+    def test_normalize_row(self):
+        """Testa a normalização de tipo, valor e data"""
+        record = normalize_row({'type': 'Receita', 'category': ' Salário ', 'amount': '1.234,56',
+                                'date': '05/01/2025', 'subcategory': '', 'description': ' '})
+        self.assertEqual(record, {'type': 'income', 'category': 'Salário', 'subcategory': None,
+                                  'amount': 1234.56, 'description': None, 'date': '2025-01-05'})
+        self.assertEqual(parse_amount('R$ 50,00'), 50.0)
+        for bad in ('abc', '-10', '0', 'nan'):
+            with self.assertRaises(ValueError):
+                parse_amount(bad)
+
+    def test_import_with_row_errors(self):
+        """Testa a importação com linhas inválidas no relatório de erros"""
+        progress = []
+        result = self.importer.import_csv(csv_bytes(
+            "1,income,Salário,,3000.0,Pagamento,05-01-2025",
+            "2,expense,Moradia,Aluguel,900,,2025-01-06",
+            "3,gasto,Lazer,,10,,06-01-2025",
+            "",
+            "4,expense,Lazer,,abc,,06-01-2025",
+            "5,investment,CDB,,500,,07-01-2025",
+        ), progress_callback=lambda fraction, imported: progress.append(imported))
+
+        self.assertEqual(result.imported, 3)
+        self.assertEqual(result.rows_read, 5)
+        self.assertEqual([e.line for e in result.errors], [4, 6])
+        self.assertEqual(progress, [2, 3])
+        self.assertEqual(self._count(), 3)
+        self.assertEqual(self.controller.get_month_type_totals(2025, 1)['expense'], 900.0)
+
+    def test_reimport_skips_existing_rows(self):
+        """Testa se reimportar o mesmo arquivo não duplica as transações"""
+        lines = ("1,expense,Café,,5,,05-01-2025", "2,expense,Café,,5,,05-01-2025")
+        self.assertEqual(self.importer.import_csv(csv_bytes(*lines)).imported, 2)
+
+        result = self.importer.import_csv(csv_bytes(*lines, "3,expense,Café,,5,,05-01-2025"))
+        self.assertEqual((result.imported, result.duplicates), (1, 2))
+        self.assertEqual(self._count(), 3)
+
+        result = TransactionImporter(self.controller, skip_duplicates=False).import_csv(csv_bytes(*lines))
+        self.assertEqual(result.imported, 2)
+
+    def test_abort_rolls_back(self):
+        """Testa se o excesso de erros desfaz os lotes já gravados"""
+        importer = TransactionImporter(self.controller, batch_size=1, max_errors=0)
+        with self.assertRaises(ImportAborted):
+            importer.import_csv(csv_bytes("1,income,Salário,,10,,05-01-2025",
+                                          "2,income,Salário,,10,,05-01-2025",
+                                          "3,income,,,10,,05-01-2025"))
+        self.assertEqual(self._count(), 0)
+
+    def test_missing_columns(self):
+        """Testa o erro quando faltam colunas obrigatórias"""
+        with self.assertRaises(ValueError):
+            self.importer.import_csv(io.BytesIO(b"Tipo,Categoria\nincome,x\n"))
+
+    def test_cli(self):
+        """Testa a importação pela linha de comando"""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as f:
+            f.write(HEADER + "1,income,Salário,,100,,05-01-2025\n")
+        try:
+            with open(os.devnull, 'w') as devnull:
+                stdout, sys.stdout = sys.stdout, devnull
+                try:
+                    self.assertEqual(main(['testuser', f.name]), 0)
+                    self.assertEqual(main(['ninguem', f.name]), 2)
+                finally:
+                    sys.stdout = stdout
+        finally:
+            os.unlink(f.name)
+        self.assertEqual(self._count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -30,10 +30,13 @@ class TestUserModel(unittest.TestCase):
         """Limpeza após cada teste"""
         # Restaura o caminho original do banco
         import src.database.database as db_module
+        db_module.close_all_connections()
         db_module.DB_PATH = self.original_db_path
         
-        # Remove o arquivo temporário
-        os.unlink(self.temp_db.name)
+        # Remove o arquivo temporário (e os arquivos auxiliares do WAL)
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
     
     def test_password_hashing(self):
         """Testa se a senha é hashada corretamente"""
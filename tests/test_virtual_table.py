@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+from collections import namedtuple
+
+# Adiciona o diretório raiz ao path para importar módulos
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.views.virtual_table import PagedRowSource
+
+Page = namedtuple('Page', ['rows', 'next_cursor'])
+
+class TestPagedRowSource(unittest.TestCase):
+
+    def setUp(self):
+        self.data = list(range(25))
+        self.calls = []
+
+    def fetch(self, cursor):
+        self.calls.append(cursor)
+        start = cursor or 0
+        rows = self.data[start:start + 10]
+        next_cursor = start + 10 if start + 10 < len(self.data) else None
+        return Page(rows, next_cursor)
+
+    def test_loads_only_needed_pages(self):
+        """Testa se as páginas são buscadas só quando necessárias"""
+        source = PagedRowSource(self.fetch)
+        self.assertEqual(len(source), 0)
+        source.ensure(5)
+        self.assertEqual(len(source), 10)
+        source.ensure(10)
+        self.assertEqual(self.calls, [None])
+        source.ensure(11)
+        self.assertEqual(self.calls, [None, 10])
+        self.assertEqual(source[10], 10)
+
+    def test_stops_when_exhausted(self):
+        """Testa se a busca para na última página"""
+        source = PagedRowSource(self.fetch)
+        self.assertEqual(source.ensure(1000), 25)
+        self.assertFalse(source.has_more)
+        source.ensure(2000)
+        self.assertEqual(self.calls, [None, 10, 20])
+
+if __name__ == '__main__':
+    unittest.main()